@@ -0,0 +1,39 @@
+from fastapi import APIRouter, HTTPException
+from backend.services.policy_calibration import get_calibrator
+from backend.services.policy_core import POLICY_STORE
+from backend.services.policy_store import PolicyError
+
+router = APIRouter(tags=["admin"])
+
+@router.get("/admin/policy")
+def get_policy():
+    """Served thresholds and version, plus the recently loaded versions."""
+    return POLICY_STORE.stats()
+
+@router.post("/admin/policy/reload")
+def reload_policy():
+    """Re-read the policy file now (the watcher does this every POLICY_WATCH_INTERVAL_S)."""
+    try:
+        changed = POLICY_STORE.reload(force=True)
+    except PolicyError as e:
+        raise HTTPException(422, f"Policy rejected, previous version still served: {e}")
+    return {"changed": changed, "policy": dict(POLICY_STORE.current())}
+
+@router.get("/admin/policy/calibration")
+def policy_calibration():
+    """Live PD cut-points for the policy's top-K fractions and the recalibration the guardrails allow."""
+    calibrator = get_calibrator()
+    if calibrator is None:
+        return {"enabled": False}
+    return {"enabled": True, **calibrator.stats()}
+
+@router.post("/admin/policy/calibration/apply")
+def apply_policy_calibration():
+    """Publish the current proposal now (step and ordering guardrails apply, the cooldown does not)."""
+    calibrator = get_calibrator()
+    if calibrator is None:
+        raise HTTPException(404, "Quantile tracking is disabled (QUANTILE_TRACKING=0)")
+    result = calibrator.apply(ignore_cooldown=True)
+    if not result["applied"]:
+        raise HTTPException(409, f"Not applied: {result['blocked']}")
+    return result
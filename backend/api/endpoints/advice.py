@@ -4,42 +4,75 @@ from sqlalchemy.orm import Session
 from backend.api.deps import get_db
 from backend.config import settings
 from backend.db import crud
-from openai import OpenAI
+from backend.services.llm import get_llm
+from backend.services.llm_cache import cached_generation
+from backend.services.metrics import stage
+from backend.services.single_flight import SingleFlight
 
 router = APIRouter(tags=["advice"])
 
-def _get_llm_advice(payload: dict, prob_default: float, thresholds: dict) -> str:
-    if not settings.OPENAI_API_KEY:
-        return "LLM advice unavailable (no OPENAI_API_KEY). Suggested manual checks: verify income/employment, review high DTI/utilization, confirm purpose, and affordability."
-    try:
-        client = OpenAI(api_key=settings.OPENAI_API_KEY)
+# concurrent advice requests for the same application share one LLM call
+_advice_flight = SingleFlight()
+
+def _get_llm_advice(payload: dict, prob_default: float, thresholds: dict, refresh: bool = False) -> tuple[str, bool]:
+    """
+    (text, ok): ok is False for the fallback/error text, which is returned but never stored.
+    `refresh=True` bypasses the LLM cache and replaces its entry.
+    """
+    llm = get_llm()
+    if not llm.available():
+        return f"LLM advice unavailable ({llm.unavailable_reason()}). Suggested manual checks: verify income/employment, review high DTI/utilization, confirm purpose, and affordability.", False
+    # names don't inform credit advice: leaving them out keeps the prompt (and cache key) applicant-agnostic
+    application = {k: v for k, v in payload.items() if k not in ("first_name", "last_name")}
+    pd_txt = f"{prob_default:.3f}"
+
+    def generate() -> str:
         prompt = f"""
 You are a senior credit officer. Application is in manual review.
-PD: {prob_default:.3f}
+PD: {pd_txt}
 Policy thresholds: {json.dumps(thresholds)}
 
 Application (JSON):
-{json.dumps(payload, indent=2)}
+{json.dumps(application, indent=2)}
 
 Give a concise recommendation (<= 180 words): approve or reject, and 3–5 checks or mitigants.
 """
-        resp = client.responses.create(
-            model=settings.OPENAI_MODEL,
-            instructions="You are a prudent, fair, concise credit risk advisor.",
-            input=prompt,
-            temperature=0.2
-        )
-        return resp.output_text #resp.choices[0].message.content.strip()
+        with stage("llm_advice"):
+            return llm.complete("You are a prudent, fair, concise credit risk advisor.", prompt,
+                                model=settings.OPENAI_MODEL, temperature=0.2)
+
+    key = [llm.model_id(settings.OPENAI_MODEL), pd_txt, thresholds, application]
+    try:
+        return cached_generation("advice", key, generate, refresh=refresh), True
     except Exception as e:
-        return f"LLM advice error: {e}"
+        return f"LLM advice error: {e}", False
 
 @router.post("/applications/{app_id}/advice")
-def request_advice(app_id: int, db: Session = Depends(get_db)):
+def request_advice(app_id: int, force: bool = False, db: Session = Depends(get_db)):
+    """
+    Stored advice is returned as-is unless `force=true`. Otherwise one caller per
+    application generates and stores it while concurrent callers wait and share it.
+    When the LLM is unavailable or fails, the fallback text is returned with
+    `source="fallback"` and not stored, so the next call tries again.
+    """
     rec = crud.get_application(db, app_id)
     if not rec:
         raise HTTPException(404, "Not found")
     if rec.system_decision != "REVIEW":
         raise HTTPException(400, "Advice only available for REVIEW cases")
-    advice = _get_llm_advice(rec.payload, rec.prob_default, rec.thresholds or {})
-    rec = crud.set_advice(db, rec, advice)
-    return {"id": rec.id, "advice": advice}
+    if rec.advice and not force:
+        return {"id": rec.id, "advice": rec.advice, "source": "stored"}
+
+    def generate():
+        # a flight that finished just before we joined may already have stored it
+        db.refresh(rec)
+        if rec.advice and not force:
+            return rec.advice, "stored"
+        advice, ok = _get_llm_advice(rec.payload, rec.prob_default, rec.thresholds or {}, refresh=force)
+        if not ok:
+            return advice, "fallback"
+        crud.set_advice(db, rec, advice)
+        return advice, "generated"
+
+    (advice, source), shared = _advice_flight.do(app_id, generate)
+    return {"id": app_id, "advice": advice, "source": "shared" if shared and source != "fallback" else source}
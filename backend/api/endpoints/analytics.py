@@ -0,0 +1,50 @@
+import datetime as dt
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from backend.api.deps import get_db
+from backend.db import crud, rollups
+from backend.db.schemas import PortfolioBreakdownOut, PortfolioSegmentOut, RollupOut, RollupPage
+
+router = APIRouter(tags=["analytics"])
+
+GroupBy = Literal["grade", "sub_grade", "home_ownership", "verification_status", "purpose",
+                  "term_num", "emp_length_num"]
+
+@router.get("/analytics/breakdown", response_model=PortfolioBreakdownOut)
+def portfolio_breakdown(
+    by: GroupBy = "grade",
+    created_from: Optional[dt.datetime] = None,
+    created_to: Optional[dt.datetime] = None,
+    db: Session = Depends(get_db),
+):
+    """Volume, mean/min/max PD and decision mix per feature value (e.g. ?by=purpose), computed in SQL."""
+    rows = crud.portfolio_breakdown(db, by, created_from=created_from, created_to=created_to)
+    return PortfolioBreakdownOut(by=by, segments=[PortfolioSegmentOut(**r) for r in rows])
+
+def _date_range(date_from: Optional[dt.date], date_to: Optional[dt.date]) -> tuple[dt.date, dt.date]:
+    date_to = date_to or dt.datetime.utcnow().date()
+    date_from = date_from or date_to - dt.timedelta(days=29)
+    if date_from > date_to:
+        raise HTTPException(422, "date_from must not be after date_to")
+    if (date_to - date_from).days > 366:
+        raise HTTPException(422, "Date range is limited to 366 days")
+    return date_from, date_to
+
+@router.get("/analytics/daily", response_model=RollupPage)
+def daily_rollups(date_from: Optional[dt.date] = None, date_to: Optional[dt.date] = None,
+                  db: Session = Depends(get_db)):
+    """Decision mix, PD mean/percentiles and approval rate per day (UTC), default: last 30 days."""
+    date_from, date_to = _date_range(date_from, date_to)
+    items = rollups.summarize(db, "all", "day", date_from, date_to)
+    return RollupPage(dimension="day", date_from=date_from, date_to=date_to,
+                      items=[RollupOut(**r) for r in items])
+
+@router.get("/analytics/by/{dimension}", response_model=RollupPage)
+def dimension_rollups(dimension: Literal["grade", "purpose"], date_from: Optional[dt.date] = None,
+                      date_to: Optional[dt.date] = None, db: Session = Depends(get_db)):
+    """Same figures per grade or purpose over the date range; reads the rollups, not the applications."""
+    date_from, date_to = _date_range(date_from, date_to)
+    items = rollups.summarize(db, dimension, "value", date_from, date_to)
+    return RollupPage(dimension=dimension, date_from=date_from, date_to=date_to,
+                      items=[RollupOut(**r) for r in items])
@@ -1,11 +1,56 @@
-from fastapi import APIRouter, Depends, HTTPException
+import base64
+import datetime as dt
+import json
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from backend.api.deps import get_db
 from backend.db import crud
-from backend.db.schemas import ApplicationOut
+from backend.db.schemas import ApplicationOut, ApplicationPage, ClientMessageOut
 
 router = APIRouter(tags=["applications"])
 
+def _encode_cursor(created_at: dt.datetime, app_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), app_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+def _decode_cursor(cursor: str) -> tuple[dt.datetime, int]:
+    try:
+        created_at, app_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return dt.datetime.fromisoformat(created_at), int(app_id)
+    except Exception:
+        raise HTTPException(400, "Invalid cursor")
+
+@router.get("/applications", response_model=ApplicationPage)
+def list_applications(
+    status: Optional[Literal["OPEN","CLOSED"]] = None,
+    system_decision: Optional[Literal["APPROVE","REVIEW","REJECT"]] = None,
+    final_decision: Optional[Literal["APPROVE","REJECT"]] = None,
+    created_from: Optional[dt.datetime] = None,
+    created_to: Optional[dt.datetime] = None,
+    pd_min: Optional[float] = Query(None, ge=0, le=1),
+    pd_max: Optional[float] = Query(None, ge=0, le=1),
+    order: Literal["asc","desc"] = "asc",
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+):
+    """
+    Review queue / application list, oldest first by default
+    (e.g. ?status=OPEN&system_decision=REVIEW). Keyset-paginated: pass `next_cursor`.
+    """
+    rows = crud.list_applications(
+        db, status=status, system_decision=system_decision, final_decision=final_decision,
+        created_from=created_from, created_to=created_to, pd_min=pd_min, pd_max=pd_max,
+        after=_decode_cursor(cursor) if cursor else None, descending=order == "desc", limit=limit + 1,
+    )
+    more = len(rows) > limit
+    rows = rows[:limit]
+    return ApplicationPage(
+        items=[ApplicationOut.model_validate(r) for r in rows],
+        next_cursor=_encode_cursor(rows[-1].created_at, rows[-1].id) if more else None,
+    )
+
 @router.get("/applications/{app_id}", response_model=ApplicationOut)
 def get_application(app_id: int, db: Session = Depends(get_db)):
     rec = crud.get_application(db, app_id)
@@ -16,5 +61,17 @@ def get_application(app_id: int, db: Session = Depends(get_db)):
         first_name=rec.first_name, last_name=rec.last_name,
         prob_default=rec.prob_default,
         system_decision=rec.system_decision, final_decision=rec.final_decision,
-        policy_source=rec.policy_source, thresholds=rec.thresholds, status=rec.status
+        policy_source=rec.policy_source, thresholds=rec.thresholds, status=rec.status,
+        model_version=rec.model_version, policy_version=rec.policy_version, version=rec.version,
+        client_message=rec.client_message, client_message_status=rec.client_message_status
     )
+
+@router.get("/applications/{app_id}/client-message", response_model=ClientMessageOut)
+def get_client_message(app_id: int, db: Session = Depends(get_db)):
+    """Poll the background-generated client message (PENDING until the worker writes it)."""
+    rec = crud.get_application(db, app_id)
+    if not rec:
+        raise HTTPException(404, "Not found")
+    if rec.client_message_status is None:
+        raise HTTPException(404, "No client message for this application")
+    return ClientMessageOut(id=rec.id, status=rec.client_message_status, client_message=rec.client_message)
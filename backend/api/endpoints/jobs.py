@@ -0,0 +1,49 @@
+from pathlib import Path
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from sqlalchemy.orm import Session
+from backend.api.deps import get_db
+from backend.config import settings
+from backend.db import crud
+from backend.db.schemas import JobOut, JobResultOut, JobResultsPage
+from backend.services.scoring_jobs import DONE, FAILED, SUPPORTED_SUFFIXES, get_job_runner, rows_per_sec
+
+router = APIRouter(tags=["jobs"])
+
+def _job_out(job) -> JobOut:
+    out = JobOut.model_validate(job)
+    out.rows_per_sec = rows_per_sec(job)
+    return out
+
+@router.post("/jobs", response_model=JobOut, status_code=202)
+def create_job(file: UploadFile = File(...), db: Session = Depends(get_db)):
+    """Accept a CSV/Parquet file of applications and score it in the background."""
+    name = file.filename or "upload.csv"
+    if Path(name).suffix.lower() not in SUPPORTED_SUFFIXES:
+        raise HTTPException(415, f"Unsupported file type (expected {', '.join(SUPPORTED_SUFFIXES)})")
+    job = get_job_runner().submit(db, file.file, name)
+    return _job_out(job)
+
+@router.get("/jobs/{job_id}", response_model=JobOut)
+def get_job(job_id: str, db: Session = Depends(get_db)):
+    job = crud.get_job(db, job_id)
+    if not job:
+        raise HTTPException(404, "Not found")
+    return _job_out(job)
+
+@router.get("/jobs/{job_id}/results", response_model=JobResultsPage)
+def get_job_results(job_id: str, cursor: int = Query(-1, description="last row_index of the previous page"),
+                    limit: int = Query(1000, ge=1), db: Session = Depends(get_db)):
+    """Results in upload order; pages are keyed on row_index, so they can be read while the job runs."""
+    job = crud.get_job(db, job_id)
+    if not job:
+        raise HTTPException(404, "Not found")
+    rows = crud.get_job_results(db, job_id, after=cursor, limit=min(limit, settings.JOB_RESULTS_MAX_PAGE))
+    items = [JobResultOut.model_validate(r) for r in rows]
+    finished = job.status in (DONE, FAILED)
+    if items:
+        next_cursor = items[-1].row_index
+        if finished and next_cursor >= job.processed_rows - 1:
+            next_cursor = None
+    else:
+        next_cursor = None if finished else cursor
+    return JobResultsPage(job_id=job_id, items=items, next_cursor=next_cursor)
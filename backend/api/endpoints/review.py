@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session
 from backend.api.deps import get_db
 from backend.db import crud
 from backend.db.schemas import ApplicationOut, ReviewActionIn
-from backend.services.improvement_tips import recommend_improvements, format_client_message_llm
+from backend.services.client_messages import PENDING, get_worker
 
 router = APIRouter(tags=["review"])
 
@@ -17,20 +17,18 @@ def officer_decision(app_id: int, action: ReviewActionIn, db: Session = Depends(
 
     if action.action not in ("APPROVE", "REJECT"):
         raise HTTPException(422, "Action must be APPROVE or REJECT")
-
-    # If officer REJECTS, create client message BEFORE closing
-    client_msg = None
-    if action.action == "REJECT":
-        tips = recommend_improvements(rec.payload, top_k=3)
-        client_msg = format_client_message_llm(rec.payload, tips, max_lines=3)
-
-    # finalize (sets final_decision, status=CLOSED, review_notes, etc.)
-    rec = crud.finalize_review(db, rec, action.action, action.notes)
-
-    # persist client message if any
-    if client_msg:
-        rec.client_message = client_msg
-        db.add(rec); db.commit(); db.refresh(rec)
+    if action.version is not None and action.version != rec.version:
+        raise HTTPException(409, "This application changed since it was loaded; reload and review again")
+
+    # finalize in one compare-and-set transaction (sets final_decision, status=CLOSED,
+    # review_notes, version+1); on officer REJECT the client message is generated in the background
+    msg_status = PENDING if action.action == "REJECT" else None
+    rec = crud.finalize_review(db, rec, action.action, action.notes, client_message_status=msg_status,
+                               expected_version=action.version)
+    if rec is None:
+        raise HTTPException(409, "This application was reviewed concurrently by another officer")
+    if msg_status:
+        get_worker().enqueue(rec.id)
 
     return ApplicationOut.model_validate(rec)
 
@@ -1,29 +1,30 @@
+from typing import List
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from backend.api.deps import get_db
+from backend.config import settings
 from backend.db import crud
 from backend.db.schemas import ApplicationIn, ApplicationOut
-from backend.services.improvement_tips import recommend_improvements, format_client_message_llm
-from backend.services.policy_core import score_payload
+from backend.services import drift, policy_calibration
+from backend.services.client_messages import PENDING, get_worker
+from backend.services.group_commit import create_application
+from backend.services.micro_batcher import score_payload_batched
+from backend.services.policy_core import score_payloads
 
 router = APIRouter(tags=["scoring"])
 
 @router.post("/score", response_model=ApplicationOut)
 def score_and_store(app_in: ApplicationIn, db: Session = Depends(get_db)):
     payload = app_in.dict()
-    scored = score_payload(payload)
+    scored = score_payload_batched(payload)
+    drift.observe([payload])
+    policy_calibration.observe([scored["prob_default"]])
 
     system_decision = scored["decision"]          # APPROVE / REVIEW / REJECT (model)
     final_decision = system_decision if system_decision != "REVIEW" else None
     status = "CLOSED" if final_decision in ("APPROVE","REJECT") else "OPEN"
 
-    client_message = None
-    # If model auto-rejects, generate LLM client message *here*
-    if system_decision == "REJECT":
-        tips = recommend_improvements(payload, top_k=3)
-        client_message = format_client_message_llm(payload, tips, max_lines=3)
-
-    rec = crud.create_application(
+    rec = create_application(
         db,
         first_name=payload.get("first_name"),
         last_name=payload.get("last_name"),
@@ -33,8 +34,46 @@ def score_and_store(app_in: ApplicationIn, db: Session = Depends(get_db)):
         final_decision=final_decision,
         policy_source=scored.get("policy_source"),
         thresholds=scored.get("thresholds"),
+        model_version=scored.get("model_version"),
+        policy_version=scored.get("policy_version"),
         status=status,
-        client_message=client_message
+        # auto-reject: the LLM client message is generated in the background
+        client_message_status=PENDING if system_decision == "REJECT" else None
     )
+    if rec.client_message_status == PENDING:
+        get_worker().enqueue(rec.id)
     return ApplicationOut.model_validate(rec)
 
+@router.post("/score/batch", response_model=List[ApplicationOut])
+def score_and_store_batch(apps_in: List[ApplicationIn], db: Session = Depends(get_db)):
+    """
+    Score a whole portfolio with one model call and one commit.
+    Results are returned in input order. Client messages for auto-rejects are
+    NOT generated here (one LLM round trip per row would defeat the batch).
+    """
+    if len(apps_in) > settings.SCORE_BATCH_MAX_ROWS:
+        raise HTTPException(413, f"Batch too large (max {settings.SCORE_BATCH_MAX_ROWS} applications)")
+    payloads = [a.dict() for a in apps_in]
+    scored = score_payloads(payloads)
+    drift.observe(payloads)
+    policy_calibration.observe([s["prob_default"] for s in scored])
+
+    rows = []
+    for payload, s in zip(payloads, scored):
+        system_decision = s["decision"]
+        final_decision = system_decision if system_decision != "REVIEW" else None
+        rows.append(dict(
+            first_name=payload.get("first_name"),
+            last_name=payload.get("last_name"),
+            payload=payload,
+            prob_default=s["prob_default"],
+            system_decision=system_decision,
+            final_decision=final_decision,
+            policy_source=s.get("policy_source"),
+            thresholds=s.get("thresholds"),
+            model_version=s.get("model_version"),
+            policy_version=s.get("policy_version"),
+            status="CLOSED" if final_decision in ("APPROVE","REJECT") else "OPEN",
+        ))
+    recs = crud.create_applications(db, rows)
+    return [ApplicationOut.model_validate(r) for r in recs]
@@ -0,0 +1,53 @@
+from fastapi import APIRouter
+from backend.config import settings
+from backend.services.drift import get_drift_monitor, reference_path
+from backend.services.group_commit import get_writer
+from backend.services.llm_cache import get_llm_cache
+from backend.services.micro_batcher import get_batcher
+from backend.services.policy_core import REGISTRY
+from backend.services.score_cache import get_score_cache
+
+router = APIRouter(tags=["stats"])
+
+@router.get("/stats/batcher")
+def batcher_stats():
+    batcher = get_batcher()
+    if batcher is None:
+        return {"enabled": False}
+    return {"enabled": True, **batcher.stats()}
+
+@router.get("/stats/db-writes")
+def db_write_stats():
+    writer = get_writer()
+    if writer is None:
+        return {"enabled": False}
+    return {"enabled": True, **writer.stats()}
+
+@router.get("/stats/model")
+def model_stats():
+    return REGISTRY.stats()
+
+@router.get("/stats/score-cache")
+def score_cache_stats():
+    cache = get_score_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+@router.get("/stats/llm-cache")
+def llm_cache_stats():
+    cache = get_llm_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+@router.get("/stats/drift")
+def drift_stats(detail: bool = False):
+    """PSI per feature: current window, closed windows, cumulative (?detail=1 adds per-bin shares)."""
+    if not settings.DRIFT_ENABLED:
+        return {"enabled": False}
+    monitor = get_drift_monitor()
+    if monitor is None:
+        return {"enabled": True, "reference": None,
+                "detail": f"No reference profile at {reference_path()}; export one with python -m backend.drift_reference"}
+    return {"enabled": True, **monitor.snapshot(detail=detail)}
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+Offline bulk scoring: stream a CSV/Parquet file of applications through the
+served model and policy without going through the API.
+
+    python -m backend.bulk_score accepted_2007_to_2018Q4.csv scored.parquet --workers 8
+
+The input is read in chunks (only the columns the model uses plus any --keep
+columns), each chunk is scored in a worker process with `score_payloads` (same
+normalization as `policy_core.normalize_payload`), and results are appended to the
+output as chunks complete, in input order. At most `workers * 2` chunks are in
+flight, so memory stays bounded regardless of the file size. Parquet needs pyarrow.
+"""
+from __future__ import annotations
+import argparse
+import os
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# raw application fields read by policy_core._payload_row
+INPUT_COLUMNS = [
+    "loan_amnt", "int_rate", "fico_range_low", "fico_range_high", "annual_inc", "dti",
+    "revol_util", "emp_length", "term", "grade", "sub_grade", "home_ownership",
+    "verification_status", "purpose",
+]
+OUTPUT_COLUMNS = ["prob_default", "decision", "policy_source"]
+
+
+def _is_parquet(path: str) -> bool:
+    return Path(path).suffix.lower() in (".parquet", ".pq")
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet input/output requires pyarrow (pip install pyarrow)") from e
+    return pq
+
+
+def read_chunks(path: str, chunksize: int, keep: Sequence[str] = ()) -> Iterator[pd.DataFrame]:
+    """Yield DataFrames of at most `chunksize` rows holding the model inputs and `keep` columns."""
+    wanted = set(INPUT_COLUMNS) | set(keep)
+    if _is_parquet(path):
+        pq = _require_pyarrow()
+        pf = pq.ParquetFile(path)
+        cols = [c for c in pf.schema_arrow.names if c in wanted]
+        for batch in pf.iter_batches(batch_size=chunksize, columns=cols):
+            yield batch.to_pandas()
+    else:
+        # object dtype keeps "36 months", "12.5%" etc. exactly as the API would receive them
+        reader = pd.read_csv(path, chunksize=chunksize, usecols=lambda c: c in wanted, dtype=object)
+        yield from reader
+
+
+def score_chunk(frame: pd.DataFrame) -> pd.DataFrame:
+    """Score one chunk; runs inside a worker process."""
+    from backend.services.policy_core import score_payloads
+    records = frame.reindex(columns=INPUT_COLUMNS)  # absent fields score as missing, like in the API
+    records = records.astype(object).where(records.notna(), None).to_dict("records")
+    results = score_payloads(records)
+    return pd.DataFrame({
+        "prob_default": np.fromiter((r["prob_default"] for r in results), dtype=float, count=len(results)),
+        "decision": [r["decision"] for r in results],
+        "policy_source": [r["policy_source"] for r in results],
+    }, index=frame.index)
+
+
+def _init_worker() -> None:
+    # load the model once per process, before the first chunk arrives
+    import backend.services.policy_core  # noqa: F401
+
+
+class ChunkWriter:
+    """Appends scored chunks to a CSV or Parquet file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._parquet = _is_parquet(path)
+        self._writer = None
+        self._header = True
+
+    def write(self, frame: pd.DataFrame) -> None:
+        if self._parquet:
+            pq = _require_pyarrow()
+            import pyarrow as pa
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table.cast(self._writer.schema))
+        else:
+            frame.to_csv(self.path, mode="w" if self._header else "a", header=self._header, index=False)
+            self._header = False
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+def bulk_score(input_path: str, output_path: str, chunksize: int = 50_000, workers: int = 4,
+               keep: Sequence[str] = (), progress: bool = True) -> Dict[str, Any]:
+    """
+    Score `input_path` into `output_path`. `workers=0` scores in-process (no pool).
+    Returns {"rows", "seconds", "rows_per_sec", "decisions"}.
+    """
+    keep = [c for c in keep if c not in OUTPUT_COLUMNS]
+    writer = ChunkWriter(output_path)
+    decisions: Counter = Counter()
+    rows = 0
+    start = time.perf_counter()
+
+    def emit(chunk: pd.DataFrame, scored: pd.DataFrame) -> None:
+        nonlocal rows
+        if rows == 0 and progress:
+            missing = [c for c in INPUT_COLUMNS if c not in chunk.columns]
+            if missing:
+                print(f"warning: input has no {', '.join(missing)} column(s); scored as missing", file=sys.stderr)
+        out = pd.concat([chunk[[c for c in keep if c in chunk.columns]], scored], axis=1)
+        writer.write(out)
+        decisions.update(scored["decision"].tolist())
+        rows += len(out)
+        if progress:
+            elapsed = time.perf_counter() - start
+            print(f"\r{rows:,} rows  {rows / elapsed if elapsed else 0:,.0f} rows/s", end="", file=sys.stderr)
+
+    pool: Optional[ProcessPoolExecutor] = None
+    try:
+        if workers <= 0:
+            for chunk in read_chunks(input_path, chunksize, keep):
+                emit(chunk, score_chunk(chunk))
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+            in_flight: deque = deque()  # (chunk, future) in input order
+            max_in_flight = workers * 2
+            for chunk in read_chunks(input_path, chunksize, keep):
+                in_flight.append((chunk, pool.submit(score_chunk, chunk)))
+                while len(in_flight) >= max_in_flight:
+                    done_chunk, fut = in_flight.popleft()
+                    emit(done_chunk, fut.result())
+            while in_flight:
+                done_chunk, fut = in_flight.popleft()
+                emit(done_chunk, fut.result())
+    finally:
+        writer.close()
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    seconds = time.perf_counter() - start
+    if progress:
+        print(file=sys.stderr)
+    return {
+        "rows": rows,
+        "seconds": round(seconds, 3),
+        "rows_per_sec": round(rows / seconds, 1) if seconds > 0 else None,
+        "decisions": dict(decisions),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Score a CSV/Parquet file of applications offline.")
+    ap.add_argument("input", help="CSV or Parquet file (.parquet/.pq) with the application columns")
+    ap.add_argument("output", help="CSV or Parquet file to write PD, decision and policy_source to")
+    ap.add_argument("--chunksize", type=int, default=50_000, help="rows per chunk (default 50000)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                    help="scoring processes; 0 scores in-process (default: CPU count)")
+    ap.add_argument("--keep", default="id", help="comma-separated input columns copied to the output (default: id)")
+    ap.add_argument("--quiet", action="store_true", help="no progress output")
+    args = ap.parse_args(argv)
+
+    keep = [c.strip() for c in args.keep.split(",") if c.strip()]
+    try:
+        summary = bulk_score(args.input, args.output, chunksize=max(1, args.chunksize),
+                             workers=args.workers, keep=keep, progress=not args.quiet)
+    except ImportError as e:
+        raise SystemExit(str(e)) from e
+    print(f"scored {summary['rows']:,} rows in {summary['seconds']}s "
+          f"({summary['rows_per_sec']} rows/s): {summary['decisions']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
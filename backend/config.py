@@ -10,5 +10,72 @@ class Settings:
     OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
     API_V1_STR: str = "/v1"
     CORS_ORIGINS: list[str] = ["*"]
+    MODEL_DIR: str = os.getenv("MODEL_DIR", "models/saved_models")
+    MODEL_GLOB: str = os.getenv("MODEL_GLOB", "best_model_recall_focus_xgb_OptionA_recallAtK*.joblib")
+    MODEL_WATCH_INTERVAL_S: float = float(os.getenv("MODEL_WATCH_INTERVAL_S", "10"))  # 0 disables hot-reload
+    POLICY_PATH: str = os.getenv("POLICY_PATH", "")  # default: MODEL_DIR/best_model_policy.json
+    POLICY_WATCH_INTERVAL_S: float = float(os.getenv("POLICY_WATCH_INTERVAL_S", "5"))  # 0 disables hot-reload
+    SCORING_BACKEND: str = os.getenv("SCORING_BACKEND", "xgboost")  # xgboost | native
+    SCORE_BATCH_MAX_ROWS: int = int(os.getenv("SCORE_BATCH_MAX_ROWS", "100000"))
+    # micro-batching of concurrent /score calls (off by default)
+    SCORE_MICROBATCH: bool = os.getenv("SCORE_MICROBATCH", "0").lower() in ("1", "true", "yes")
+    SCORE_MICROBATCH_WAIT_MS: float = float(os.getenv("SCORE_MICROBATCH_WAIT_MS", "2"))
+    SCORE_MICROBATCH_MAX_SIZE: int = int(os.getenv("SCORE_MICROBATCH_MAX_SIZE", "64"))
+    # SQLite busy timeout and group commit of /score inserts (one transaction per batch of concurrent requests)
+    DB_BUSY_TIMEOUT_MS: int = int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000"))
+    DB_GROUP_COMMIT: bool = os.getenv("DB_GROUP_COMMIT", "1").lower() in ("1", "true", "yes")
+    DB_GROUP_COMMIT_WAIT_MS: float = float(os.getenv("DB_GROUP_COMMIT_WAIT_MS", "2"))
+    DB_GROUP_COMMIT_MAX_BATCH: int = int(os.getenv("DB_GROUP_COMMIT_MAX_BATCH", "128"))
+    # LLM backend for advice and client messages: openai | local (deterministic offline stand-in)
+    LLM_BACKEND: str = os.getenv("LLM_BACKEND", "openai")
+    LLM_TIMEOUT_S: float = float(os.getenv("LLM_TIMEOUT", "30"))
+    LLM_LOCAL_LATENCY_MS: float = float(os.getenv("LLM_LOCAL_LATENCY_MS", "800"))  # median
+    LLM_LOCAL_LATENCY_SIGMA: float = float(os.getenv("LLM_LOCAL_LATENCY_SIGMA", "0.4"))  # lognormal shape
+    LLM_LOCAL_LATENCY_MAX_MS: float = float(os.getenv("LLM_LOCAL_LATENCY_MAX_MS", "10000"))
+    LLM_LOCAL_ERROR_RATE: float = float(os.getenv("LLM_LOCAL_ERROR_RATE", "0"))
+    LLM_LOCAL_SEED: int = int(os.getenv("LLM_LOCAL_SEED", "0"))
+    # background client-message generation for REJECTs
+    CLIENT_MESSAGE_WORKERS: int = int(os.getenv("CLIENT_MESSAGE_WORKERS", "2"))
+    CLIENT_MESSAGE_RETRIES: int = int(os.getenv("CLIENT_MESSAGE_RETRIES", "3"))
+    CLIENT_MESSAGE_BACKOFF_S: float = float(os.getenv("CLIENT_MESSAGE_BACKOFF_S", "1.0"))
+    # persistent LLM output cache (client messages + officer advice)
+    LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "1").lower() in ("1", "true", "yes")
+    LLM_CACHE_PATH: str = os.getenv("LLM_CACHE_PATH", "./llm_cache.db")
+    LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+    LLM_CACHE_TTL_S: float = float(os.getenv("LLM_CACHE_TTL_S", str(7 * 24 * 3600)))
+    # PD cache shared by all workers, keyed on the normalized feature vector
+    SCORE_CACHE_ENABLED: bool = os.getenv("SCORE_CACHE_ENABLED", "1").lower() in ("1", "true", "yes")
+    SCORE_CACHE_PATH: str = os.getenv("SCORE_CACHE_PATH", "./score_cache.db")
+    SCORE_CACHE_MAX_ENTRIES: int = int(os.getenv("SCORE_CACHE_MAX_ENTRIES", "100000"))
+    # threshold-aware counterfactual search (improvement tips)
+    CF_MAX_EVALS: int = int(os.getenv("CF_MAX_EVALS", "256"))
+    CF_TIME_BUDGET_MS: float = float(os.getenv("CF_TIME_BUDGET_MS", "50"))
+    CF_BATCH_SIZE: int = int(os.getenv("CF_BATCH_SIZE", "256"))
+    # multi-step improvement plans (beam search)
+    PLAN_BEAM_WIDTH: int = int(os.getenv("PLAN_BEAM_WIDTH", "4"))
+    PLAN_MAX_DEPTH: int = int(os.getenv("PLAN_MAX_DEPTH", "3"))
+    PLAN_MAX_EVALS: int = int(os.getenv("PLAN_MAX_EVALS", "400"))
+    PLAN_TIME_BUDGET_MS: float = float(os.getenv("PLAN_TIME_BUDGET_MS", "150"))
+    # Prometheus /metrics: per-stage timers, HTTP request metrics (off = no timers, no middleware)
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "1").lower() in ("1", "true", "yes")
+    # streaming feature drift (PSI) against the training reference profile
+    DRIFT_ENABLED: bool = os.getenv("DRIFT_ENABLED", "1").lower() in ("1", "true", "yes")
+    DRIFT_REFERENCE_PATH: str = os.getenv("DRIFT_REFERENCE_PATH", "")  # default: MODEL_DIR/drift_reference.json
+    DRIFT_WINDOW_S: float = float(os.getenv("DRIFT_WINDOW_S", "3600"))
+    DRIFT_WINDOWS: int = int(os.getenv("DRIFT_WINDOWS", "24"))  # closed windows kept
+    DRIFT_MIN_ROWS: int = int(os.getenv("DRIFT_MIN_ROWS", "100"))  # below this a window gets no PSI band
+    # live PD quantiles (P²) and guarded recalibration of the top-K thresholds
+    QUANTILE_TRACKING: bool = os.getenv("QUANTILE_TRACKING", "1").lower() in ("1", "true", "yes")
+    QUANTILE_WINDOW_ROWS: int = int(os.getenv("QUANTILE_WINDOW_ROWS", "2000"))
+    QUANTILE_WINDOWS: int = int(os.getenv("QUANTILE_WINDOWS", "10"))  # completed windows kept
+    POLICY_AUTO_CALIBRATE: bool = os.getenv("POLICY_AUTO_CALIBRATE", "0").lower() in ("1", "true", "yes")
+    POLICY_CALIBRATION_MAX_STEP: float = float(os.getenv("POLICY_CALIBRATION_MAX_STEP", "0.05"))
+    POLICY_CALIBRATION_MIN_CHANGE: float = float(os.getenv("POLICY_CALIBRATION_MIN_CHANGE", "0.005"))
+    POLICY_CALIBRATION_COOLDOWN_S: float = float(os.getenv("POLICY_CALIBRATION_COOLDOWN_S", "3600"))
+    # asynchronous batch-scoring jobs (POST /v1/jobs)
+    JOBS_DIR: str = os.getenv("JOBS_DIR", "./jobs")
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_CHUNK_ROWS: int = int(os.getenv("JOB_CHUNK_ROWS", "5000"))
+    JOB_RESULTS_MAX_PAGE: int = int(os.getenv("JOB_RESULTS_MAX_PAGE", "10000"))
 
 settings = Settings()
@@ -1,25 +1,193 @@
-from sqlalchemy.orm import Session
-from backend.db.models import Application
+import datetime as dt
+from sqlalchemy import case, func, insert, select, tuple_, update
+from sqlalchemy.orm import Session, defer
+from sqlalchemy.orm.attributes import set_committed_value
+from backend.db import rollups
+from backend.db.models import Application, ApplicationFeatures, JobResult, Rollup, ScoringJob
+from backend.services.metrics import stage
+from backend.services.normalize import typed_feature_row
 
 def create_application(db: Session, **kwargs) -> Application:
-    rec = Application(**kwargs)
-    db.add(rec); db.commit(); db.refresh(rec)
-    return rec
+    return create_applications(db, [kwargs])[0]
+
+def create_applications(db: Session, rows: list[dict]) -> list[Application]:
+    """
+    Insert many applications in a single transaction (one commit for the whole batch),
+    each with its typed `application_features` row and its share of the rollups.
+    """
+    recs = [Application(**kw, features=ApplicationFeatures(**typed_feature_row(kw.get("payload") or {})))
+            for kw in rows]
+    # keep the flushed ids/defaults loaded instead of re-SELECTing every row after commit
+    expire, db.expire_on_commit = db.expire_on_commit, False
+    try:
+        db.add_all(recs); db.flush()
+        rollups.record_scored(db, recs)
+        with stage("db_commit"):
+            db.commit()
+    finally:
+        db.expire_on_commit = expire
+    return recs
 
 def get_application(db: Session, app_id: int) -> Application | None:
     return db.get(Application, app_id)
 
+def list_applications(db: Session, *, status: str | None = None, system_decision: str | None = None,
+                      final_decision: str | None = None, created_from: dt.datetime | None = None,
+                      created_to: dt.datetime | None = None, pd_min: float | None = None,
+                      pd_max: float | None = None, after: tuple[dt.datetime, int] | None = None,
+                      descending: bool = False, limit: int = 50) -> list[Application]:
+    """
+    Keyset page ordered by (created_at, id): `after` is the (created_at, id) of the
+    last row of the previous page. Served by ix_applications_queue when filtering
+    on status/system_decision.
+    """
+    stmt = select(Application).options(defer(Application.payload))
+    if status:
+        stmt = stmt.where(Application.status == status)
+    if system_decision:
+        stmt = stmt.where(Application.system_decision == system_decision)
+    if final_decision:
+        stmt = stmt.where(Application.final_decision == final_decision)
+    if created_from:
+        stmt = stmt.where(Application.created_at >= created_from)
+    if created_to:
+        stmt = stmt.where(Application.created_at < created_to)
+    if pd_min is not None:
+        stmt = stmt.where(Application.prob_default >= pd_min)
+    if pd_max is not None:
+        stmt = stmt.where(Application.prob_default <= pd_max)
+    key = tuple_(Application.created_at, Application.id)
+    if after is not None:
+        stmt = stmt.where(key < tuple_(*after) if descending else key > tuple_(*after))
+    if descending:
+        stmt = stmt.order_by(Application.created_at.desc(), Application.id.desc())
+    else:
+        stmt = stmt.order_by(Application.created_at, Application.id)
+    return list(db.scalars(stmt.limit(limit)))
+
+def backfill_application_features(db: Session, batch_size: int = 1000) -> int:
+    """Create the missing `application_features` rows (applications stored before the table existed)."""
+    total = 0
+    while True:
+        stmt = (select(Application.id, Application.payload)
+                .outerjoin(ApplicationFeatures, ApplicationFeatures.application_id == Application.id)
+                .where(ApplicationFeatures.application_id.is_(None))
+                .order_by(Application.id).limit(batch_size))
+        rows = db.execute(stmt).all()
+        if not rows:
+            return total
+        db.execute(insert(ApplicationFeatures),
+                   [dict(typed_feature_row(payload or {}), application_id=app_id) for app_id, payload in rows])
+        db.commit()
+        total += len(rows)
+
+def backfill_rollups(db: Session) -> int:
+    """Build the rollups once for a database that has applications but none yet."""
+    if db.scalar(select(Rollup.day).limit(1)) is not None or db.scalar(select(Application.id).limit(1)) is None:
+        return 0
+    return rollups.rebuild(db)
+
+def portfolio_breakdown(db: Session, by: str, created_from: dt.datetime | None = None,
+                        created_to: dt.datetime | None = None) -> list[dict]:
+    """Volume, PD statistics and decision mix per value of one feature, aggregated in SQL."""
+    col = getattr(ApplicationFeatures, by)
+    decided = func.sum(case((Application.final_decision.is_not(None), 1), else_=0))
+    approved = func.sum(case((Application.final_decision == "APPROVE", 1), else_=0))
+    stmt = (
+        select(
+            col.label("value"),
+            func.count().label("count"),
+            func.avg(Application.prob_default).label("avg_pd"),
+            func.min(Application.prob_default).label("min_pd"),
+            func.max(Application.prob_default).label("max_pd"),
+            *[func.sum(case((Application.system_decision == d, 1), else_=0)).label(d.lower())
+              for d in ("APPROVE", "REVIEW", "REJECT")],
+            decided.label("decided"),
+            approved.label("approved"),
+        )
+        .join(ApplicationFeatures, ApplicationFeatures.application_id == Application.id)
+        .group_by(col).order_by(col)
+    )
+    if created_from:
+        stmt = stmt.where(Application.created_at >= created_from)
+    if created_to:
+        stmt = stmt.where(Application.created_at < created_to)
+    out = []
+    for r in db.execute(stmt).mappings():
+        row = dict(r)
+        row["approval_rate"] = row["approved"] / row["decided"] if row["decided"] else None
+        out.append(row)
+    return out
+
 def set_advice(db: Session, rec: Application, advice: str) -> Application:
     rec.advice = advice
     db.add(rec); db.commit(); db.refresh(rec)
     return rec
 
-def finalize_review(db: Session, rec: Application, action: str, notes: str | None) -> Application:
-    rec.final_decision = action
-    if notes:
-        import datetime as dt
-        stamp = f"[{dt.datetime.utcnow().isoformat()}] {notes}"
-        rec.review_notes = (rec.review_notes + "\n" if rec.review_notes else "") + stamp
-    rec.status = "CLOSED"
+def set_client_message(db: Session, rec: Application, message: str | None, status: str) -> Application:
+    rec.client_message = message
+    rec.client_message_status = status
     db.add(rec); db.commit(); db.refresh(rec)
     return rec
+
+def finalize_review(db: Session, rec: Application, action: str, notes: str | None,
+                    client_message_status: str | None = None,
+                    expected_version: int | None = None) -> Application | None:
+    """
+    Close an OPEN case in one compare-and-set UPDATE and one commit.
+    Returns None (nothing written) when the case is no longer at `expected_version`
+    (default: the version `rec` was read at) or no longer OPEN, i.e. another
+    officer got there first.
+    """
+    version = rec.version if expected_version is None else expected_version
+    now = dt.datetime.utcnow()
+    values = {"final_decision": action, "status": "CLOSED", "version": version + 1, "updated_at": now}
+    if client_message_status:
+        values["client_message_status"] = client_message_status
+    if notes:
+        stamp = f"[{now.isoformat()}] {notes}"
+        # safe to build from rec: notes only change through this CAS, so they match `version`
+        values["review_notes"] = (rec.review_notes + "\n" if rec.review_notes else "") + stamp
+    res = db.execute(
+        update(Application)
+        .where(Application.id == rec.id, Application.version == version, Application.status == "OPEN")
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    if res.rowcount != 1:
+        db.rollback()
+        return None
+    rollups.record_reviewed(db, rec, action)
+    expire, db.expire_on_commit = db.expire_on_commit, False
+    try:
+        with stage("db_commit"):
+            db.commit()
+    finally:
+        db.expire_on_commit = expire
+    for key, value in values.items():  # what we just wrote; no re-SELECT
+        set_committed_value(rec, key, value)
+    return rec
+
+# ---------- scoring jobs ----------
+def create_job(db: Session, **kwargs) -> ScoringJob:
+    job = ScoringJob(**kwargs)
+    db.add(job); db.commit(); db.refresh(job)
+    return job
+
+def get_job(db: Session, job_id: str) -> ScoringJob | None:
+    return db.get(ScoringJob, job_id)
+
+def add_job_results(db: Session, job: ScoringJob, rows: list[dict]) -> ScoringJob:
+    """Store one scored chunk and advance the job's progress in the same transaction."""
+    if rows:
+        db.execute(insert(JobResult), [dict(r, job_id=job.id) for r in rows])
+    job.processed_rows = (job.processed_rows or 0) + len(rows)
+    db.add(job); db.commit()
+    return job
+
+def get_job_results(db: Session, job_id: str, after: int, limit: int) -> list[JobResult]:
+    """Keyset page: results with row_index > after, in upload order."""
+    stmt = (select(JobResult)
+            .where(JobResult.job_id == job_id, JobResult.row_index > after)
+            .order_by(JobResult.row_index).limit(limit))
+    return list(db.scalars(stmt))
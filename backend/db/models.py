@@ -1,10 +1,16 @@
-from sqlalchemy import Column, Integer, Float, String, Text, DateTime
+from sqlalchemy import Column, Integer, Float, String, Text, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.dialects.sqlite import JSON as SAJSON
+from sqlalchemy.orm import relationship
 import datetime as dt
 from backend.db.session import Base
 
 class Application(Base):
     __tablename__ = "applications"
+    __table_args__ = (
+        # review-queue listing: equality on status/decision, keyset on (created_at, id)
+        Index("ix_applications_queue", "status", "system_decision", "created_at", "id"),
+        Index("ix_applications_created", "created_at", "id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     created_at = Column(DateTime, default=dt.datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=dt.datetime.utcnow, onupdate=dt.datetime.utcnow, nullable=False)
@@ -19,10 +25,89 @@ class Application(Base):
     final_decision = Column(String(16), nullable=True)    # officer decision for REVIEW
     policy_source = Column(String(64), nullable=True)
     thresholds = Column(SAJSON, nullable=True)
+    model_version = Column(String(32), nullable=True)     # fingerprint of the model artifact that scored it
+    policy_version = Column(String(32), nullable=True)    # version of the thresholds that decided it
 
     review_notes = Column(Text, nullable=True)            # officer notes
     advice = Column(Text, nullable=True)                  # LLM suggestion
     status = Column(String(16), default="OPEN", nullable=False)  # OPEN/CLOSED
+    version = Column(Integer, default=1, server_default="1", nullable=False)  # bumped by each review (compare-and-set)
 
     client_message = Column(Text, nullable=True)   # client-facing "what to improve" message
+    client_message_status = Column(String(16), nullable=True)  # PENDING/READY/FAILED (None = no message)
+
+    # typed model features for SQL analytics (the payload JSON stays the source of truth)
+    features = relationship("ApplicationFeatures", uselist=False, back_populates="application")
+
+class ApplicationFeatures(Base):
+    """One row per application: the normalized model features as typed, indexed columns."""
+    __tablename__ = "application_features"
+    application_id = Column(Integer, ForeignKey("applications.id"), primary_key=True)
+    # numeric (NULL = missing/unparseable, as the model sees NaN)
+    loan_amnt = Column(Float, nullable=True)
+    int_rate = Column(Float, nullable=True)
+    fico_range_low = Column(Float, nullable=True)
+    fico_range_high = Column(Float, nullable=True)
+    annual_inc = Column(Float, nullable=True)
+    dti = Column(Float, nullable=True)
+    revol_util = Column(Float, nullable=True)
+    emp_length_num = Column(Float, nullable=True)
+    term_num = Column(Float, nullable=True)
+    # categorical
+    grade = Column(String(8), nullable=True, index=True)
+    sub_grade = Column(String(8), nullable=True, index=True)
+    home_ownership = Column(String(32), nullable=True, index=True)
+    verification_status = Column(String(32), nullable=True, index=True)
+    purpose = Column(String(64), nullable=True, index=True)
+
+    application = relationship("Application", back_populates="features")
+
+class Rollup(Base):
+    """Per-day portfolio aggregates, kept current by crud as applications are scored and reviewed."""
+    __tablename__ = "rollups"
+    dimension = Column(String(16), primary_key=True)        # all / grade / purpose
+    value = Column(String(64), primary_key=True)            # "" for all; "Unknown" when missing
+    day = Column(String(10), primary_key=True)              # UTC date of created_at (YYYY-MM-DD)
+    n = Column(Integer, default=0, nullable=False)
+    approve = Column(Integer, default=0, nullable=False)    # system decisions
+    review = Column(Integer, default=0, nullable=False)
+    reject = Column(Integer, default=0, nullable=False)
+    final_approve = Column(Integer, default=0, nullable=False)  # auto decisions + officer reviews
+    final_reject = Column(Integer, default=0, nullable=False)
+    pd_sum = Column(Float, default=0.0, nullable=False)
+    pd_min = Column(Float, nullable=True)
+    pd_max = Column(Float, nullable=True)
+
+class RollupPdBucket(Base):
+    """PD histogram per rollup key (fixed-width buckets) for percentiles."""
+    __tablename__ = "rollup_pd_buckets"
+    dimension = Column(String(16), primary_key=True)
+    value = Column(String(64), primary_key=True)
+    day = Column(String(10), primary_key=True)
+    bucket = Column(Integer, primary_key=True)              # floor(pd * PD_BUCKETS)
+    n = Column(Integer, default=0, nullable=False)
+
+class ScoringJob(Base):
+    __tablename__ = "scoring_jobs"
+    id = Column(String(32), primary_key=True)              # uuid4 hex
+    created_at = Column(DateTime, default=dt.datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    filename = Column(String(255), nullable=True)           # original upload name
+    path = Column(String(512), nullable=False)              # stored upload
+    status = Column(String(16), default="QUEUED", nullable=False)  # QUEUED/RUNNING/DONE/FAILED
+    total_rows = Column(Integer, nullable=True)
+    processed_rows = Column(Integer, default=0, nullable=False)
+    error = Column(Text, nullable=True)
+
+class JobResult(Base):
+    __tablename__ = "job_results"
+    __table_args__ = (UniqueConstraint("job_id", "row_index", name="uq_job_results_job_row"),)
+    id = Column(Integer, primary_key=True)
+    job_id = Column(String(32), ForeignKey("scoring_jobs.id"), nullable=False)
+    row_index = Column(Integer, nullable=False)              # 0-based position in the upload
+    prob_default = Column(Float, nullable=False)
+    decision = Column(String(16), nullable=False)
+    policy_source = Column(String(64), nullable=True)
 
@@ -0,0 +1,182 @@
+"""
+Incrementally maintained portfolio rollups.
+
+Every stored application adds to one row per (dimension, value, day) key: the
+whole portfolio ("all", value ""), its grade and its purpose, plus that key's PD
+histogram bucket. Officer reviews add to the final-decision counts of the same
+keys. Updates are upserts (`INSERT .. ON CONFLICT DO UPDATE SET n = n + excluded.n`)
+in the caller's transaction, so rollups commit or roll back together with the
+rows they describe. Reads touch at most (values x days) rows, whatever the size
+of the applications table.
+"""
+import datetime as dt
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session, defer, selectinload
+
+from backend.db.models import Application, Rollup, RollupPdBucket
+
+DIMENSIONS = ("grade", "purpose")
+PD_BUCKETS = 100          # 0.01-wide PD buckets: percentiles are exact to within 0.01
+PERCENTILES = (0.5, 0.9, 0.95)
+MISSING = "Unknown"       # same fill the model uses for missing categoricals
+COUNTS = ("n", "approve", "review", "reject", "final_approve", "final_reject")
+
+Key = Tuple[str, str, str]  # (dimension, value, day)
+
+
+def _insert(db: Session):
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+def _keys(rec: Application) -> List[Key]:
+    day = rec.created_at.date().isoformat()
+    f = rec.features
+    keys = [("all", "", day)]
+    for dim in DIMENSIONS:
+        keys.append((dim, (getattr(f, dim) if f is not None else None) or MISSING, day))
+    return keys
+
+
+def _bucket(pd: float) -> int:
+    return min(PD_BUCKETS - 1, max(0, int(pd * PD_BUCKETS)))
+
+
+def _empty() -> Dict:
+    return {**{c: 0 for c in COUNTS}, "pd_sum": 0.0, "pd_min": None, "pd_max": None}
+
+
+def _upsert(db: Session, counters: Dict[Key, Dict], buckets: Counter) -> None:
+    insert = _insert(db)
+    least, greatest = (func.least, func.greatest) if db.get_bind().dialect.name == "postgresql" else (func.min, func.max)
+    if counters:
+        stmt = insert(Rollup)
+        ex = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["dimension", "value", "day"],
+            set_={
+                **{c: getattr(Rollup, c) + getattr(ex, c) for c in COUNTS},
+                "pd_sum": Rollup.pd_sum + ex.pd_sum,
+                # NULL-safe: review deltas carry no PD
+                "pd_min": least(func.coalesce(Rollup.pd_min, ex.pd_min), func.coalesce(ex.pd_min, Rollup.pd_min)),
+                "pd_max": greatest(func.coalesce(Rollup.pd_max, ex.pd_max), func.coalesce(ex.pd_max, Rollup.pd_max)),
+            },
+        )
+        db.execute(stmt, [dict(c, dimension=k[0], value=k[1], day=k[2]) for k, c in counters.items()])
+    if buckets:
+        stmt = insert(RollupPdBucket)
+        stmt = stmt.on_conflict_do_update(index_elements=["dimension", "value", "day", "bucket"],
+                                          set_={"n": RollupPdBucket.n + stmt.excluded.n})
+        db.execute(stmt, [{"dimension": k[0], "value": k[1], "day": k[2], "bucket": k[3], "n": n}
+                          for k, n in buckets.items()])
+
+
+def record_scored(db: Session, recs: Iterable[Application]) -> None:
+    """Add flushed applications (created_at and features loaded) to their rollups; no commit."""
+    counters: Dict[Key, Dict] = {}
+    buckets: Counter = Counter()
+    for rec in recs:
+        pd = float(rec.prob_default)
+        for key in _keys(rec):
+            c = counters.setdefault(key, _empty())
+            c["n"] += 1
+            c[rec.system_decision.lower()] += 1
+            if rec.final_decision:
+                c["final_" + rec.final_decision.lower()] += 1
+            c["pd_sum"] += pd
+            c["pd_min"] = pd if c["pd_min"] is None else min(c["pd_min"], pd)
+            c["pd_max"] = pd if c["pd_max"] is None else max(c["pd_max"], pd)
+            buckets[key + (_bucket(pd),)] += 1
+    _upsert(db, counters, buckets)
+
+
+def record_reviewed(db: Session, rec: Application, action: str) -> None:
+    """Count an officer's final decision on the application's rollup keys; no commit."""
+    counters = {}
+    for key in _keys(rec):
+        c = _empty()
+        c["final_" + action.lower()] = 1
+        counters[key] = c
+    _upsert(db, counters, Counter())
+
+
+def rebuild(db: Session, batch_size: int = 1000) -> int:
+    """Recompute all rollups from the applications table (one-off full scan) and commit."""
+    db.execute(delete(RollupPdBucket))
+    db.execute(delete(Rollup))
+    total, after = 0, 0
+    while True:
+        stmt = (select(Application).options(defer(Application.payload), selectinload(Application.features))
+                .where(Application.id > after).order_by(Application.id).limit(batch_size))
+        recs = list(db.scalars(stmt))
+        if not recs:
+            break
+        record_scored(db, recs)
+        total += len(recs)
+        after = recs[-1].id
+    db.commit()
+    return total
+
+
+def _percentiles(hist: Dict[int, int], n: int, pd_min: Optional[float], pd_max: Optional[float]) -> Dict:
+    out = {}
+    items = sorted(hist.items())
+    for q in PERCENTILES:
+        name = f"p{int(q * 100)}_pd"
+        if not n:
+            out[name] = None
+            continue
+        target, cum, value = q * n, 0, None
+        for b, cnt in items:  # linear interpolation inside the bucket holding the q-th PD
+            if cum + cnt >= target:
+                value = (b + (target - cum) / cnt) / PD_BUCKETS
+                break
+            cum += cnt
+        value = value if value is not None else pd_max
+        if pd_min is not None and pd_max is not None:
+            value = min(pd_max, max(pd_min, value))
+        out[name] = round(value, 6)
+    return out
+
+
+def summarize(db: Session, dimension: str, group_by: str, day_from: dt.date, day_to: dt.date) -> List[Dict]:
+    """
+    Rollups of `dimension` between two dates (inclusive), one entry per day
+    (group_by="day") or per dimension value summed over the range (group_by="value").
+    """
+    group = getattr(Rollup, group_by)
+    where = (Rollup.dimension == dimension, Rollup.day >= day_from.isoformat(), Rollup.day <= day_to.isoformat())
+    stmt = (select(group.label("key"), *[func.sum(getattr(Rollup, c)).label(c) for c in COUNTS],
+                   func.sum(Rollup.pd_sum).label("pd_sum"), func.min(Rollup.pd_min).label("pd_min"),
+                   func.max(Rollup.pd_max).label("pd_max"))
+            .where(*where).group_by(group).order_by(group))
+    bgroup = getattr(RollupPdBucket, group_by)
+    hist_stmt = (select(bgroup, RollupPdBucket.bucket, func.sum(RollupPdBucket.n))
+                 .where(RollupPdBucket.dimension == dimension, RollupPdBucket.day >= day_from.isoformat(),
+                        RollupPdBucket.day <= day_to.isoformat())
+                 .group_by(bgroup, RollupPdBucket.bucket))
+    hists: Dict[str, Dict[int, int]] = {}
+    for key, bucket, cnt in db.execute(hist_stmt):
+        hists.setdefault(key, {})[bucket] = int(cnt)
+
+    out = []
+    for r in db.execute(stmt).mappings():
+        n = int(r["n"])
+        decided = int(r["final_approve"]) + int(r["final_reject"])
+        out.append({
+            "key": r["key"],
+            "count": n,
+            "approve": int(r["approve"]), "review": int(r["review"]), "reject": int(r["reject"]),
+            "final_approve": int(r["final_approve"]), "final_reject": int(r["final_reject"]),
+            "approval_rate": round(r["final_approve"] / decided, 6) if decided else None,
+            "mean_pd": round(r["pd_sum"] / n, 6) if n else None,
+            "min_pd": r["pd_min"], "max_pd": r["pd_max"],
+            **_percentiles(hists.get(r["key"], {}), n, r["pd_min"], r["pd_max"]),
+        })
+    return out
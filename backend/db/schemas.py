@@ -1,5 +1,5 @@
 import datetime as dt
-from typing import Optional, Literal, Dict
+from typing import Optional, Literal, Dict, List
 from pydantic import BaseModel, ConfigDict, validator
 class ApplicationIn(BaseModel):
     # NEW
@@ -37,17 +37,97 @@ class ApplicationOut(BaseModel):
     final_decision: Optional[Literal["APPROVE","REJECT"]] = None
     policy_source: Optional[str] = None
     thresholds: Dict[str, Optional[float]]
+    model_version: Optional[str] = None
+    policy_version: Optional[str] = None
     status: Literal["OPEN","CLOSED"]
+    version: Optional[int] = None
 
     # optional extras you might already have:
     advice: Optional[str] = None
     advice_source: Optional[str] = None
     review_notes: Optional[str] = None
     client_message: Optional[str] = None
+    client_message_status: Optional[Literal["PENDING","READY","FAILED"]] = None
 
     # NEW: enable attribute-based validation (ORM)
     model_config = ConfigDict(from_attributes=True)
 
+class ApplicationPage(BaseModel):
+    items: List[ApplicationOut]
+    next_cursor: Optional[str] = None   # pass as ?cursor= for the next page; None = last page
+
+class PortfolioSegmentOut(BaseModel):
+    value: Optional[str | float] = None   # feature value (None = missing)
+    count: int
+    avg_pd: float
+    min_pd: float
+    max_pd: float
+    approve: int                          # system decisions
+    review: int
+    reject: int
+    decided: int                          # rows with a final decision
+    approved: int
+    approval_rate: Optional[float] = None # approved / decided
+
+class PortfolioBreakdownOut(BaseModel):
+    by: str
+    segments: List[PortfolioSegmentOut]
+
+class RollupOut(BaseModel):
+    key: str                              # day (YYYY-MM-DD) or grade / purpose value
+    count: int
+    approve: int                          # system decisions
+    review: int
+    reject: int
+    final_approve: int                    # auto decisions + officer reviews
+    final_reject: int
+    approval_rate: Optional[float] = None # final_approve / (final_approve + final_reject)
+    mean_pd: Optional[float] = None
+    min_pd: Optional[float] = None
+    max_pd: Optional[float] = None
+    p50_pd: Optional[float] = None        # from 0.01-wide PD buckets
+    p90_pd: Optional[float] = None
+    p95_pd: Optional[float] = None
+
+class RollupPage(BaseModel):
+    dimension: str
+    date_from: dt.date
+    date_to: dt.date
+    items: List[RollupOut]
+
+class ClientMessageOut(BaseModel):
+    id: int
+    status: Optional[Literal["PENDING","READY","FAILED"]] = None
+    client_message: Optional[str] = None
+
+class JobOut(BaseModel):
+    id: str
+    status: Literal["QUEUED","RUNNING","DONE","FAILED"]
+    filename: Optional[str] = None
+    created_at: dt.datetime
+    started_at: Optional[dt.datetime] = None
+    finished_at: Optional[dt.datetime] = None
+    total_rows: Optional[int] = None
+    processed_rows: int = 0
+    rows_per_sec: Optional[float] = None
+    error: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class JobResultOut(BaseModel):
+    row_index: int
+    prob_default: float
+    decision: Literal["APPROVE","REVIEW","REJECT"]
+    policy_source: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class JobResultsPage(BaseModel):
+    job_id: str
+    items: List[JobResultOut]
+    next_cursor: Optional[int] = None   # pass as ?cursor= to fetch the next page; None = no more rows yet
+
 class ReviewActionIn(BaseModel):
     action: Literal["APPROVE","REJECT"]
     notes: Optional[str] = None
+    version: Optional[int] = None   # version the officer reviewed; 409 if the case changed since
@@ -1,12 +1,68 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.orm import sessionmaker, declarative_base
 from backend.config import settings
 
 connect_args = {"check_same_thread": False} if settings.DB_URL.startswith("sqlite") else {}
 engine = create_engine(settings.DB_URL, connect_args=connect_args)
+
+if settings.DB_URL.startswith("sqlite"):
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragmas(dbapi_conn, _record):
+        # WAL: readers don't block the writer; NORMAL sync is durable across app crashes
+        # (an OS crash can lose the last commits, never corrupt the file)
+        cur = dbapi_conn.cursor()
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA synchronous=NORMAL")
+        cur.execute(f"PRAGMA busy_timeout={int(settings.DB_BUSY_TIMEOUT_MS)}")
+        cur.execute("PRAGMA temp_store=MEMORY")
+        cur.close()
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 Base = declarative_base()
 
 def init_db():
     from backend.db import models  # ensure models are imported
     models.Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
+    _add_missing_indexes()
+    _backfill()
+
+def _backfill():
+    """Derived tables for rows stored before they existed (a no-op query once caught up)."""
+    from backend.db import crud
+    db = SessionLocal()
+    try:
+        crud.backfill_application_features(db)
+        crud.backfill_rollups(db)
+    finally:
+        db.close()
+
+def _add_missing_columns():
+    """
+    create_all() does not alter existing tables: add columns introduced since the
+    DB file was created (nullable or with a server default) so old dev DBs keep working.
+    """
+    insp = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not insp.has_table(table.name):
+                continue
+            existing = {c["name"] for c in insp.get_columns(table.name)}
+            for col in table.columns:
+                if col.name in existing:
+                    continue
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {col.name} {col.type.compile(dialect=engine.dialect)}"
+                if col.server_default is not None:
+                    ddl += f" DEFAULT {col.server_default.arg}"
+                conn.execute(text(ddl))
+
+def _add_missing_indexes():
+    """create_all() skips indexes of tables that already exist: create the ones added since."""
+    with engine.begin() as conn:
+        insp = inspect(conn)  # same connection as the DDL, so the schema it reads is current
+        for table in Base.metadata.sorted_tables:
+            if not insp.has_table(table.name):
+                continue
+            existing = {ix["name"] for ix in insp.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(bind=conn, checkfirst=True)
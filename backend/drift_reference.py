@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Export the training-distribution profile used by the drift monitor.
+
+    python -m backend.drift_reference data/accepted_2007_to_2018Q4.csv
+
+Reads the training file (CSV or Parquet, the raw application columns) with the
+same chunked reader as `backend.bulk_score`, parses every row with the scoring
+normalization and writes per-feature bins and shares for the model's
+feature_set to MODEL_DIR/drift_reference.json (or DRIFT_REFERENCE_PATH).
+"""
+from __future__ import annotations
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+
+from backend.bulk_score import read_chunks
+from backend.config import settings
+from backend.services.drift import build_reference, reference_path
+from backend.services.model_registry import DEFAULT_META_NAME
+from backend.services.normalize import feature_row
+
+
+def model_feature_set() -> List[str]:
+    with open(Path(settings.MODEL_DIR) / DEFAULT_META_NAME, "r", encoding="utf-8") as f:
+        return json.load(f)["feature_set"]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Export the drift reference profile from training data.")
+    ap.add_argument("input", help="CSV or Parquet training file with the raw application columns")
+    ap.add_argument("output", nargs="?", default=None, help="profile JSON (default: the served reference path)")
+    ap.add_argument("--bins", type=int, default=10, help="quantile bins per numeric feature (default 10)")
+    ap.add_argument("--max-rows", type=int, default=500_000, help="rows read from the input (default 500000)")
+    ap.add_argument("--min-share", type=float, default=0.005,
+                    help="categories rarer than this share are pooled as other (default 0.005)")
+    args = ap.parse_args(argv)
+
+    rows, n = [], 0
+    for chunk in read_chunks(args.input, 50_000):
+        records = chunk.astype(object).where(chunk.notna(), None).to_dict("records")
+        rows.extend(feature_row(r) for r in records[:args.max_rows - n])
+        n = len(rows)
+        if n >= args.max_rows:
+            break
+    if not rows:
+        raise SystemExit(f"No rows read from {args.input}")
+    profile = build_reference(pd.DataFrame(rows), model_feature_set(), bins=args.bins, min_share=args.min_share)
+    profile["source"] = Path(args.input).name
+
+    out = Path(args.output) if args.output else reference_path()
+    tmp = out.with_name(out.name + ".tmp")
+    tmp.write_text(json.dumps(profile, indent=2), encoding="utf-8")
+    tmp.replace(out)  # atomic: a running server never reads a half-written profile
+    print(f"wrote {out} ({n:,} rows, {len(profile['features'])} features)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,14 @@
 # app/main.py
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from backend.config import settings
 from backend.db.session import init_db
-from backend.api.endpoints import scoring, applications, advice, review
+from backend.services.client_messages import get_worker
+from backend.services.metrics import METRICS, MetricsMiddleware
+from backend.services.scoring_jobs import get_job_runner
+from backend.services.policy_core import POLICY_STORE, REGISTRY
+from backend.api.endpoints import scoring, applications, advice, review, stats, jobs, admin, analytics
 
 def create_app() -> FastAPI:
     app = FastAPI(title="AI Credit Risk API", version="1.0")
@@ -15,16 +20,33 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
         allow_credentials=True,
     )
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
 
     # Routers (versioned)
     app.include_router(scoring.router, prefix=settings.API_V1_STR)
     app.include_router(applications.router, prefix=settings.API_V1_STR)
     app.include_router(advice.router, prefix=settings.API_V1_STR)
     app.include_router(review.router, prefix=settings.API_V1_STR)
+    app.include_router(stats.router, prefix=settings.API_V1_STR)
+    app.include_router(jobs.router, prefix=settings.API_V1_STR)
+    app.include_router(admin.router, prefix=settings.API_V1_STR)
+    app.include_router(analytics.router, prefix=settings.API_V1_STR)
+
+    @app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+    def metrics():
+        """Prometheus text exposition (stage timers, HTTP metrics, caches, batchers, drift)."""
+        if not settings.METRICS_ENABLED:
+            raise HTTPException(404, "Metrics are disabled (METRICS_ENABLED=0)")
+        return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4")
 
     @app.on_event("startup")
     def on_startup():
         init_db()
+        get_worker().resume_pending()
+        get_job_runner().resume_pending()
+        REGISTRY.start_watcher(settings.MODEL_WATCH_INTERVAL_S)
+        POLICY_STORE.start_watcher(settings.POLICY_WATCH_INTERVAL_S)
 
     return app
 
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Background generation of client-facing REJECT messages.
+
+/score and /review store the application with client_message_status=PENDING and
+enqueue its id here; a small thread pool builds the tips, calls the LLM (with
+retries and exponential backoff) and writes the message back as READY, or marks
+the record FAILED once retries are exhausted. No DB session is held while the
+LLM runs: the payload is read in one session and the result written in another. Clients poll
+GET /v1/applications/{id}/client-message.
+"""
+from __future__ import annotations
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from backend.config import settings
+from backend.db import crud
+from backend.db.models import Application
+from backend.db.session import SessionLocal
+
+PENDING, READY, FAILED = "PENDING", "READY", "FAILED"
+
+
+def generate_client_message(payload: Dict) -> str:
+    from backend.services.improvement_tips import recommend_improvements, format_client_message_llm
+    tips = recommend_improvements(payload, top_k=3)
+    return format_client_message_llm(payload, tips, max_lines=3)
+
+
+class ClientMessageWorker:
+    def __init__(self, generate: Callable[[Dict], str] = generate_client_message,
+                 session_factory: sessionmaker = SessionLocal, workers: int = 2,
+                 retries: int = 3, backoff_s: float = 1.0):
+        self.generate = generate
+        self.session_factory = session_factory
+        self.retries = max(0, int(retries))
+        self.backoff_s = backoff_s
+        self._pool = ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix="client-msg")
+
+    def enqueue(self, app_id: int) -> Future:
+        return self._pool.submit(self._process, app_id)
+
+    def _process(self, app_id: int) -> str:
+        db: Session = self.session_factory()
+        try:
+            rec = crud.get_application(db, app_id)
+            if rec is None or rec.client_message_status != PENDING:
+                return rec.client_message_status if rec else "MISSING"
+            payload = dict(rec.payload or {})
+        finally:
+            db.close()
+
+        message = None
+        for attempt in range(self.retries + 1):
+            try:
+                message = self.generate(payload)
+                break
+            except Exception:
+                if attempt < self.retries:
+                    time.sleep(self.backoff_s * (2 ** attempt))
+
+        status = READY if message else FAILED
+        db = self.session_factory()
+        try:
+            rec = crud.get_application(db, app_id)
+            if rec is None:
+                return "MISSING"
+            crud.set_client_message(db, rec, message or None, status)
+            return status
+        finally:
+            db.close()
+
+    def resume_pending(self) -> int:
+        """Re-enqueue messages left PENDING by a previous process (e.g. after a restart)."""
+        db: Session = self.session_factory()
+        try:
+            ids = [i for (i,) in db.query(Application.id).filter(Application.client_message_status == PENDING)]
+        finally:
+            db.close()
+        for app_id in ids:
+            self.enqueue(app_id)
+        return len(ids)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+
+_WORKER: Optional[ClientMessageWorker] = None
+_WORKER_LOCK = threading.Lock()
+
+
+def get_worker() -> ClientMessageWorker:
+    global _WORKER
+    if _WORKER is None:
+        with _WORKER_LOCK:
+            if _WORKER is None:
+                _WORKER = ClientMessageWorker(
+                    workers=settings.CLIENT_MESSAGE_WORKERS,
+                    retries=settings.CLIENT_MESSAGE_RETRIES,
+                    backoff_s=settings.CLIENT_MESSAGE_BACKOFF_S,
+                )
+    return _WORKER
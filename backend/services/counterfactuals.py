@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+Threshold-aware counterfactual search for improvement tips.
+
+A tree ensemble's PD only changes when a feature crosses one of its split
+thresholds, so for each actionable feature we only try the value just below each
+threshold under the applicant's current value (nearest first). Candidates from all
+features are scored in batches, cheapest first, until every feature has its
+smallest change that gets under thr_review or the eval/time budget runs out.
+"""
+from __future__ import annotations
+import copy
+import math
+import time
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from backend.config import settings
+from backend.services import policy_core
+from backend.services.score_cache import cached_pds
+from backend.services.tree_engine import TreeEnsemble
+
+ACTIONABLE = ("loan_amnt", "revol_util", "dti", "term_num")
+MIN_LOAN = 1000.0
+
+
+@lru_cache(maxsize=2)
+def _split_points(bundle: policy_core.ModelBundle) -> Dict[str, np.ndarray]:
+    # keyed on the model bundle so a hot-reloaded artifact gets its own breakpoints
+    encoder = bundle.encoder
+    if encoder is None:
+        return {}
+    engine = bundle.engine or TreeEnsemble.from_booster(bundle.classifier.get_booster())
+    return {f: engine.split_points(encoder.numeric_columns.index(f))
+            for f in ACTIONABLE if f in encoder.numeric_columns}
+
+
+def split_points() -> Dict[str, np.ndarray]:
+    """{feature: sorted thresholds} for the actionable features of the served model."""
+    return _split_points(policy_core.current_model())
+
+
+def _below(t: float, step: float) -> float:
+    # largest multiple of `step` the model sees as strictly below threshold t (float32 compare)
+    v = math.floor(t / step) * step
+    while np.float32(v) >= np.float32(t):
+        v -= step
+    return round(v, 6)
+
+
+def apply_change(payload: Dict, feature: str, new: float) -> Dict:
+    """Copy of `payload` with the actionable `feature` set to `new` (in payload units)."""
+    q = copy.deepcopy(payload)
+    if feature == "loan_amnt":
+        q["loan_amnt"] = new
+    elif feature in ("revol_util", "dti"):
+        q[feature] = f"{new:.1f}%"
+    else:  # term_num
+        q["term"] = f"{int(new)} months"
+    return q
+
+
+def make_change(payload: Dict, feature: str, cur: float, new: float) -> Optional[Dict]:
+    """Labelled, costed change of one feature from `cur` to `new` (None if not allowed)."""
+    if feature == "loan_amnt":
+        if new < MIN_LOAN:
+            return None
+        label = f"Reduce loan amount by ${int(cur - new):,} (target ${int(new):,})"
+        cost = (cur - new) / cur
+    elif feature in ("revol_util", "dti"):
+        if new <= 0:  # 0 is read as "missing" by the model
+            return None
+        label = (f"Pay down credit cards to ~{new:.1f}% utilization" if feature == "revol_util"
+                 else f"Lower DTI to ~{new:.1f}%")
+        cost = (cur - new) / 100.0
+    else:  # term_num
+        label = f"Switch to a {int(new)}-month term"
+        cost = 0.25
+    return {"action": label, "feature": feature, "from": cur, "to": new, "cost": round(cost, 6),
+            "payload": apply_change(payload, feature, new)}
+
+
+def current_values(payload: Dict) -> Dict[str, float]:
+    """Actionable features of `payload` in model units (missing/unparseable ones left out)."""
+    row = policy_core._payload_row(payload)
+    out = {}
+    for feature in ACTIONABLE:
+        try:
+            v = float(row.get(feature))
+        except (TypeError, ValueError):
+            continue
+        if not math.isnan(v):
+            out[feature] = v
+    return out
+
+
+def breakpoint_candidates(payload: Dict) -> List[Dict]:
+    """One candidate per threshold interval below the current value, all features, cheapest first."""
+    values_now = current_values(payload)
+    out: List[Dict] = []
+    for feature, thresholds in split_points().items():
+        if feature not in values_now:
+            continue
+        cur = values_now[feature]
+        if feature == "term_num":
+            values = [36.0] if cur > 36.0 and any(36.0 < t <= cur for t in thresholds) else []
+        else:
+            step = 1.0 if feature == "loan_amnt" else 0.1
+            values = sorted({_below(float(t), step) for t in thresholds if t <= cur}, reverse=True)
+        for v in values:
+            if v < cur:
+                c = make_change(payload, feature, cur, v)
+                if c is not None:
+                    out.append(c)
+    out.sort(key=lambda c: c["cost"])
+    return out
+
+
+def find_minimal_changes(payload: Dict, thr: float, max_evals: Optional[int] = None,
+                         time_budget_ms: Optional[float] = None,
+                         pds_fn: Callable[[List[Dict]], List[float]] = cached_pds) -> List[Dict]:
+    """
+    Smallest single-feature change (per actionable feature) that brings PD under `thr`,
+    sorted by cost. Stops early once the evaluation or time budget is spent.
+    """
+    max_evals = settings.CF_MAX_EVALS if max_evals is None else max_evals
+    budget_s = (settings.CF_TIME_BUDGET_MS if time_budget_ms is None else time_budget_ms) / 1000.0
+    start = time.perf_counter()
+    current_pd = pds_fn([payload])[0]
+    if current_pd < thr:
+        return []
+
+    found: Dict[str, Dict] = {}
+    pending = breakpoint_candidates(payload)
+    evals, chunk = 0, max(1, settings.CF_BATCH_SIZE)
+    while pending and evals < max_evals and time.perf_counter() - start < budget_s:
+        n = min(chunk, max_evals - evals)
+        batch, pending = pending[:n], pending[n:]
+        evals += len(batch)
+        for c, npd in zip(batch, pds_fn([c["payload"] for c in batch])):
+            # batches are cost-ordered, so the first crossing per feature is its minimal change
+            if npd < thr and c["feature"] not in found:
+                found[c["feature"]] = {**c, "new_pd": round(npd, 6), "delta_pd": round(current_pd - npd, 6)}
+        pending = [c for c in pending if c["feature"] not in found]
+    return sorted(found.values(), key=lambda c: c["cost"])
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming per-feature drift monitor (PSI against the training distribution).
+
+The reference profile (`python -m backend.drift_reference`, written next to the
+model) fixes each feature's bins: quantile edges for numerics, the frequent
+categories (+ "other") for categoricals, plus a missing bin, with the training
+share of each bin. Every scored payload increments one counter per feature in
+the current time window, so memory is O(features x bins x windows) however many
+applications are scored. PSI per feature is computed from those counters on
+read: for the current window, each of the last DRIFT_WINDOWS closed windows,
+and everything since start. Without a reference profile the monitor is off.
+"""
+from __future__ import annotations
+import json
+import math
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from backend.config import settings
+from backend.services.normalize import CATEGORICAL_FEATURES, feature_row
+
+PSI_EPS = 1e-4        # floor for empty bins (PSI is undefined for zero shares)
+PSI_MODERATE = 0.10   # conventional PSI bands: < 0.1 stable, 0.1-0.25 moderate, >= 0.25 significant
+PSI_SIGNIFICANT = 0.25
+OTHER = "__other__"
+
+
+def psi(expected: Sequence[float], counts: Sequence[int]) -> Optional[float]:
+    """Population stability index of observed `counts` against the `expected` shares."""
+    n = float(sum(counts))
+    if n <= 0:
+        return None
+    total = 0.0
+    for e, c in zip(expected, counts):
+        e, a = max(float(e), PSI_EPS), max(c / n, PSI_EPS)
+        total += (a - e) * math.log(a / e)
+    return round(total, 6)
+
+
+def psi_band(value: Optional[float]) -> Optional[str]:
+    if value is None:
+        return None
+    return "significant" if value >= PSI_SIGNIFICANT else "moderate" if value >= PSI_MODERATE else "stable"
+
+
+# -------------------------------
+# Reference profile
+# -------------------------------
+def build_reference(frame: pd.DataFrame, features: Sequence[str], bins: int = 10,
+                    min_share: float = 0.005) -> Dict[str, Any]:
+    """Profile of a frame of `feature_row`s: per-feature bins and the share of rows in each."""
+    n = len(frame)
+    out: Dict[str, Any] = {}
+    for f in features:
+        col = frame[f] if f in frame.columns else pd.Series([None] * n, dtype=object)
+        if f in CATEGORICAL_FEATURES:
+            values = col.astype(object).where(col.notna(), None)
+            shares = values.dropna().astype(str).value_counts() / max(n, 1)
+            categories = sorted(shares[shares >= min_share].index)
+            spec = {"type": "categorical", "categories": categories}
+        else:
+            values = pd.to_numeric(col, errors="coerce").to_numpy(dtype=float)
+            present = values[~np.isnan(values)]
+            qs = np.quantile(present, np.linspace(0, 1, bins + 1)[1:-1]) if len(present) else []
+            spec = {"type": "numeric", "edges": sorted({round(float(q), 6) for q in qs})}
+        hist = FeatureBins(spec)
+        if hist.numeric:
+            idx = np.where(np.isnan(values), hist.size - 1, np.searchsorted(hist.edges, values, side="right"))
+        else:
+            idx = np.fromiter((hist.index(v) for v in values.tolist()), dtype=int, count=n)
+        counts = np.bincount(idx.astype(int), minlength=hist.size).tolist()
+        spec["shares"] = [round(c / max(n, 1), 6) for c in counts]
+        out[f] = spec
+    return {"rows": n, "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), "features": out}
+
+
+def load_reference(path: Path) -> Optional[Dict[str, Any]]:
+    if not path.exists():
+        return None
+    with path.open("r", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+class FeatureBins:
+    """Maps a feature value to its bin: [numeric bins | categories + other] + missing (last)."""
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.numeric = spec["type"] == "numeric"
+        if self.numeric:
+            self.edges = np.asarray(spec["edges"], dtype=float)
+            self.size = len(self.edges) + 2
+        else:
+            self.categories = {c: i for i, c in enumerate(spec["categories"])}
+            self.size = len(self.categories) + 2
+
+    def index(self, value: Any) -> int:
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return self.size - 1
+        if self.numeric:
+            try:
+                v = float(value)
+            except (TypeError, ValueError):
+                return self.size - 1
+            if math.isnan(v):
+                return self.size - 1
+            return int(np.searchsorted(self.edges, v, side="right"))
+        return self.categories.get(str(value), self.size - 2)
+
+    def labels(self, spec: Dict[str, Any]) -> List[str]:
+        if self.numeric:
+            e = [f"{x:g}" for x in spec["edges"]]
+            return [f"<{e[0]}" if e else "all"] + [f"[{a},{b})" for a, b in zip(e, e[1:])] + \
+                   ([f">={e[-1]}"] if e else []) + ["missing"]
+        return list(spec["categories"]) + [OTHER, "missing"]
+
+
+# -------------------------------
+# Streaming monitor
+# -------------------------------
+class DriftMonitor:
+    def __init__(self, reference: Dict[str, Any], window_s: float = 3600.0, windows: int = 24,
+                 min_rows: int = 100, clock: Callable[[], float] = time.time):
+        self.reference = reference
+        self.features = list(reference["features"])
+        self.bins = {f: FeatureBins(reference["features"][f]) for f in self.features}
+        self.window_s = float(window_s)
+        self.min_rows = int(min_rows)
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._start = self._window_start(clock())
+        self._current = self._zeros()
+        self._n = 0
+        self._closed: Deque[Dict[str, Any]] = deque(maxlen=max(0, int(windows)))
+        self._total = self._zeros()
+        self._total_n = 0
+
+    def _zeros(self) -> Dict[str, List[int]]:
+        return {f: [0] * self.bins[f].size for f in self.features}
+
+    def _window_start(self, now: float) -> float:
+        return now - (now % self.window_s) if self.window_s > 0 else 0.0
+
+    def _roll(self, now: float) -> None:
+        if self.window_s <= 0 or now < self._start + self.window_s:
+            return
+        self._closed.appendleft({"start": self._start, "n": self._n, "counts": self._current})
+        self._start, self._current, self._n = self._window_start(now), self._zeros(), 0
+
+    def observe(self, payloads: Iterable[dict]) -> None:
+        rows = [feature_row(p) for p in payloads]
+        if not rows:
+            return
+        idx = {f: [self.bins[f].index(r.get(f)) for r in rows] for f in self.features}  # outside the lock
+        with self._lock:
+            self._roll(self.clock())
+            for f, ids in idx.items():
+                cur, tot = self._current[f], self._total[f]
+                for i in ids:
+                    cur[i] += 1
+                    tot[i] += 1
+            self._n += len(rows)
+            self._total_n += len(rows)
+
+    def _report(self, start: Optional[float], n: int, counts: Dict[str, List[int]]) -> Dict[str, Any]:
+        feats = {}
+        for f in self.features:
+            value = psi(self.reference["features"][f]["shares"], counts[f])
+            feats[f] = {"psi": value, "band": psi_band(value) if n >= self.min_rows else None}
+        return {"start": start, "n": n, "features": feats}
+
+    def snapshot(self, detail: bool = False) -> Dict[str, Any]:
+        with self._lock:
+            self._roll(self.clock())
+            current = (self._start, self._n, {f: list(c) for f, c in self._current.items()})
+            closed = [(w["start"], w["n"], w["counts"]) for w in self._closed]
+            total = (None, self._total_n, {f: list(c) for f, c in self._total.items()})
+        windows = [self._report(*w) for w in [current] + closed]
+        out = {
+            "reference": {k: self.reference.get(k) for k in ("rows", "created_at", "source")},
+            "window_s": self.window_s,
+            "min_rows": self.min_rows,
+            "windows": windows,                     # current (still filling) first
+            "cumulative": self._report(*total),
+            "alerts": sorted({f for w in windows[:2] for f, v in w["features"].items() if v["band"] == "significant"}),
+        }
+        if detail:  # observed vs expected shares per bin, cumulative
+            out["bins"] = {
+                f: [{"bin": label, "expected": e, "observed": round(c / total[1], 6) if total[1] else None}
+                    for label, e, c in zip(self.bins[f].labels(self.reference["features"][f]),
+                                           self.reference["features"][f]["shares"], total[2][f])]
+                for f in self.features
+            }
+        return out
+
+
+def reference_path() -> Path:
+    return Path(settings.DRIFT_REFERENCE_PATH) if settings.DRIFT_REFERENCE_PATH \
+        else Path(settings.MODEL_DIR) / "drift_reference.json"
+
+
+_MONITOR: Optional[DriftMonitor] = None
+_MONITOR_LOCK = threading.Lock()
+_NEXT_LOOKUP = 0.0
+
+
+def get_drift_monitor() -> Optional[DriftMonitor]:
+    """Process-wide monitor; None when DRIFT_ENABLED is off or no reference profile exists (yet)."""
+    global _MONITOR, _NEXT_LOOKUP
+    if not settings.DRIFT_ENABLED:
+        return None
+    if _MONITOR is None and time.monotonic() >= _NEXT_LOOKUP:
+        with _MONITOR_LOCK:
+            if _MONITOR is None:
+                reference = load_reference(reference_path())
+                if reference is None:
+                    _NEXT_LOOKUP = time.monotonic() + 30.0  # picked up once exported, without a restart
+                else:
+                    _MONITOR = DriftMonitor(reference, settings.DRIFT_WINDOW_S, settings.DRIFT_WINDOWS,
+                                            settings.DRIFT_MIN_ROWS)
+    return _MONITOR
+
+
+def observe(payloads: List[dict]) -> None:
+    monitor = get_drift_monitor()
+    if monitor is not None:
+        monitor.observe(payloads)
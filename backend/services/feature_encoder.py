@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Pandas-free encoder that turns prepared feature rows straight into the matrix the
+fitted classifier expects, i.e. the output of the pipeline's ColumnTransformer
+("num" passthrough + "cat" OneHotEncoder(handle_unknown="ignore")).
+
+Built once at model load; per call it only does float parsing and dict lookups.
+"""
+from __future__ import annotations
+import math
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+def _to_number(v: Any) -> float:
+    # scalar equivalent of pd.to_numeric(..., errors="coerce")
+    if v is None:
+        return math.nan
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class FeatureEncoder:
+    def __init__(self, numeric_columns: Sequence[str], categorical_columns: Sequence[str],
+                 categories: Sequence[Sequence[Any]], zero_is_missing: bool):
+        self.numeric_columns = list(numeric_columns)
+        self.categorical_columns = list(categorical_columns)
+        self.n_features = len(self.numeric_columns) + sum(len(c) for c in categories)
+        # one {category -> output column} map per categorical feature
+        self._cat_index: List[Dict[Any, int]] = []
+        offset = len(self.numeric_columns)
+        for cats in categories:
+            self._cat_index.append({c: offset + i for i, c in enumerate(cats)})
+            offset += len(cats)
+        # The ColumnTransformer emits CSR, where XGBoost treats unstored zeros as
+        # missing. Dense input must mark those cells NaN to walk the same branches.
+        self.zero_is_missing = zero_is_missing
+        self._fill = math.nan if zero_is_missing else 0.0
+
+    @classmethod
+    def from_pipeline(cls, pipeline: Any, meta: Dict[str, Any]) -> Optional["FeatureEncoder"]:
+        """
+        Compile an encoder from a fitted `Pipeline([("pre", ColumnTransformer), ("clf", ...)])`.
+        Returns None when the preprocessor is not the plain passthrough + one-hot layout
+        this encoder mirrors (callers then keep using the DataFrame route).
+        """
+        pre = getattr(pipeline, "named_steps", {}).get("pre")
+        if pre is None or not hasattr(pre, "transformers_"):
+            return None
+        num_cols, cat_cols, categories = None, None, None
+        for name, trans, cols in pre.transformers_:
+            if name == "remainder":
+                if not (isinstance(trans, str) and trans == "drop"):
+                    return None
+            elif name == "num":
+                identity = type(trans).__name__ == "FunctionTransformer" and trans.func is None
+                if not (identity or (isinstance(trans, str) and trans == "passthrough")):
+                    return None
+                num_cols = list(cols)
+            elif name == "cat":
+                if (type(trans).__name__ != "OneHotEncoder" or trans.handle_unknown != "ignore"
+                        or trans.drop_idx_ is not None
+                        or getattr(trans, "infrequent_categories_", None) is not None):
+                    return None
+                cat_cols = list(cols)
+                categories = [list(c) for c in trans.categories_]
+            else:
+                return None
+        if num_cols is None or cat_cols is None:
+            return None
+        if set(num_cols) != set(meta.get("numeric_columns") or num_cols) \
+                or set(cat_cols) != set(meta.get("categorical_columns") or cat_cols):
+            return None
+        return cls(num_cols, cat_cols, categories, zero_is_missing=bool(getattr(pre, "sparse_output_", False)))
+
+    def encode_rows(self, rows: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """Encode prepared rows (see `policy_core._payload_row`) into an (n, n_features) float64 matrix."""
+        X = np.full((len(rows), self.n_features), self._fill, dtype=np.float64)
+        for i, row in enumerate(rows):
+            out = X[i]
+            for j, col in enumerate(self.numeric_columns):
+                v = _to_number(row.get(col))
+                if v != 0.0 or not self.zero_is_missing:
+                    out[j] = v
+            for col, index in zip(self.categorical_columns, self._cat_index):
+                v = row.get(col)
+                if v is None or (isinstance(v, float) and math.isnan(v)):
+                    v = "Unknown"
+                try:
+                    k = index.get(v)
+                except TypeError:  # unhashable -> unknown category
+                    k = None
+                if k is not None:
+                    out[k] = 1.0
+        return X
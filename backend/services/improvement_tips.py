@@ -1,21 +1,19 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
-import json
 import copy
 from typing import Any, Dict, List, Tuple, Optional
-from functools import lru_cache
 import os
 
-from backend.services.policy_core import score_payload, POLICY
+from backend.services.policy_core import current_policy
+from backend.services.score_cache import cached_pds
+from backend.services.counterfactuals import find_minimal_changes
+from backend.services.plan_search import beam_search_plan, plan_actions
+from backend.services.llm_cache import cached_generation
+from backend.services.llm import get_llm
+from backend.services.metrics import stage, timed
 
 USE_LLM = True
-try:
-    from openai import OpenAI
-    _OPENAI_OK = True
-except Exception:
-    _OPENAI_OK = False
 LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4o-mini")
-LLM_TIMEOUT = int(os.getenv("LLM_TIMEOUT", "30"))
 
 # ---------- utilities ----------
 def _copy(d: Dict) -> Dict:
@@ -36,31 +34,11 @@ def _to_float(x: Any) -> Optional[float]:
     except: return None
 
 def _thr_review() -> float:
-    return float(POLICY.get("thr_review", 0.5))
+    return float(current_policy().get("thr_review", 0.5))
 
-def _freeze_payload_for_cache(p: Dict) -> str:
-    """
-    Make payload hashable & stable for caching. Keep only common fields that
-    affect scoring (adjust to your feature set if needed).
-    """
-    keys = [
-        "loan_amnt","int_rate","fico_range_low","fico_range_high",
-        "annual_inc","dti","revol_util","emp_length","term",
-        "grade","sub_grade","home_ownership","verification_status","purpose",
-        # keep names too so the LLM message can be personalized,
-        # but they don't affect PD so they could be omitted from cache key
-        "first_name","last_name"
-    ]
-    slim = {k: p.get(k) for k in keys if k in p}
-    return json.dumps(slim, sort_keys=True)
-
-@lru_cache(maxsize=4096)
-def _score_cached(payload_key: str) -> float:
-    payload = json.loads(payload_key)
-    return float(score_payload(payload)["prob_default"])
-
-def _get_pd(payload: Dict) -> float:
-    return _score_cached(_freeze_payload_for_cache(payload))
+def _get_pds(payloads: List[Dict]) -> List[float]:
+    """PDs for many payloads via the shared feature-keyed cache; misses go in ONE model call."""
+    return cached_pds(payloads)
 
 # ---------- fast candidate generation (small, discrete set) ----------
 def _concrete_candidates(payload: Dict) -> List[Tuple[str, Dict]]:
@@ -128,20 +106,26 @@ def _concrete_candidates(payload: Dict) -> List[Tuple[str, Dict]]:
     return out[:12]
 
 # ---------- fast selection logic ----------
+@timed("recommend_improvements")
 def recommend_improvements(payload: Dict, top_k: int = 3) -> Dict:
     """
     Fast version:
     - Evaluate a small, discrete set of candidates (<= 12)
-    - Score with LRU-cached scorer
-    - Return top_k by delta and a short greedy plan (<= 2 steps)
+    - Score with the shared feature-keyed cache: the current payload and all first-step
+      candidates in one model call
+    - Return top_k by delta
+    - Search the model's split thresholds for the smallest single change that
+      crosses thr_review
+    - Beam-search multi-step plans over those actions (one batch per depth level)
+      and return the cheapest plan that crosses thr_review
     """
     thr = _thr_review()
-    current_pd = _get_pd(payload)
-
     cands = _concrete_candidates(payload)
+    pds = _get_pds([payload] + [q for _, q in cands])
+    current_pd = pds[0]
+
     evaluated: List[Dict] = []
-    for label, q in cands:
-        new_pd = _get_pd(q)
+    for (label, q), new_pd in zip(cands, pds[1:]):
         evaluated.append({
             "action": label,
             "new_pd": round(new_pd, 6),
@@ -153,57 +137,38 @@ def recommend_improvements(payload: Dict, top_k: int = 3) -> Dict:
     evaluated.sort(key=lambda x: (-x["delta_pd"], x["new_pd"]))
     best_tips = evaluated[:max(1, top_k)]
 
-    # Greedy plan (up to 2 steps) using the same discrete set, avoiding duplicate labels
-    greedy: List[Dict] = []
-    work_p = _copy(payload)
-    work_pd = current_pd
-    used_labels = set()
-    for _ in range(2):
-        step_best = None
-        step_best_drop = 0.0
-        for label, q in _concrete_candidates(work_p):
-            if label in used_labels:  # avoid repeating the same action text
-                continue
-            npd = _get_pd(q)
-            drop = work_pd - npd
-            if drop > step_best_drop + 1e-9:
-                step_best_drop = drop
-                step_best = {
-                    "action": label,
-                    "new_pd": round(npd, 6),
-                    "delta_pd": round(drop, 6),
-                    "payload": q
-                }
-        if not step_best or step_best_drop <= 1e-6:
-            break
-        greedy.append(step_best)
-        used_labels.add(step_best["action"])
-        work_p = step_best["payload"]
-        work_pd = step_best["new_pd"]
-        if work_pd < thr:
-            break
+    minimal = find_minimal_changes(payload, thr) if current_pd >= thr else []
+    plan = beam_search_plan(payload, thr, plan_actions(payload, minimal), current_pd)
 
     return {
         "details": {"current_pd": round(current_pd, 6), "thr_review": thr},
         "best_tips": best_tips,
-        "greedy_plan": greedy,
-        "crosses_threshold": (len(greedy) > 0 and greedy[-1]["new_pd"] < thr),
+        "plan": plan["steps"],
+        "plan_cost": plan["cost"],
+        "greedy_plan": plan["steps"],  # kept for existing consumers
+        "minimal_changes": minimal,
+        "crosses_threshold": plan["crosses"],
     }
 
 # ---------- Client message (LLM using concrete labels) ----------
 def _client_name(payload: Dict) -> str:
     return (f"{(payload.get('first_name') or '').strip()} {(payload.get('last_name') or '').strip()}".strip() or "there")
 
+# The LLM writes this token instead of the name, so one cached generation serves many applicants
+NAME_PLACEHOLDER = "[APPLICANT_NAME]"
+
 def format_client_message_llm(payload: Dict, tips_obj: Dict, max_lines: int = 3) -> str:
     """
     LLM-rendered message from concrete actions (labels), without probabilities.
+    Cached on the action labels; the applicant name is substituted after lookup.
     If LLM unavailable, raise (since you want LLM-only).
     """
-    if not (USE_LLM and _OPENAI_OK):
-        raise RuntimeError("LLM client not available")
+    llm = get_llm()
+    if not (USE_LLM and llm.available()):
+        raise RuntimeError(f"LLM client not available ({llm.unavailable_reason()})")
 
-    # Prefer greedy plan (goal-directed), else best_tips
-    steps = tips_obj.get("greedy_plan") or tips_obj.get("best_tips") or []
+    # Prefer the plan (goal-directed), else best_tips
+    steps = tips_obj.get("plan") or tips_obj.get("greedy_plan") or tips_obj.get("best_tips") or []
     labels = [s["action"] for s in steps[:max_lines]]
     if not labels:
         labels = ["Consider a smaller amount", "Shorten the term", "Pay down revolving balances"]
@@ -216,9 +181,10 @@ def format_client_message_llm(payload: Dict, tips_obj: Dict, max_lines: int = 3)
         "- Do NOT mention probabilities, AI, risk scores, or internal thresholds.\n"
         "- Keep it under short.\n"
         "- Signed: Compliance Officer\n"
+        f"- Address the applicant as {NAME_PLACEHOLDER} exactly (it is replaced later).\n"
     )
     usr = (
-        f"Applicant name: {_client_name(payload)}\n\n"
+        f"Applicant name: {NAME_PLACEHOLDER}\n\n"
         "Use these concrete actions:\n" + "\n".join(f"- {a}" for a in labels) + "\n\n"
         "Write a brief message that:\n"
         "- Thanks the applicant\n"
@@ -226,20 +192,11 @@ def format_client_message_llm(payload: Dict, tips_obj: Dict, max_lines: int = 3)
         "- Ends with an encouraging close"
     )
 
-    client = OpenAI(timeout=LLM_TIMEOUT)
-    '''resp = client.chat.completions.create(
-        model=LLM_MODEL,
-        messages=[{"role":"system","content":sys},{"role":"user","content":usr}],
-        temperature=0.3,
-    )'''
-    #text = (resp.choices[0].message.content or "").strip()
-    resp = client.responses.create(
-            model=LLM_MODEL,
-            instructions=sys,
-            input=usr,
-            temperature=0.2
-        )
-    text = resp.output_text
+    def generate() -> str:
+        with stage("llm_client_message"):
+            return llm.complete(sys, usr, model=LLM_MODEL, temperature=0.2)
+
+    text = cached_generation("client_message", [llm.model_id(LLM_MODEL), labels], generate)
     if not text:
         raise RuntimeError("LLM returned empty client message")
-    return text
+    return text.replace(NAME_PLACEHOLDER, _client_name(payload))
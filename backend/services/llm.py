@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Pluggable LLM backend for officer advice and client messages.
+
+LLM_BACKEND selects the implementation:
+  openai  the OpenAI Responses API (needs OPENAI_API_KEY)
+  local   an in-process stand-in with no network. Its output is deterministic
+          (a function of the prompt only). Its latency is lognormal with median
+          LLM_LOCAL_LATENCY_MS and shape LLM_LOCAL_LATENCY_SIGMA, capped at
+          LLM_LOCAL_LATENCY_MAX_MS. A fraction LLM_LOCAL_ERROR_RATE of calls
+          raise LLMError. Latency and errors are drawn from a generator seeded
+          with LLM_LOCAL_SEED. It is meant for load tests, benchmarks and offline
+          development of the LLM-dependent paths.
+Callers take the process-wide backend from `get_llm()`, check `available()`, and
+call `complete(instructions, prompt, model)`.
+"""
+from __future__ import annotations
+import hashlib
+import math
+import random
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from backend.config import settings
+
+
+class LLMError(RuntimeError):
+    pass
+
+
+class LLMBackend(ABC):
+    name = "base"
+
+    def available(self) -> bool:
+        return True
+
+    def unavailable_reason(self) -> Optional[str]:
+        return None
+
+    def model_id(self, model: str) -> str:
+        """Identifies the generator in cache keys, so outputs of different backends never mix."""
+        return model
+
+    @abstractmethod
+    def complete(self, instructions: str, prompt: str, model: str, temperature: float = 0.2) -> str:
+        """The model's reply to `prompt` under `instructions`; raises on failure."""
+
+
+class OpenAIBackend(LLMBackend):
+    name = "openai"
+
+    def __init__(self, api_key: Optional[str] = None, timeout_s: float = 30.0):
+        self.api_key = api_key
+        self.timeout_s = timeout_s
+        self._client = None
+        self._lock = threading.Lock()
+        try:
+            import openai  # noqa: F401
+            self._importable = True
+        except Exception:
+            self._importable = False
+
+    def available(self) -> bool:
+        return self._importable and bool(self.api_key)
+
+    def unavailable_reason(self) -> Optional[str]:
+        if not self._importable:
+            return "openai package not installed"
+        return None if self.api_key else "no OPENAI_API_KEY"
+
+    def _get_client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from openai import OpenAI
+                    self._client = OpenAI(api_key=self.api_key, timeout=self.timeout_s)  # thread-safe, reused
+        return self._client
+
+    def complete(self, instructions: str, prompt: str, model: str, temperature: float = 0.2) -> str:
+        resp = self._get_client().responses.create(
+            model=model,
+            instructions=instructions,
+            input=prompt,
+            temperature=temperature,
+        )
+        return resp.output_text
+
+
+class LocalLLMBackend(LLMBackend):
+    name = "local"
+
+    def __init__(self, latency_ms: float = 800.0, sigma: float = 0.4, max_latency_ms: float = 10_000.0,
+                 error_rate: float = 0.0, seed: int = 0, sleep=time.sleep):
+        self.latency_ms = max(0.0, float(latency_ms))
+        self.sigma = max(0.0, float(sigma))
+        self.max_latency_ms = float(max_latency_ms)
+        self.error_rate = min(1.0, max(0.0, float(error_rate)))
+        self.sleep = sleep
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+
+    def model_id(self, model: str) -> str:
+        return f"local:{model}"
+
+    def _draw(self):
+        with self._lock:
+            self.calls += 1
+            z, u = self._rng.gauss(0.0, 1.0), self._rng.random()
+        latency = 0.0 if self.latency_ms == 0 else min(self.max_latency_ms, self.latency_ms * math.exp(self.sigma * z))
+        return latency / 1000.0, u < self.error_rate
+
+    def complete(self, instructions: str, prompt: str, model: str, temperature: float = 0.2) -> str:
+        latency_s, fail = self._draw()
+        self.sleep(latency_s)
+        if fail:
+            with self._lock:
+                self.errors += 1
+            raise LLMError("local LLM stand-in: injected error")
+        return self.render(prompt)
+
+    @staticmethod
+    def render(prompt: str) -> str:
+        """Deterministic reply built from the prompt: greeting, its bullet points, a fixed close."""
+        name = re.search(r"^Applicant name:\s*(.+)$", prompt, re.M)
+        blocks = [[ln.strip() for ln in block.splitlines() if ln.strip().startswith("- ")]
+                  for block in prompt.split("\n\n")]
+        bullets = next((block for block in blocks if block), [])[:5]  # first bullet list only
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+        if name:  # client message
+            body = "\n".join(bullets) or "- Review your application details"
+            return (f"Dear {name.group(1).strip()},\n\nThank you for your application. "
+                    f"The following steps would strengthen it:\n{body}\n\n"
+                    f"We encourage you to reapply.\nCompliance Officer\n[local:{digest}]")
+        pd = re.search(r"^PD:\s*([0-9.]+)", prompt, re.M)
+        verdict = "reject" if pd and float(pd.group(1)) >= 0.7 else "approve with conditions"
+        return (f"Recommendation: {verdict}.\nChecks: verify income and employment; review DTI and "
+                f"revolving utilization; confirm the loan purpose and affordability.\n[local:{digest}]")
+
+
+def build_llm() -> LLMBackend:
+    kind = settings.LLM_BACKEND.lower()
+    if kind == "openai":
+        return OpenAIBackend(settings.OPENAI_API_KEY, settings.LLM_TIMEOUT_S)
+    if kind == "local":
+        return LocalLLMBackend(settings.LLM_LOCAL_LATENCY_MS, settings.LLM_LOCAL_LATENCY_SIGMA,
+                               settings.LLM_LOCAL_LATENCY_MAX_MS, settings.LLM_LOCAL_ERROR_RATE,
+                               settings.LLM_LOCAL_SEED)
+    raise ValueError(f"Unknown LLM_BACKEND: {settings.LLM_BACKEND!r} (expected 'openai' or 'local')")
+
+
+_LLM: Optional[LLMBackend] = None
+_LLM_LOCK = threading.Lock()
+
+
+def get_llm() -> LLMBackend:
+    global _LLM
+    if _LLM is None:
+        with _LLM_LOCK:
+            if _LLM is None:
+                _LLM = build_llm()
+    return _LLM
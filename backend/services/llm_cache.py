@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Persistent cache for LLM generations (client messages, officer advice).
+
+Keys are built from the normalized prompt inputs only (no applicant names), so one
+generation is reused across applicants; personalization happens after lookup.
+Only successful generations are stored.
+"""
+from __future__ import annotations
+import threading
+from typing import Any, Callable, Optional
+
+from backend.config import settings
+from backend.services.sqlite_cache import SQLiteCache, make_key
+
+_CACHE: Optional[SQLiteCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_llm_cache() -> Optional[SQLiteCache]:
+    """Process-wide cache, or None when LLM_CACHE_ENABLED is off."""
+    global _CACHE
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = SQLiteCache(settings.LLM_CACHE_PATH, table="llm_cache",
+                                     max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+                                     ttl_seconds=settings.LLM_CACHE_TTL_S)
+    return _CACHE
+
+
+def cached_generation(kind: str, inputs: Any, generate: Callable[[], str], refresh: bool = False) -> str:
+    """
+    Return the cached text for (kind, inputs) or call `generate()` and store a non-empty result.
+    `refresh=True` skips the lookup and overwrites the entry with a new generation.
+    """
+    cache = get_llm_cache()
+    if cache is None:
+        return generate()
+    key = make_key(kind, inputs)
+    hit = None if refresh else cache.get(key)
+    if hit is not None:
+        return hit
+    text = generate()
+    if text:
+        cache.set(key, text)
+    return text
@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+"""
+Prometheus metrics: per-stage timers, HTTP request metrics and the existing stats.
+
+`stage("predict_proba")` times one stage of a request into a histogram (seconds);
+the ASGI middleware counts requests per route template and status, times them and
+keeps an in-flight gauge. `GET /metrics` renders those plus the batcher / group
+commit histograms, cache hit rates, model and policy versions, drift PSI and live
+PD quantiles in the Prometheus text format. Collectors run only on scrape. With
+METRICS_ENABLED off, `stage()` returns a shared no-op context manager and the
+middleware is not installed.
+"""
+from __future__ import annotations
+import threading
+import time
+from contextlib import nullcontext
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from backend.config import settings
+from backend.services.stats import Histogram
+
+STAGE_BUCKETS_S = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+PREFIX = "credit_"
+_NOOP = nullcontext()
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    def esc(v: str) -> str:
+        return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in labels) + "}"
+
+
+def _num(v: Any) -> str:
+    if v is None:
+        return "NaN"
+    if isinstance(v, bool):
+        return "1" if v else "0"
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+class Exposition:
+    """
+    Builds the text format, one HELP/TYPE header per metric family. Samples are
+    buffered per family, so each family is one contiguous group however the
+    collectors interleave them.
+    """
+
+    def __init__(self):
+        self.families: Dict[str, List[str]] = {}
+
+    def _family(self, name: str, kind: str, help_: str) -> List[str]:
+        lines = self.families.get(name)
+        if lines is None:
+            lines = self.families[name] = [f"# HELP {name} {help_}", f"# TYPE {name} {kind}"]
+        return lines
+
+    def sample(self, name: str, kind: str, help_: str, value: Any, labels: Labels = ()) -> None:
+        self._family(PREFIX + name, kind, help_).append(f"{PREFIX}{name}{_labels(labels)} {_num(value)}")
+
+    def histogram(self, name: str, help_: str, snap: Dict, labels: Labels = ()) -> None:
+        full = PREFIX + name
+        lines = self._family(full, "histogram", help_)
+        for le, count in snap["buckets"].items():
+            lines.append(f"{full}_bucket{_labels(labels + (('le', le),))} {count}")
+        lines.append(f"{full}_sum{_labels(labels)} {_num(float(snap['sum']))}")
+        lines.append(f"{full}_count{_labels(labels)} {snap['count']}")
+
+    def text(self) -> str:
+        return "\n".join(line for lines in self.families.values() for line in lines) + "\n"
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages: Dict[str, Histogram] = {}
+        self.stage_errors: Dict[str, int] = {}
+        self.requests: Dict[Tuple[str, str, str], int] = {}
+        self.request_seconds: Dict[Tuple[str, str], Histogram] = {}
+        self.in_flight = 0
+        self.collectors: List[Callable[[Exposition], None]] = []
+
+    def _hist(self, table: Dict, key, buckets=STAGE_BUCKETS_S) -> Histogram:
+        h = table.get(key)
+        if h is None:
+            with self._lock:
+                h = table.setdefault(key, Histogram(buckets))
+        return h
+
+    def observe_stage(self, name: str, seconds: float, error: bool = False) -> None:
+        self._hist(self.stages, name).observe(seconds)
+        if error:
+            with self._lock:
+                self.stage_errors[name] = self.stage_errors.get(name, 0) + 1
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float) -> None:
+        key = (method, route, f"{status // 100}xx")
+        with self._lock:
+            self.requests[key] = self.requests.get(key, 0) + 1
+        self._hist(self.request_seconds, (method, route)).observe(seconds)
+
+    def render(self) -> str:
+        out = Exposition()
+        for name, h in sorted(self.stages.items()):
+            out.histogram("stage_duration_seconds", "Time spent in one stage of a request.",
+                          h.snapshot(), (("stage", name),))
+        for name, n in sorted(self.stage_errors.items()):
+            out.sample("stage_errors_total", "counter", "Stages that raised.", n, (("stage", name),))
+        for (method, route, status), n in sorted(self.requests.items()):
+            out.sample("http_requests_total", "counter", "HTTP requests by route template and status class.", n,
+                       (("method", method), ("route", route), ("status", status)))
+        for (method, route), h in sorted(self.request_seconds.items()):
+            out.histogram("http_request_duration_seconds", "HTTP request latency by route template.",
+                          h.snapshot(), (("method", method), ("route", route)))
+        out.sample("http_requests_in_flight", "gauge", "HTTP requests being served.", self.in_flight)
+        for collect in self.collectors:
+            try:
+                collect(out)
+            except Exception as e:  # one broken collector must not take the whole scrape down
+                out.sample("collector_errors", "gauge", "Collectors that failed on this scrape.", 1,
+                           (("collector", getattr(collect, "__name__", "?")), ("error", type(e).__name__)))
+        return out.text()
+
+
+METRICS = Metrics()
+
+
+class _StageTimer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        METRICS.observe_stage(self.name, time.perf_counter() - self.start, error=exc_type is not None)
+        return False
+
+
+def stage(name: str):
+    """`with stage("db_commit"): ...` times the block (no-op when METRICS_ENABLED is off)."""
+    return _StageTimer(name) if settings.METRICS_ENABLED else _NOOP
+
+
+def timed(name: str):
+    """Decorator form of `stage`."""
+    def deco(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+def collector(fn: Callable[[Exposition], None]) -> Callable[[Exposition], None]:
+    METRICS.collectors.append(fn)
+    return fn
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: request count/latency per route template and the in-flight gauge."""
+
+    def __init__(self, app, metrics: Metrics = METRICS):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+
+        async def send_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.metrics.in_flight += 1  # event-loop thread only
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            self.metrics.in_flight -= 1
+            self.metrics.observe_request(scope["method"], route_template(scope), status, time.perf_counter() - start)
+
+
+def route_template(scope) -> str:
+    """"/v1/applications/{app_id}/review" for /v1/applications/12/review: bounded label cardinality."""
+    if "route" not in scope and "endpoint" not in scope:
+        return "unmatched"  # 404s: don't turn arbitrary paths into label values
+    names = {str(v): k for k, v in (scope.get("path_params") or {}).items()}
+    return "/".join(f"{{{names[part]}}}" if part in names else part for part in scope["path"].split("/"))
+
+
+# -------------------------------
+# Collectors over the existing stats
+# -------------------------------
+def _histograms(out: Exposition, prefix: str, what: str, stats: Dict, names: Iterable[str]) -> None:
+    for name in names:
+        if name in stats:
+            out.histogram(f"{prefix}_{name}", f"{what}: {name.replace('_', ' ')}.", stats[name])
+
+
+@collector
+def _batchers(out: Exposition) -> None:
+    from backend.services.group_commit import get_writer
+    from backend.services.micro_batcher import get_batcher
+    for prefix, what, b in (("score_batcher", "Score micro-batcher", get_batcher()),
+                            ("db_group_commit", "DB group commit", get_writer())):
+        if b is not None:
+            s = b.stats()
+            out.sample("queue_depth", "gauge", "Items waiting for a batch.", s["queue_depth"], (("batcher", prefix),))
+            _histograms(out, prefix, what, s, ("queue_wait_ms", "batch_size", "flush_ms"))
+
+
+@collector
+def _caches(out: Exposition) -> None:
+    from backend.services.counterfactuals import _split_points
+    from backend.services.llm_cache import get_llm_cache
+    from backend.services.score_cache import get_score_cache
+    for name, cache in (("score", get_score_cache()), ("llm", get_llm_cache())):
+        if cache is None:
+            continue
+        s = cache.stats()
+        lbl = (("cache", name),)
+        out.sample("cache_hits_total", "counter", "Cache lookups that hit.", s["hits"], lbl)
+        out.sample("cache_misses_total", "counter", "Cache lookups that missed.", s["misses"], lbl)
+        out.sample("cache_evictions_total", "counter", "LRU evictions.", s["evictions"], lbl)
+        out.sample("cache_entries", "gauge", "Entries stored.", s["entries"], lbl)
+        out.sample("cache_hit_ratio", "gauge", "Hits / lookups since start.", s["hit_rate"], lbl)
+    info = _split_points.cache_info()
+    lookups = info.hits + info.misses
+    lbl = (("cache", "split_points"),)
+    out.sample("cache_hits_total", "counter", "Cache lookups that hit.", info.hits, lbl)
+    out.sample("cache_misses_total", "counter", "Cache lookups that missed.", info.misses, lbl)
+    out.sample("cache_entries", "gauge", "Entries stored.", info.currsize, lbl)
+    out.sample("cache_hit_ratio", "gauge", "Hits / lookups since start.",
+               round(info.hits / lookups, 4) if lookups else None, lbl)
+
+
+@collector
+def _model_and_policy(out: Exposition) -> None:
+    from backend.services.policy_core import POLICY_STORE, REGISTRY
+    m = REGISTRY.stats()
+    out.sample("model_info", "gauge", "Served model artifact (value is always 1).", 1,
+               (("version", m["model_version"]), ("backend", m["scoring_backend"])))
+    out.sample("model_reloads_total", "counter", "Hot-reloads of the scoring model.", m["reloads"])
+    p = POLICY_STORE.current()
+    out.sample("policy_info", "gauge", "Served policy (value is always 1).", 1,
+               (("version", p["version"]), ("source", p.get("source") or "")))
+    for name in ("thr_reject", "thr_review"):
+        if p.get(name) is not None:
+            out.sample("policy_threshold", "gauge", "Served PD thresholds.", p[name], (("threshold", name),))
+
+
+@collector
+def _drift(out: Exposition) -> None:
+    from backend.services.drift import get_drift_monitor
+    monitor = get_drift_monitor()
+    if monitor is None:
+        return
+    snap = monitor.snapshot()
+    for window, report in (("current", snap["windows"][0]), ("cumulative", snap["cumulative"])):
+        out.sample("drift_rows", "gauge", "Scored rows in the drift window.", report["n"], (("window", window),))
+        for feature, v in report["features"].items():
+            out.sample("drift_psi", "gauge", "PSI of a feature against the training profile.", v["psi"],
+                       (("feature", feature), ("window", window)))
+
+
+@collector
+def _live_quantiles(out: Exposition) -> None:
+    from backend.services.policy_calibration import get_calibrator
+    calibrator = get_calibrator()
+    if calibrator is None:
+        return
+    snap = calibrator.tracker.snapshot()
+    for q, v in snap["lifetime"]["quantiles"].items():
+        out.sample("live_pd_quantile", "gauge", "Streaming PD quantile since start.", v, (("quantile", q),))
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+In-process micro-batching for concurrent single-row scoring.
+
+Callers (the threadpool workers serving /v1/score) enqueue a payload and block on
+a Future; one background thread drains the queue, runs `score_payloads` once per
+batch and resolves every Future. The collection window adapts to load: an idle
+server flushes immediately (no added latency), a busy one waits up to
+`max_wait_ms` or until the target batch size is reached. The batcher is generic
+over `score_many` (the DB group commit reuses it for inserts).
+"""
+from __future__ import annotations
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from backend.config import settings
+from backend.services.policy_core import score_payload, score_payloads
+from backend.services.stats import Histogram
+
+WAIT_MS_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 25, 50, 100)
+FLUSH_MS_BUCKETS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 1000)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+class MicroBatcher:
+    def __init__(self, score_many: Callable[[List[dict]], List[Dict[str, Any]]],
+                 max_wait_ms: float = 2.0, max_batch: int = 64, name: str = "score-micro-batcher"):
+        self.score_many = score_many
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch = max(1, int(max_batch))
+        self.name = name
+        self._pending: Deque[Tuple[dict, Future, float]] = deque()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._load = 1.0  # EMA of queue depth seen at batch start
+        self.queue_wait_ms = Histogram(WAIT_MS_BUCKETS)
+        self.batch_size = Histogram(BATCH_SIZE_BUCKETS)
+        self.flush_ms = Histogram(FLUSH_MS_BUCKETS)  # time spent in score_many per batch
+
+    # ---------- caller side ----------
+    def submit(self, payload: dict) -> Future:
+        fut: Future = Future()
+        with self._cond:
+            self._ensure_started()
+            self._pending.append((payload, fut, time.perf_counter()))
+            self._cond.notify()
+        return fut
+
+    def score(self, payload: dict) -> Dict[str, Any]:
+        return self.submit(payload).result()
+
+    # ---------- worker side ----------
+    def _ensure_started(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def _window(self) -> Tuple[float, int]:
+        """(max wait, target size) for the next batch, from the recent queue depth."""
+        if self._load <= 1.0:
+            return 0.0, 1
+        target = min(self.max_batch, max(2, int(round(self._load * 2))))
+        wait = self.max_wait * min(1.0, (self._load - 1.0) / 4.0)
+        return wait, target
+
+    def _collect(self) -> List[Tuple[dict, Future, float]]:
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            self._load = 0.8 * self._load + 0.2 * len(self._pending)
+            wait, target = self._window()
+            deadline = time.perf_counter() + wait
+            while len(self._pending) < target:
+                left = deadline - time.perf_counter()
+                if left <= 0:
+                    break
+                self._cond.wait(left)
+            n = min(len(self._pending), self.max_batch)
+            return [self._pending.popleft() for _ in range(n)]
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            for _, _, enq in batch:
+                self.queue_wait_ms.observe((started - enq) * 1000.0)
+            self.batch_size.observe(len(batch))
+            try:
+                results = list(self.score_many([p for p, _, _ in batch]))
+                if len(results) != len(batch):
+                    raise RuntimeError(f"score_many returned {len(results)} results for {len(batch)} items")
+            except Exception as e:  # fail the whole batch, keep the worker alive
+                for _, fut, _ in batch:
+                    fut.set_exception(e)
+                continue
+            finally:
+                self.flush_ms.observe((time.perf_counter() - started) * 1000.0)
+            for (_, fut, _), res in zip(batch, results):
+                fut.set_result(res)
+
+    def stats(self) -> Dict[str, Any]:
+        wait, target = self._window()
+        return {
+            "queue_depth": len(self._pending),
+            "load_ema": round(self._load, 3),
+            "window_ms": round(wait * 1000.0, 3),
+            "target_batch": target,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "max_batch": self.max_batch,
+            "queue_wait_ms": self.queue_wait_ms.snapshot(),
+            "batch_size": self.batch_size.snapshot(),
+            "flush_ms": self.flush_ms.snapshot(),
+        }
+
+
+_BATCHER: Optional[MicroBatcher] = None
+_BATCHER_LOCK = threading.Lock()
+
+
+def get_batcher() -> Optional[MicroBatcher]:
+    """Process-wide batcher, or None when SCORE_MICROBATCH is off."""
+    global _BATCHER
+    if not settings.SCORE_MICROBATCH:
+        return None
+    if _BATCHER is None:
+        with _BATCHER_LOCK:
+            if _BATCHER is None:
+                _BATCHER = MicroBatcher(score_payloads, settings.SCORE_MICROBATCH_WAIT_MS,
+                                        settings.SCORE_MICROBATCH_MAX_SIZE)
+    return _BATCHER
+
+
+def score_payload_batched(payload: dict) -> Dict[str, Any]:
+    """Drop-in for `policy_core.score_payload` that goes through the micro-batcher when enabled."""
+    batcher = get_batcher()
+    return batcher.score(payload) if batcher is not None else score_payload(payload)
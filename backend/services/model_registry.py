@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+Model registry over MODEL_DIR with atomic hot-reload.
+
+Everything scoring needs from one artifact (pipeline, metadata, compiled encoder,
+optional native engine, fingerprint) is loaded into one immutable `ModelBundle`.
+A watcher thread polls the newest artifact matching MODEL_GLOB and its metadata
+JSON; when either changes, the new bundle is loaded and warmed in the background
+and then swapped in with a single reference assignment. Callers take one snapshot
+per request (`current()`), so in-flight requests finish on the model they started
+with. A failed load (e.g. a half-copied file) keeps serving the previous model.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import joblib
+
+from backend.services.feature_encoder import FeatureEncoder
+from backend.services.tree_engine import TreeEnsemble
+
+DEFAULT_META_NAME = "best_model_metadata.json"
+
+
+class ModelBundle:
+    def __init__(self, path: Path, meta_path: Path, scoring_backend: str = "xgboost"):
+        self.path = path
+        self.meta_path = meta_path
+        raw = path.read_bytes()
+        # identifies the artifact actually served (cache namespaces, stored applications)
+        self.version = hashlib.sha256(raw).hexdigest()[:16]
+        self.model = joblib.load(path)
+        with open(meta_path, "r", encoding="utf-8") as f:
+            self.meta: Dict[str, Any] = json.load(f)
+        self.feature_set: List[str] = self.meta["feature_set"]
+        self.num_cols: List[str] = self.meta["numeric_columns"]
+        self.cat_cols: List[str] = self.meta["categorical_columns"]
+        # Compiled once: payload rows -> classifier input without a DataFrame (None => DataFrame route)
+        self.classifier = self.model.steps[-1][1]
+        self.encoder = FeatureEncoder.from_pipeline(self.model, self.meta)
+        if scoring_backend == "native" and self.encoder is None:
+            raise ValueError("SCORING_BACKEND=native requires the passthrough + one-hot preprocessor layout")
+        self.engine = TreeEnsemble.from_booster(self.classifier.get_booster()) if scoring_backend == "native" else None
+        self.loaded_at = time.time()
+
+    def model_features(self) -> List[str]:
+        feats = list(self.feature_set)
+        for extra in ["emp_length_num", "term_num"]:
+            if extra in (self.num_cols or []) and extra not in feats:
+                feats.append(extra)
+        return feats
+
+
+def meta_path_for(artifact: Path) -> Path:
+    """`<stem>_metadata.json` next to the artifact when present, else the shared metadata file."""
+    sidecar = artifact.with_name(f"{artifact.stem}_metadata.json")
+    return sidecar if sidecar.exists() else artifact.with_name(DEFAULT_META_NAME)
+
+
+class ModelRegistry:
+    def __init__(self, model_dir: Path, pattern: str, scoring_backend: str = "xgboost",
+                 warm: Optional[Callable[[ModelBundle], None]] = None):
+        self.model_dir = Path(model_dir)
+        self.pattern = pattern
+        self.scoring_backend = scoring_backend
+        self.warm = warm
+        self._bundle: Optional[ModelBundle] = None
+        self._signature: Optional[Tuple] = None
+        self._failed_signature: Optional[Tuple] = None
+        self._reload_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.reloads = 0
+        self.last_error: Optional[str] = None
+
+    def _scan(self) -> Tuple[Path, Path, Tuple]:
+        candidates = list(self.model_dir.glob(self.pattern))
+        if not candidates:
+            raise FileNotFoundError(f"No model artifact matching {self.pattern!r} in {self.model_dir}")
+        path = max(candidates, key=lambda p: p.stat().st_mtime)
+        meta = meta_path_for(path)
+        ps, ms = path.stat(), meta.stat()
+        return path, meta, (str(path), ps.st_mtime_ns, ps.st_size, str(meta), ms.st_mtime_ns, ms.st_size)
+
+    def current(self) -> ModelBundle:
+        """The served bundle; loads it synchronously on first use."""
+        bundle = self._bundle
+        if bundle is None:
+            with self._reload_lock:
+                if self._bundle is None:
+                    path, meta, sig = self._scan()
+                    self._install(ModelBundle(path, meta, self.scoring_backend), sig)
+                bundle = self._bundle
+        return bundle
+
+    def _install(self, bundle: ModelBundle, sig: Tuple) -> None:
+        if self.warm is not None:
+            self.warm(bundle)
+        self._bundle = bundle  # atomic swap: readers see the old or the new bundle, never a mix
+        self._signature = sig
+
+    def check(self) -> bool:
+        """Reload if the newest artifact or its metadata changed. Returns True when a new model was swapped in."""
+        self.current()
+        try:
+            path, meta, sig = self._scan()
+        except (FileNotFoundError, OSError) as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            return False
+        if sig == self._signature or sig == self._failed_signature:
+            return False
+        with self._reload_lock:
+            if sig == self._signature:
+                return False
+            try:
+                self._install(ModelBundle(path, meta, self.scoring_backend), sig)
+            except Exception as e:  # keep serving the previous model; retry once the files change again
+                self._failed_signature = sig
+                self.last_error = f"{type(e).__name__}: {e}"
+                return False
+            self.reloads += 1
+            self.last_error = None
+            return True
+
+    def start_watcher(self, interval_s: float) -> None:
+        if interval_s <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.wait(interval_s):
+                self.check()
+
+        self._thread = threading.Thread(target=loop, name="model-registry-watcher", daemon=True)
+        self._thread.start()
+
+    def stop_watcher(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> Dict[str, Any]:
+        b = self.current()
+        return {
+            "model_version": b.version,
+            "path": str(b.path),
+            "meta_path": str(b.meta_path),
+            "loaded_at": b.loaded_at,
+            "scoring_backend": self.scoring_backend,
+            "reloads": self.reloads,
+            "watching": self._thread is not None and self._thread.is_alive(),
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Payload -> feature parsing shared by scoring and storage.
+
+Model-free on purpose: `policy_core` selects the served model's features from
+`feature_row`, and `crud` stores the same values as typed columns
+(`application_features`), so both always agree on what a payload means.
+"""
+import math
+from typing import Any, Dict
+
+import numpy as np
+
+NUMERIC_FEATURES = ["loan_amnt", "int_rate", "fico_range_low", "fico_range_high", "annual_inc", "dti",
+                    "revol_util", "emp_length_num", "term_num"]
+CATEGORICAL_FEATURES = ["grade", "sub_grade", "home_ownership", "verification_status", "purpose"]
+
+
+def parse_percent(x):
+    if x is None or (isinstance(x, float) and math.isnan(x)): return np.nan
+    s = str(x).strip().replace("%","")
+    try: return float(s)
+    except: return np.nan
+
+def parse_term(x):
+    if x is None: return np.nan
+    s = str(x)
+    try: return float("".join(ch for ch in s if ch.isdigit() or ch == "."))
+    except: return np.nan
+
+def parse_emp_length(x):
+    if x is None: return np.nan
+    s = str(x).strip().lower()
+    if s in {"n/a","na","none",""}: return np.nan
+    if s.startswith("<"): return 0.5
+    if "10+" in s: return 10.0
+    digits = "".join(ch for ch in s if ch.isdigit() or ch == ".")
+    try: return float(digits)
+    except: return np.nan
+
+
+def feature_row(payload: dict) -> Dict[str, Any]:
+    """Every engineered feature the training notebooks define, parsed from a raw payload."""
+    row = {}
+    # numeric
+    row["loan_amnt"]       = payload.get("loan_amnt")
+    row["int_rate"]        = parse_percent(payload.get("int_rate"))
+    row["fico_range_low"]  = payload.get("fico_range_low")
+    row["fico_range_high"] = payload.get("fico_range_high")
+    row["annual_inc"]      = payload.get("annual_inc")
+    dti_val = payload.get("dti")
+    row["dti"]             = parse_percent(dti_val) if isinstance(dti_val, str) and "%" in str(dti_val) else dti_val
+    row["revol_util"]      = parse_percent(payload.get("revol_util"))
+    row["emp_length_num"]  = parse_emp_length(payload.get("emp_length"))
+    row["term_num"]        = parse_term(payload.get("term"))
+    # categoricals
+    row["grade"]               = payload.get("grade")
+    row["sub_grade"]           = payload.get("sub_grade")
+    row["home_ownership"]      = payload.get("home_ownership")
+    row["verification_status"] = payload.get("verification_status")
+    row["purpose"]             = payload.get("purpose")
+    return row
+
+
+def typed_feature_row(payload: dict) -> Dict[str, Any]:
+    """`feature_row` as SQL-ready values: floats or None for numerics, str or None for categoricals."""
+    row = feature_row(payload)
+    out: Dict[str, Any] = {}
+    for f in NUMERIC_FEATURES:
+        try:
+            v = float(row[f])
+        except (TypeError, ValueError):
+            v = math.nan
+        out[f] = None if math.isnan(v) or math.isinf(v) else v
+    for f in CATEGORICAL_FEATURES:
+        v = row[f]
+        out[f] = None if v is None or (isinstance(v, float) and math.isnan(v)) else str(v)
+    return out
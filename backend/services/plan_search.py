@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Beam search for multi-step improvement plans.
+
+Actions are built once from the original payload (the fixed cuts the tips have
+always offered, the nearest split-threshold breakpoints and the minimal single
+changes from `counterfactuals`), each touching one actionable feature. A plan uses
+each feature at most once. Every depth level expands the beam, de-duplicates the
+children on the normalized feature vector and scores the whole frontier in one
+batch, within a hard cap on evaluations and time. The cheapest plan whose PD ends
+under thr_review wins (ties: fewer steps).
+"""
+from __future__ import annotations
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from backend.config import settings
+from backend.services.counterfactuals import apply_change, breakpoint_candidates, current_values, make_change
+from backend.services.policy_core import feature_keys
+from backend.services.score_cache import cached_pds
+
+
+def plan_actions(payload: Dict, extra: Iterable[Dict] = (), per_feature: int = 4) -> List[Dict]:
+    """Single-feature actions for the search: {action, feature, to, cost}, cheapest first."""
+    cur = current_values(payload)
+    changes: List[Optional[Dict]] = []
+    if cur.get("loan_amnt", 0) > 0:
+        base = cur["loan_amnt"]
+        for frac in (0.9, 0.8, 0.7):
+            changes.append(make_change(payload, "loan_amnt", base, max(1000, round(base * frac, 0))))
+    if cur.get("term_num", 0) > 36:
+        changes.append(make_change(payload, "term_num", cur["term_num"], 36.0))
+    for feature, targets in (("revol_util", (70.0, 60.0, 50.0)), ("dti", (35.0, 30.0, 25.0))):
+        for tgt in targets:
+            if cur.get(feature, 0) > tgt:
+                changes.append(make_change(payload, feature, cur[feature], tgt))
+    taken: Dict[str, int] = {}
+    for c in breakpoint_candidates(payload):  # nearest breakpoints per feature
+        if taken.get(c["feature"], 0) < per_feature:
+            taken[c["feature"]] = taken.get(c["feature"], 0) + 1
+            changes.append(c)
+    changes.extend(extra)
+
+    out, seen = [], set()
+    for c in changes:
+        if c is None or c["to"] >= cur.get(c["feature"], float("inf")) or (c["feature"], c["to"]) in seen:
+            continue
+        seen.add((c["feature"], c["to"]))
+        out.append({k: c[k] for k in ("action", "feature", "to", "cost")})
+    return sorted(out, key=lambda a: a["cost"])
+
+
+def beam_search_plan(payload: Dict, thr: float, actions: List[Dict], current_pd: Optional[float] = None,
+                     width: Optional[int] = None, depth: Optional[int] = None,
+                     max_evals: Optional[int] = None, time_budget_ms: Optional[float] = None,
+                     pds_fn: Callable[[List[Dict]], List[float]] = cached_pds) -> Dict:
+    """
+    Returns {"steps", "cost", "new_pd", "crosses", "evals"}. Steps carry the PD after
+    each step. Without a crossing plan, the lowest-PD path found is returned.
+    """
+    width = settings.PLAN_BEAM_WIDTH if width is None else width
+    depth = settings.PLAN_MAX_DEPTH if depth is None else depth
+    max_evals = settings.PLAN_MAX_EVALS if max_evals is None else max_evals
+    budget_s = (settings.PLAN_TIME_BUDGET_MS if time_budget_ms is None else time_budget_ms) / 1000.0
+    start = time.perf_counter()
+    if current_pd is None:
+        current_pd = pds_fn([payload])[0]
+
+    root = {"steps": [], "payload": payload, "pd": current_pd, "cost": 0.0, "used": frozenset()}
+    seen = set(feature_keys([payload]))
+    beam, best, lowest, evals = [root], None, root, 0
+    for _ in range(depth):
+        children = []
+        for st in beam:
+            for a in actions:
+                if a["feature"] in st["used"]:
+                    continue
+                cost = st["cost"] + a["cost"]
+                if best is not None and cost >= best["cost"]:
+                    continue  # cannot beat the cheapest crossing plan found so far
+                children.append((cost, st, a))
+        if not children:
+            break
+        children.sort(key=lambda c: c[0])
+        payloads = [apply_change(st["payload"], a["feature"], a["to"]) for _, st, a in children]
+        frontier = []
+        for (cost, st, a), q, key in zip(children, payloads, feature_keys(payloads)):
+            if key in seen:  # same feature vector reached by another (cheaper) path
+                continue
+            seen.add(key)
+            frontier.append((cost, st, a, q))
+        frontier = frontier[:max(0, max_evals - evals)]
+        if not frontier:
+            break
+        evals += len(frontier)
+
+        states = []
+        for (cost, st, a, q), npd in zip(frontier, pds_fn([f[3] for f in frontier])):
+            step = {"action": a["action"], "new_pd": round(npd, 6), "delta_pd": round(st["pd"] - npd, 6), "payload": q}
+            state = {"steps": st["steps"] + [step], "payload": q, "pd": npd, "cost": cost,
+                     "used": st["used"] | {a["feature"]}}
+            if npd < thr:
+                if best is None or (cost, len(state["steps"])) < (best["cost"], len(best["steps"])):
+                    best = state
+            else:
+                states.append(state)
+            if (npd, cost) < (lowest["pd"], lowest["cost"]):
+                lowest = state
+        beam = sorted(states, key=lambda s: (s["pd"], s["cost"]))[:max(1, width)]
+        if time.perf_counter() - start > budget_s:
+            break
+
+    chosen = best or lowest
+    return {
+        "steps": chosen["steps"],
+        "cost": round(chosen["cost"], 6),
+        "new_pd": round(chosen["pd"], 6),
+        "crosses": best is not None,
+        "evals": evals,
+    }
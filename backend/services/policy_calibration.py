@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""
+Live PD quantiles and guarded recalibration of the top-K policy thresholds.
+
+The policy cuts the PD distribution at reject_top (5%) and review_top (15%), but
+thr_reject/thr_review are fixed at training time. Every PD scored through the
+API feeds P² estimators (Jain & Chlamtac: five markers per quantile, O(1) memory
+and update) for the 1 - reject_top and 1 - review_top quantiles, over tumbling
+windows of QUANTILE_WINDOW_ROWS scores and over the whole process lifetime.
+
+Each completed window yields a proposal: the window's cut-points, moved at most
+POLICY_CALIBRATION_MAX_STEP away from the served thresholds. With
+POLICY_AUTO_CALIBRATE on, a proposal that changes a threshold by at least
+POLICY_CALIBRATION_MIN_CHANGE is published through the policy store (policy file
+rewritten atomically, new version, hot-reloaded), at most once per
+POLICY_CALIBRATION_COOLDOWN_S.
+"""
+from __future__ import annotations
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Sequence
+
+from backend.config import settings
+from backend.services.policy_store import PolicyError, PolicyStore
+
+DEFAULT_TOP_K = {"reject_top": 0.05, "review_top": 0.15}
+
+
+class P2Quantile:
+    """P² streaming estimate of one quantile."""
+
+    def __init__(self, p: float):
+        self.p = float(p)
+        self.n = 0
+        self.q: List[float] = []                      # marker heights
+        self.pos = [1.0, 2.0, 3.0, 4.0, 5.0]          # marker positions
+        self.want = [1.0, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5.0]
+        self.step = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def add(self, x: float) -> None:
+        self.n += 1
+        q = self.q
+        if self.n <= 5:
+            q.append(x)
+            if self.n == 5:
+                q.sort()
+            return
+        if x < q[0]:
+            q[0], k = x, 0
+        elif x >= q[4]:
+            q[4], k = x, 3
+        else:
+            k = next(i for i in range(4) if q[i] <= x < q[i + 1])
+        for i in range(k + 1, 5):
+            self.pos[i] += 1
+        for i in range(5):
+            self.want[i] += self.step[i]
+        n = self.pos
+        for i in (1, 2, 3):
+            d = self.want[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                par = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                if q[i - 1] < par < q[i + 1]:
+                    q[i] = par
+                else:  # parabolic step would break monotonicity: linear instead
+                    q[i] = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                n[i] += d
+
+    def value(self) -> Optional[float]:
+        if self.n == 0:
+            return None
+        if self.n < 5:
+            s = sorted(self.q)
+            return s[min(len(s) - 1, int(self.p * len(s)))]
+        return self.q[2]
+
+
+class QuantileTracker:
+    """P² estimates of several quantiles over tumbling count windows and the lifetime."""
+
+    def __init__(self, quantiles: Sequence[float], window_rows: int = 2000, windows: int = 10,
+                 clock: Callable[[], float] = time.time):
+        self.quantiles = sorted({float(p) for p in quantiles})
+        self.window_rows = max(5, int(window_rows))
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._current = self._fresh()
+        self._lifetime = self._fresh()
+        self._closed: Deque[Dict[str, Any]] = deque(maxlen=max(1, int(windows)))
+
+    def _fresh(self) -> Dict[float, P2Quantile]:
+        return {p: P2Quantile(p) for p in self.quantiles}
+
+    @staticmethod
+    def _values(est: Dict[float, P2Quantile]) -> Dict[str, Optional[float]]:
+        return {f"{p:g}": (None if e.value() is None else round(e.value(), 6)) for p, e in est.items()}
+
+    def add(self, values: Iterable[float]) -> bool:
+        """Add PDs; returns True when a window was completed."""
+        closed = False
+        with self._lock:
+            for v in values:
+                v = float(v)
+                for p in self.quantiles:
+                    self._current[p].add(v)
+                    self._lifetime[p].add(v)
+                n = self._current[self.quantiles[0]].n
+                if n >= self.window_rows:
+                    self._closed.appendleft({"closed_at": self.clock(), "n": n,
+                                             "quantiles": self._values(self._current)})
+                    self._current = self._fresh()
+                    closed = True
+        return closed
+
+    def last_window(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._closed[0] if self._closed else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "window_rows": self.window_rows,
+                "current": {"n": self._current[self.quantiles[0]].n, "quantiles": self._values(self._current)},
+                "windows": list(self._closed),   # most recent first
+                "lifetime": {"n": self._lifetime[self.quantiles[0]].n, "quantiles": self._values(self._lifetime)},
+            }
+
+
+def top_k(policy: Dict[str, Any]) -> Dict[str, float]:
+    return {k: float(policy.get(k) or v) for k, v in DEFAULT_TOP_K.items()}
+
+
+class ThresholdCalibrator:
+    def __init__(self, store: PolicyStore, window_rows: int = 2000, windows: int = 10,
+                 max_step: float = 0.05, min_change: float = 0.005, cooldown_s: float = 3600.0,
+                 auto_apply: bool = False, clock: Callable[[], float] = time.time):
+        self.store = store
+        self.fractions = top_k(dict(store.current()))
+        self.tracker = QuantileTracker([1 - f for f in self.fractions.values()], window_rows, windows, clock)
+        self.max_step = float(max_step)
+        self.min_change = float(min_change)
+        self.cooldown_s = float(cooldown_s)
+        self.auto_apply = auto_apply
+        self.clock = clock
+        self._apply_lock = threading.Lock()
+        self.last_applied: Optional[Dict[str, Any]] = None
+        self.last_error: Optional[str] = None
+
+    def observe(self, probs: Iterable[float]) -> None:
+        if self.tracker.add(probs) and self.auto_apply:
+            self.apply()
+
+    def proposal(self) -> Dict[str, Any]:
+        """Thresholds from the last completed window, within the step guardrail."""
+        policy = dict(self.store.current())
+        window = self.tracker.last_window()
+        out: Dict[str, Any] = {"served": {"thr_reject": policy.get("thr_reject"), "thr_review": policy.get("thr_review"),
+                                          "version": policy["version"]},
+                               "target": None, "proposed": None, "clamped": [], "blocked": None}
+        if window is None:
+            out["blocked"] = f"waiting for a full window of {self.tracker.window_rows} scores"
+            return out
+        if policy.get("thr_reject") is None:
+            out["blocked"] = "2-band policy (no thr_reject) is not recalibrated"
+            return out
+        target = {"thr_reject": window["quantiles"][f"{1 - self.fractions['reject_top']:g}"],
+                  "thr_review": window["quantiles"][f"{1 - self.fractions['review_top']:g}"]}
+        proposed = {}
+        for name, value in target.items():
+            cur = float(policy[name])
+            step = max(-self.max_step, min(self.max_step, value - cur))
+            if step != value - cur:
+                out["clamped"].append(name)
+            proposed[name] = round(cur + step, 6)
+        out["target"], out["proposed"], out["window"] = target, proposed, {"n": window["n"], "closed_at": window["closed_at"]}
+        if not proposed["thr_review"] <= proposed["thr_reject"]:
+            out["blocked"] = "proposed thr_review would exceed thr_reject"
+        elif max(abs(proposed[k] - float(policy[k])) for k in proposed) < self.min_change:
+            out["blocked"] = f"change below {self.min_change}"
+        return out
+
+    def apply(self, ignore_cooldown: bool = False) -> Dict[str, Any]:
+        """Publish the current proposal through the policy store (unless a guardrail blocks it)."""
+        with self._apply_lock:
+            prop = self.proposal()
+            now = self.clock()
+            if prop["blocked"] is None and not ignore_cooldown and self.last_applied is not None \
+                    and now - self.last_applied["at"] < self.cooldown_s:
+                prop["blocked"] = f"cooldown ({self.cooldown_s:g}s) since the last recalibration"
+            if prop["blocked"] is not None:
+                return {"applied": False, **prop}
+            try:
+                self.store.publish(prop["proposed"]["thr_reject"], prop["proposed"]["thr_review"],
+                                   recalibrated={"at": now, "from_version": prop["served"]["version"],
+                                                 "window_rows": prop["window"]["n"],
+                                                 "target": prop["target"]})
+            except (OSError, PolicyError) as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                return {"applied": False, **prop, "blocked": self.last_error}
+            self.last_applied = {"at": now, **prop["proposed"], "version": self.store.current()["version"]}
+            self.last_error = None
+            return {"applied": True, **prop}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "fractions": self.fractions,
+            "auto_apply": self.auto_apply,
+            "guardrails": {"max_step": self.max_step, "min_change": self.min_change, "cooldown_s": self.cooldown_s},
+            "quantiles": self.tracker.snapshot(),
+            "proposal": self.proposal(),
+            "last_applied": self.last_applied,
+            "last_error": self.last_error,
+        }
+
+
+_CALIBRATOR: Optional[ThresholdCalibrator] = None
+_CALIBRATOR_LOCK = threading.Lock()
+
+
+def get_calibrator() -> Optional[ThresholdCalibrator]:
+    """Process-wide calibrator over the served policy, or None when QUANTILE_TRACKING is off."""
+    global _CALIBRATOR
+    if not settings.QUANTILE_TRACKING:
+        return None
+    if _CALIBRATOR is None:
+        with _CALIBRATOR_LOCK:
+            if _CALIBRATOR is None:
+                from backend.services.policy_core import POLICY_STORE
+                _CALIBRATOR = ThresholdCalibrator(
+                    POLICY_STORE, settings.QUANTILE_WINDOW_ROWS, settings.QUANTILE_WINDOWS,
+                    settings.POLICY_CALIBRATION_MAX_STEP, settings.POLICY_CALIBRATION_MIN_CHANGE,
+                    settings.POLICY_CALIBRATION_COOLDOWN_S, settings.POLICY_AUTO_CALIBRATE)
+    return _CALIBRATOR
+
+
+def observe(probs: List[float]) -> None:
+    calibrator = get_calibrator()
+    if calibrator is not None:
+        calibrator.observe(probs)
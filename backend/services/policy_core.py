@@ -1,118 +1,96 @@
 # -*- coding: utf-8 -*-
-import json, joblib, numpy as np, pandas as pd
+import json, numpy as np, pandas as pd
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Mapping, Optional
+from backend.config import settings
+from backend.services.metrics import stage
+from backend.services.model_registry import ModelBundle, ModelRegistry
+from backend.services.normalize import feature_row, parse_emp_length, parse_percent, parse_term  # noqa: F401
+from backend.services.policy_store import PolicyStore, load_policy
 
 # -------------------------------
 # Model & artifacts
 # -------------------------------
-MODEL_DIR = Path("models/saved_models")
-MODEL_PATH = max(MODEL_DIR.glob("best_model_recall_focus_xgb_OptionA_recallAtK.joblib"), key=lambda p: p.stat().st_mtime)
-META_PATH  = MODEL_DIR / "best_model_metadata.json"
-POLICY_PATH = MODEL_DIR / "best_model_policy.json"  # optional standalone policy
+MODEL_DIR = Path(settings.MODEL_DIR)
+POLICY_PATH = Path(settings.POLICY_PATH) if settings.POLICY_PATH else MODEL_DIR / "best_model_policy.json"  # optional standalone policy
 
-best_model = joblib.load(MODEL_PATH)
-with open(META_PATH, "r", encoding="utf-8") as f:
-    META = json.load(f)
+SCORING_BACKEND = settings.SCORING_BACKEND.lower()
+if SCORING_BACKEND not in ("xgboost", "native"):
+    raise ValueError(f"Unknown SCORING_BACKEND: {settings.SCORING_BACKEND!r} (expected 'xgboost' or 'native')")
 
-FEATURE_SET   = META["feature_set"]
-NUM_COLS_META = META["numeric_columns"]
-CAT_COLS_META = META["categorical_columns"]
-REVIEW_K      = float(META.get("review_k", 0.20))
-TOPK_THR_META = META.get("report", {}).get(f"Threshold@top_{int(REVIEW_K*100)}%")
+def _warm(bundle: ModelBundle) -> None:
+    # first predict initializes the booster's predictor; do it before the bundle is served
+    predict_pds([{}], bundle)
+
+REGISTRY = ModelRegistry(MODEL_DIR, settings.MODEL_GLOB, SCORING_BACKEND, warm=_warm)
+
+def current_model() -> ModelBundle:
+    """Snapshot of the served model; take it once per request and pass it down."""
+    return REGISTRY.current()
+
+# Legacy module attributes, always resolved against the currently served model
+_LEGACY_ATTRS = {
+    "best_model": lambda b: b.model,
+    "MODEL_PATH": lambda b: b.path,
+    "META_PATH": lambda b: b.meta_path,
+    "MODEL_FINGERPRINT": lambda b: b.version,
+    "META": lambda b: b.meta,
+    "FEATURE_SET": lambda b: b.feature_set,
+    "NUM_COLS_META": lambda b: b.num_cols,
+    "CAT_COLS_META": lambda b: b.cat_cols,
+    "CLASSIFIER": lambda b: b.classifier,
+    "ENCODER": lambda b: b.encoder,
+    "ENGINE": lambda b: b.engine,
+}
+
+def __getattr__(name: str):
+    if name in _LEGACY_ATTRS:
+        return _LEGACY_ATTRS[name](current_model())
+    if name == "POLICY":
+        return current_policy()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def load_policy_thresholds() -> Dict[str, Any]:
-    # 1) Prefer external policy.json
-    if POLICY_PATH.exists():
-        with POLICY_PATH.open("r", encoding="utf-8") as f:
-            pol = json.load(f)
-        thr_reject = pol.get("thresholds", {}).get("thr_reject")
-        thr_review = pol.get("thresholds", {}).get("thr_review")
-        if thr_reject is not None and thr_review is not None:
-            return {"thr_reject": float(thr_reject), "thr_review": float(thr_review), "source": POLICY_PATH.name}
-    # 2) Fallback to metadata thresholds
-    pol_meta = META.get("policy", {}).get("thresholds", {})
-    thr_reject = pol_meta.get("thr_reject")
-    thr_review = pol_meta.get("thr_review")
-    if thr_reject is not None and thr_review is not None:
-        return {"thr_reject": float(thr_reject), "thr_review": float(thr_review), "source": "metadata"}
-    # 3) Only a review cut → 2-band
-    if TOPK_THR_META is not None:
-        return {"thr_reject": None, "thr_review": float(TOPK_THR_META), "source": "meta_topk_only"}
-    # 4) Last resort
-    return {"thr_reject": None, "thr_review": 0.5, "source": "default_0.5"}
+    """Policy as currently on disk (not necessarily the served one, see POLICY_STORE)."""
+    return load_policy(POLICY_PATH, current_model().meta)
+
+POLICY_STORE = PolicyStore(POLICY_PATH, lambda: (current_model().version, current_model().meta))
 
-POLICY = load_policy_thresholds()
+def current_policy() -> Mapping[str, Any]:
+    """Snapshot of the served policy thresholds (with its version); take it once per request."""
+    return POLICY_STORE.current()
 
 # -------------------------------
 # Normalization (mirror training)
 # -------------------------------
-def parse_percent(x):
-    import math
-    if x is None or (isinstance(x, float) and math.isnan(x)): return np.nan
-    s = str(x).strip().replace("%","")
-    try: return float(s)
-    except: return np.nan
-
-def parse_term(x):
-    if x is None: return np.nan
-    s = str(x)
-    try: return float("".join(ch for ch in s if ch.isdigit() or ch == "."))
-    except: return np.nan
-
-def parse_emp_length(x):
-    if x is None: return np.nan
-    s = str(x).strip().lower()
-    if s in {"n/a","na","none",""}: return np.nan
-    if s.startswith("<"): return 0.5
-    if "10+" in s: return 10.0
-    digits = "".join(ch for ch in s if ch.isdigit() or ch == ".")
-    try: return float(digits)
-    except: return np.nan
+def _payload_row(payload: dict, bundle: Optional[ModelBundle] = None) -> dict:
+    bundle = bundle or current_model()
+    row = feature_row(payload)
+    return {f: row.get(f, np.nan) for f in bundle.model_features()}
 
-def normalize_payload(payload: dict) -> pd.DataFrame:
-    row = {}
-    # numeric
-    row["loan_amnt"]       = payload.get("loan_amnt")
-    row["int_rate"]        = parse_percent(payload.get("int_rate"))
-    row["fico_range_low"]  = payload.get("fico_range_low")
-    row["fico_range_high"] = payload.get("fico_range_high")
-    row["annual_inc"]      = payload.get("annual_inc")
-    dti_val = payload.get("dti")
-    row["dti"]             = parse_percent(dti_val) if isinstance(dti_val, str) and "%" in str(dti_val) else dti_val
-    row["revol_util"]      = parse_percent(payload.get("revol_util"))
-    row["emp_length_num"]  = parse_emp_length(payload.get("emp_length"))
-    row["term_num"]        = parse_term(payload.get("term"))
-    # categoricals
-    row["grade"]               = payload.get("grade")
-    row["sub_grade"]           = payload.get("sub_grade")
-    row["home_ownership"]      = payload.get("home_ownership")
-    row["verification_status"] = payload.get("verification_status")
-    row["purpose"]             = payload.get("purpose")
-
-    prepared = {f: row.get(f, np.nan) for f in FEATURE_SET}
-    for extra in ["emp_length_num","term_num"]:
-        if extra in (NUM_COLS_META or []) and extra not in prepared:
-            prepared[extra] = row.get(extra, np.nan)
-
-    model_feats = FEATURE_SET.copy()
-    for extra in ["emp_length_num","term_num"]:
-        if extra in (NUM_COLS_META or []) and extra not in model_feats:
-            model_feats.append(extra)
-
-    df = pd.DataFrame([prepared], columns=model_feats)
-    for c in NUM_COLS_META:
+def _model_features() -> List[str]:
+    return current_model().model_features()
+
+def normalize_payloads(payloads: List[dict], bundle: Optional[ModelBundle] = None) -> pd.DataFrame:
+    """
+    Normalize many payloads into one model frame (one row per payload, same order).
+    Rows are treated independently: the median fill of the single-row path is a
+    no-op per row, so we do NOT impute across the batch (that would leak one
+    applicant's values into another's score).
+    """
+    bundle = bundle or current_model()
+    df = pd.DataFrame([_payload_row(p, bundle) for p in payloads], columns=bundle.model_features())
+    for c in bundle.num_cols:
         if c in df.columns:
             df[c] = pd.to_numeric(df[c], errors="coerce")
-    if NUM_COLS_META:
-        df[NUM_COLS_META] = df[NUM_COLS_META].fillna(
-            pd.Series({c: df[c].median() for c in NUM_COLS_META if c in df.columns})
-        )
-    for c in CAT_COLS_META:
+    for c in bundle.cat_cols:
         if c in df.columns:
             df[c] = df[c].astype("object").fillna("Unknown")
     return df
 
+def normalize_payload(payload: dict) -> pd.DataFrame:
+    return normalize_payloads([payload])
+
 # -------------------------------
 # Policy decision
 # -------------------------------
@@ -126,16 +104,86 @@ def three_band_decision(prob: float, policy: dict) -> str:
     # 2-band fallback
     return "REVIEW" if prob >= float(thr_review) else "APPROVE"
 
+def three_band_decisions(probs: np.ndarray, policy: dict) -> List[str]:
+    """Vectorized `three_band_decision` over an array of PDs."""
+    probs = np.asarray(probs, dtype=float)
+    thr_reject = policy.get("thr_reject")
+    thr_review = policy.get("thr_review")
+    if thr_reject is not None and thr_review is not None:
+        out = np.select([probs >= thr_reject, probs >= thr_review], ["REJECT", "REVIEW"], default="APPROVE")
+    else:
+        out = np.where(probs >= float(thr_review), "REVIEW", "APPROVE")
+    return out.tolist()
+
+def _policy_thresholds(policy: dict) -> Dict[str, Any]:
+    return {
+        "thr_reject": None if policy.get("thr_reject") is None else float(policy["thr_reject"]),
+        "thr_review": float(policy["thr_review"]) if policy.get("thr_review") is not None else None
+    }
+
+def predict_pds_frame(payloads: List[dict], bundle: Optional[ModelBundle] = None) -> np.ndarray:
+    """Reference route: DataFrame normalization + the full sklearn pipeline."""
+    bundle = bundle or current_model()
+    with stage("normalize_payload"):
+        x = normalize_payloads(payloads, bundle)
+    with stage("predict_proba"):
+        return bundle.model.predict_proba(x)[:, 1].astype(float)
+
+def feature_keys(payloads: List[dict], bundle: Optional[ModelBundle] = None) -> List[bytes]:
+    """
+    Canonical bytes of each payload's normalized feature vector: equal for payloads
+    the model cannot tell apart ("7.5%" vs 7.5, different names, ...).
+    """
+    bundle = bundle or current_model()
+    if bundle.encoder is not None:
+        x = bundle.encoder.encode_rows([_payload_row(p, bundle) for p in payloads])
+        return [row.tobytes() for row in x]
+    return [json.dumps(_payload_row(p, bundle), sort_keys=True, default=str).encode("utf-8") for p in payloads]
+
+def predict_pds(payloads: List[dict], bundle: Optional[ModelBundle] = None) -> np.ndarray:
+    """PD for every payload with a single `predict_proba` call."""
+    if not payloads:
+        return np.empty(0, dtype=float)
+    bundle = bundle or current_model()
+    if bundle.encoder is None:
+        return predict_pds_frame(payloads, bundle)
+    with stage("normalize_payload"):
+        x = bundle.encoder.encode_rows([_payload_row(p, bundle) for p in payloads])
+    model = bundle.engine if bundle.engine is not None else bundle.classifier
+    with stage("predict_proba"):
+        return model.predict_proba(x)[:, 1].astype(float)
+
+def score_payloads(payloads: List[dict]) -> List[Dict[str, Any]]:
+    """Batch counterpart of `score_payload`; results are returned in input order."""
+    bundle, policy = current_model(), current_policy()
+    probs = predict_pds(payloads, bundle)
+    decisions = three_band_decisions(probs, policy)
+    thresholds = _policy_thresholds(policy)
+    return [
+        {
+            "prob_default": round(float(prob), 6),
+            "decision": decision,
+            "policy_source": policy.get("source"),
+            "thresholds": dict(thresholds),
+            "model_version": bundle.version,
+            "policy_version": policy["version"],
+        }
+        for prob, decision in zip(probs, decisions)
+    ]
+
 def score_payload(payload: dict) -> Dict[str, Any]:
-    x = normalize_payload(payload)
-    prob = float(best_model.predict_proba(x)[:, 1][0])
-    decision = three_band_decision(prob, POLICY)
+    bundle, policy = current_model(), current_policy()
+    prob = float(predict_pds([payload], bundle)[0])
+    decision = three_band_decision(prob, policy)
     return {
         "prob_default": round(prob, 6),
         "decision": decision,
-        "policy_source": POLICY.get("source"),
-        "thresholds": {
-            "thr_reject": None if POLICY.get("thr_reject") is None else float(POLICY["thr_reject"]),
-            "thr_review": float(POLICY["thr_review"]) if POLICY.get("thr_review") is not None else None
-        }
+        "policy_source": policy.get("source"),
+        "thresholds": _policy_thresholds(policy),
+        "model_version": bundle.version,
+        "policy_version": policy["version"],
     }
+
+# Loaded last (the warm-up needs predict_pds); a missing artifact or bad policy still fails at import
+current_model()
+current_policy()
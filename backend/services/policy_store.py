@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+Versioned, hot-reloadable policy thresholds.
+
+The policy is read from POLICY_PATH (falling back to the served model's metadata,
+as before) into an immutable snapshot {thr_reject, thr_review, source, version}.
+The version is the policy file's "version" field when present, else a digest of
+the thresholds and source, so identical thresholds always get the same version.
+A watcher thread (or POST /v1/admin/policy/reload) re-reads the file and swaps
+the snapshot in one assignment; scoring and improvement tips take one snapshot per
+call, so a request never mixes two policies. Invalid policies are rejected and the
+previous one keeps serving, and so is a file that changes the thresholds but
+keeps its explicit version, since the version must identify the thresholds.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+
+class PolicyError(ValueError):
+    pass
+
+
+def _version(policy: Dict[str, Any]) -> str:
+    raw = json.dumps([policy["thr_reject"], policy["thr_review"], policy["source"]])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:12]
+
+
+def _top_k(pol: Dict[str, Any]) -> Dict[str, float]:
+    """The top-K fractions the thresholds were cut at (reject_top / review_top), when recorded."""
+    return {k: float(pol[k]) for k in ("reject_top", "review_top") if pol.get(k) is not None}
+
+
+def load_policy(path: Path, meta: Dict[str, Any]) -> Dict[str, Any]:
+    """Thresholds from the policy file, else from model metadata (same precedence as always)."""
+    policy, version = None, None
+    # 1) Prefer external policy.json
+    if path.exists():
+        with path.open("r", encoding="utf-8") as f:
+            pol = json.load(f)
+        thr_reject = pol.get("thresholds", {}).get("thr_reject")
+        thr_review = pol.get("thresholds", {}).get("thr_review")
+        if thr_reject is not None and thr_review is not None:
+            policy = {"thr_reject": float(thr_reject), "thr_review": float(thr_review), "source": path.name}
+            version = pol.get("version")
+            policy.update(_top_k(pol))
+    if policy is None:
+        # 2) Fallback to metadata thresholds
+        review_k = float(meta.get("review_k", 0.20))
+        topk_thr = meta.get("report", {}).get(f"Threshold@top_{int(review_k*100)}%")
+        pol_meta = meta.get("policy", {}).get("thresholds", {})
+        if pol_meta.get("thr_reject") is not None and pol_meta.get("thr_review") is not None:
+            policy = {"thr_reject": float(pol_meta["thr_reject"]), "thr_review": float(pol_meta["thr_review"]),
+                      "source": "metadata", **_top_k(meta.get("policy", {}))}
+        # 3) Only a review cut → 2-band
+        elif topk_thr is not None:
+            policy = {"thr_reject": None, "thr_review": float(topk_thr), "source": "meta_topk_only"}
+        # 4) Last resort
+        else:
+            policy = {"thr_reject": None, "thr_review": 0.5, "source": "default_0.5"}
+    validate_policy(policy)
+    policy["version"] = str(version) if version is not None else _version(policy)
+    return policy
+
+
+def validate_policy(policy: Dict[str, Any]) -> None:
+    thr_reject, thr_review = policy.get("thr_reject"), policy.get("thr_review")
+    if thr_review is None or not 0.0 <= thr_review <= 1.0:
+        raise PolicyError(f"thr_review must be within [0, 1], got {thr_review!r}")
+    if thr_reject is not None and not thr_review <= thr_reject <= 1.0:
+        raise PolicyError(f"thr_reject must be within [thr_review, 1], got {thr_reject!r}")
+
+
+class PolicyStore:
+    def __init__(self, path: Path, meta_fn: Callable[[], Tuple[str, Dict[str, Any]]], history: int = 20):
+        """`meta_fn()` returns (model version, model metadata) of the served model."""
+        self.path = Path(path)
+        self.meta_fn = meta_fn
+        self._policy: Optional[MappingProxyType] = None
+        self._signature: Optional[Tuple] = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.history: Deque[Dict[str, Any]] = deque(maxlen=history)
+        self.last_error: Optional[str] = None
+
+    def _scan(self) -> Tuple:
+        try:
+            st = self.path.stat()
+            file_sig = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            file_sig = None
+        return file_sig, self.meta_fn()[0]
+
+    def current(self) -> MappingProxyType:
+        """Read-only snapshot of the served policy."""
+        policy = self._policy
+        if policy is None:
+            self.reload()
+            policy = self._policy
+        return policy
+
+    def reload(self, force: bool = False) -> bool:
+        """Re-read the policy if its file (or the model metadata) changed. Returns True if the version changed."""
+        sig = self._scan()
+        with self._lock:
+            if not force and self._policy is not None and sig == self._signature:
+                return False
+            try:
+                policy = load_policy(self.path, self.meta_fn()[1])
+            except (OSError, ValueError) as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                if self._policy is None:
+                    raise
+                self._signature = sig  # don't retry the same broken file on every poll
+                raise PolicyError(self.last_error) from e
+            self._signature = sig
+            if self._policy is not None and policy["version"] == self._policy["version"]:
+                if all(policy[k] == self._policy[k] for k in ("thr_reject", "thr_review", "source")):
+                    self.last_error = None
+                    return False
+                self.last_error = (f"PolicyError: thresholds changed but version {policy['version']!r} did not; "
+                                   "bump or drop the \"version\" field")
+                raise PolicyError(self.last_error)
+            self.last_error = None
+            self._policy = MappingProxyType(policy)
+            self.history.appendleft({**policy, "loaded_at": time.time()})
+            return True
+
+    def publish(self, thr_reject: float, thr_review: float, **extra: Any) -> bool:
+        """
+        Write new thresholds to the policy file (atomic rename, other fields kept,
+        explicit version dropped so it becomes the thresholds digest) and serve them.
+        """
+        candidate = {"thr_reject": float(thr_reject), "thr_review": float(thr_review)}
+        validate_policy(candidate)
+        doc: Dict[str, Any] = {}
+        if self.path.exists():
+            with self.path.open("r", encoding="utf-8") as f:
+                doc = json.load(f)
+        for k, v in _top_k(dict(self.current())).items():
+            doc.setdefault(k, v)
+        doc.pop("version", None)
+        doc["thresholds"] = candidate
+        doc.update(extra)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+        tmp.replace(self.path)
+        return self.reload(force=True)
+
+    def check(self) -> bool:
+        try:
+            return self.reload()
+        except PolicyError:
+            return False
+
+    def start_watcher(self, interval_s: float) -> None:
+        if interval_s <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.wait(interval_s):
+                self.check()
+
+        self._thread = threading.Thread(target=loop, name="policy-store-watcher", daemon=True)
+        self._thread.start()
+
+    def stop_watcher(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "policy": dict(self.current()),
+            "path": str(self.path),
+            "watching": self._thread is not None and self._thread.is_alive(),
+            "last_error": self.last_error,
+            "history": list(self.history),
+        }
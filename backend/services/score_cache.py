@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+PD cache shared by every worker process, keyed on the normalized feature vector.
+
+Backed by one SQLite file (see `SQLiteCache`), so a PD computed by one uvicorn
+worker is a hit for all others. Keys are namespaced by the model fingerprint and
+the store is cleared when a different model artifact is served (including a
+hot-reload: keys and PDs of one lookup always come from the same model snapshot).
+"""
+from __future__ import annotations
+import hashlib
+import threading
+from typing import Dict, List, Optional
+
+from backend.config import settings
+from backend.services.policy_core import current_model, feature_keys, predict_pds
+from backend.services.sqlite_cache import SQLiteCache
+
+
+class ScoreCache:
+    def __init__(self, path: str, fingerprint: str, max_entries: int = 100000):
+        self.fingerprint = None
+        self.store = SQLiteCache(path, table="score_cache", max_entries=max_entries)
+        self._meta = SQLiteCache(path, table="score_cache_meta", max_entries=16)
+        self._switch_lock = threading.Lock()
+        self._use_model(fingerprint)
+
+    def _use_model(self, fingerprint: str) -> None:
+        with self._switch_lock:
+            if fingerprint == self.fingerprint:
+                return
+            if self._meta.get("model_fingerprint") != fingerprint:
+                self.store.clear()  # model changed: every cached PD is stale
+                self._meta.set("model_fingerprint", fingerprint)
+            self.fingerprint = fingerprint
+
+    def key(self, features: bytes, fingerprint: Optional[str] = None) -> str:
+        return hashlib.sha1((fingerprint or self.fingerprint).encode("ascii") + features).hexdigest()
+
+    def get_pds(self, payloads: List[Dict]) -> List[float]:
+        """Rounded PDs (as in `score_payload`); all misses are scored in one model call."""
+        bundle = current_model()
+        if bundle.version != self.fingerprint:
+            self._use_model(bundle.version)
+        keys = [self.key(f, bundle.version) for f in feature_keys(payloads, bundle)]
+        found = self.store.get_many(keys)
+        missing: Dict[str, Dict] = {}
+        for k, p in zip(keys, payloads):
+            if k not in found:
+                missing.setdefault(k, p)
+        if missing:
+            fresh = {k: round(float(pd), 6) for k, pd in zip(missing, predict_pds(list(missing.values()), bundle))}
+            self.store.set_many(fresh)
+            found.update(fresh)
+        return [found[k] for k in keys]
+
+    def stats(self) -> Dict:
+        return {"model_fingerprint": self.fingerprint, **self.store.stats()}
+
+
+_CACHE: Optional[ScoreCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_score_cache() -> Optional[ScoreCache]:
+    """Process-wide cache, or None when SCORE_CACHE_ENABLED is off."""
+    global _CACHE
+    if not settings.SCORE_CACHE_ENABLED:
+        return None
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = ScoreCache(settings.SCORE_CACHE_PATH, current_model().version,
+                                    max_entries=settings.SCORE_CACHE_MAX_ENTRIES)
+    return _CACHE
+
+
+def cached_pds(payloads: List[Dict]) -> List[float]:
+    cache = get_score_cache()
+    if cache is None:
+        return [round(float(pd), 6) for pd in predict_pds(payloads)]
+    return cache.get_pds(payloads)
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Asynchronous batch-scoring jobs.
+
+POST /v1/jobs stores the uploaded file under JOBS_DIR and creates a QUEUED job;
+a small thread pool runs each job: the file is streamed in JOB_CHUNK_ROWS chunks
+(CSV or Parquet, same reader and scoring as `backend.bulk_score`), and every chunk's
+results are inserted together with the job's progress in one transaction. A job
+interrupted by a restart resumes after its last committed chunk. The upload is
+deleted once the job is DONE or FAILED; its results live in `job_results`.
+"""
+from __future__ import annotations
+import datetime as dt
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+import pandas as pd
+from sqlalchemy.orm import Session, sessionmaker
+
+from backend.bulk_score import read_chunks, score_chunk
+from backend.config import settings
+from backend.db import crud
+from backend.db.models import ScoringJob
+from backend.db.session import SessionLocal
+
+QUEUED, RUNNING, DONE, FAILED = "QUEUED", "RUNNING", "DONE", "FAILED"
+SUPPORTED_SUFFIXES = (".csv", ".parquet", ".pq")
+
+
+def count_rows(path: str) -> Optional[int]:
+    """
+    Row count for progress reporting: Parquet metadata, or for CSV the rows the
+    scoring reader will see (same parser, so quoted multi-line fields count once).
+    """
+    if Path(path).suffix.lower() in (".parquet", ".pq"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            return None
+        return pq.ParquetFile(path).metadata.num_rows
+    try:
+        reader = pd.read_csv(path, chunksize=1 << 16, usecols=[0], dtype=object)
+        return sum(len(chunk) for chunk in reader)
+    except pd.errors.EmptyDataError:
+        return 0
+
+
+def rows_per_sec(job: ScoringJob) -> Optional[float]:
+    if job.started_at is None or not job.processed_rows:
+        return None
+    seconds = ((job.finished_at or dt.datetime.utcnow()) - job.started_at).total_seconds()
+    return round(job.processed_rows / seconds, 1) if seconds > 0 else None
+
+
+class JobRunner:
+    def __init__(self, session_factory: sessionmaker = SessionLocal, workers: int = 2,
+                 chunk_rows: int = 5000, jobs_dir: str = "./jobs"):
+        self.session_factory = session_factory
+        self.chunk_rows = max(1, int(chunk_rows))
+        self.jobs_dir = Path(jobs_dir)
+        self._pool = ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix="scoring-job")
+
+    def submit(self, db: Session, upload: BinaryIO, filename: str) -> ScoringJob:
+        """Store the upload, create the QUEUED job and schedule it."""
+        job_id = uuid.uuid4().hex
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        path = self.jobs_dir / f"{job_id}{Path(filename).suffix.lower()}"
+        with open(path, "wb") as dst:
+            while True:
+                block = upload.read(1 << 20)
+                if not block:
+                    break
+                dst.write(block)
+        job = crud.create_job(db, id=job_id, filename=filename, path=str(path), status=QUEUED)
+        self.enqueue(job.id)
+        return job
+
+    def enqueue(self, job_id: str) -> Future:
+        return self._pool.submit(self._run, job_id)
+
+    def _run(self, job_id: str) -> str:
+        db: Session = self.session_factory()
+        try:
+            job = crud.get_job(db, job_id)
+            if job is None or job.status not in (QUEUED, RUNNING):
+                return job.status if job else "MISSING"
+            try:
+                job.status = RUNNING
+                job.started_at = job.started_at or dt.datetime.utcnow()
+                if job.total_rows is None:
+                    job.total_rows = count_rows(job.path)
+                db.add(job); db.commit()
+
+                done = job.processed_rows or 0  # resume after the last committed chunk
+                offset = 0
+                for chunk in read_chunks(job.path, self.chunk_rows):
+                    start, offset = offset, offset + len(chunk)
+                    if offset <= done:
+                        continue
+                    chunk = chunk.iloc[max(0, done - start):]
+                    scored = score_chunk(chunk)
+                    first = max(start, done)
+                    rows = [
+                        {"row_index": first + i, "prob_default": float(p), "decision": d, "policy_source": s}
+                        for i, (p, d, s) in enumerate(zip(scored["prob_default"], scored["decision"],
+                                                          scored["policy_source"]))
+                    ]
+                    crud.add_job_results(db, job, rows)
+                job.status = DONE
+            except Exception as e:
+                db.rollback()
+                job.status = FAILED
+                job.error = f"{type(e).__name__}: {e}"
+            job.finished_at = dt.datetime.utcnow()
+            db.add(job); db.commit()
+            Path(job.path).unlink(missing_ok=True)
+            return job.status
+        finally:
+            db.close()
+
+    def resume_pending(self) -> int:
+        """Re-enqueue jobs left QUEUED/RUNNING by a previous process."""
+        db: Session = self.session_factory()
+        try:
+            ids = [i for (i,) in db.query(ScoringJob.id).filter(ScoringJob.status.in_((QUEUED, RUNNING)))]
+        finally:
+            db.close()
+        for job_id in ids:
+            self.enqueue(job_id)
+        return len(ids)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+
+_RUNNER: Optional[JobRunner] = None
+_RUNNER_LOCK = threading.Lock()
+
+
+def get_job_runner() -> JobRunner:
+    global _RUNNER
+    if _RUNNER is None:
+        with _RUNNER_LOCK:
+            if _RUNNER is None:
+                _RUNNER = JobRunner(workers=settings.JOB_WORKERS, chunk_rows=settings.JOB_CHUNK_ROWS,
+                                    jobs_dir=settings.JOBS_DIR)
+    return _RUNNER
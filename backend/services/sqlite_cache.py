@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+Small disk-backed key/value cache on SQLite with LRU + TTL eviction.
+
+One file can be shared by every worker process (WAL mode); each thread keeps its
+own connection. Values are JSON-serialised. Hit/miss/eviction counters are
+per process.
+
+Reads stay reads: a hit refreshes `last_access` only when it is older than
+`touch_interval_s`, so LRU order is kept at that granularity. The size check
+(a COUNT) runs once per ~10% of `max_entries` inserts in each process, and then
+trims the table to 90%, so it can overshoot by that much per process in between.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+
+def make_key(*parts: Any) -> str:
+    """Stable digest of JSON-serialisable key parts."""
+    raw = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class SQLiteCache:
+    def __init__(self, path: str, table: str = "cache", max_entries: int = 10000,
+                 ttl_seconds: Optional[float] = None, touch_interval_s: float = 60.0):
+        self.path = path
+        self.table = table
+        self.max_entries = max(1, int(max_entries))
+        self.ttl = ttl_seconds if ttl_seconds and ttl_seconds > 0 else None
+        self.touch_interval = max(0.0, float(touch_interval_s))
+        self._check_every = max(1, self.max_entries // 10)
+        self._inserts = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        with self._conn() as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+                " created_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            conn.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_last_access ON {table}(last_access)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, attr: str, n: int = 1) -> None:
+        with self._lock:
+            setattr(self, attr, getattr(self, attr) + n)
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        conn = self._conn()
+        row = conn.execute(f"SELECT value, created_at, last_access FROM {self.table} WHERE key = ?",
+                           (key,)).fetchone()
+        if row is None:
+            self._count("misses")
+            return None
+        if self.ttl is not None and now - row[1] > self.ttl:
+            conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._count("evictions")
+            self._count("misses")
+            return None
+        if now - row[2] >= self.touch_interval:
+            conn.execute(f"UPDATE {self.table} SET last_access = ? WHERE key = ?", (now, key))
+        self._count("hits")
+        return json.loads(row[0])
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, Any]:
+        """Batch lookup (one SELECT per 500 keys); returns only the keys that hit."""
+        now = time.time()
+        conn = self._conn()
+        found: Dict[str, Any] = {}
+        expired: List[str] = []
+        touch: List[str] = []
+        uniq = list(dict.fromkeys(keys))
+        for i in range(0, len(uniq), 500):
+            chunk = uniq[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            for key, value, created, accessed in conn.execute(
+                    f"SELECT key, value, created_at, last_access FROM {self.table} WHERE key IN ({marks})", chunk):
+                if self.ttl is not None and now - created > self.ttl:
+                    expired.append(key)
+                else:
+                    found[key] = json.loads(value)
+                    if now - accessed >= self.touch_interval:
+                        touch.append(key)
+        if expired:
+            conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", [(k,) for k in expired])
+            self._count("evictions", len(expired))
+        if touch:
+            conn.executemany(f"UPDATE {self.table} SET last_access = ? WHERE key = ?", [(now, k) for k in touch])
+        self._count("hits", len(found))
+        self._count("misses", len(uniq) - len(found))
+        return found
+
+    def set_many(self, items: Dict[str, Any]) -> None:
+        if not items:
+            return
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created_at, last_access) VALUES (?, ?, ?, ?)",
+                [(k, json.dumps(v), now, now) for k, v in items.items()],
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._evict(conn, len(items))
+
+    def set(self, key: str, value: Any) -> None:
+        now = time.time()
+        conn = self._conn()
+        conn.execute(
+            f"INSERT OR REPLACE INTO {self.table} (key, value, created_at, last_access) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value), now, now),
+        )
+        self._evict(conn, 1)
+
+    def _evict(self, conn: sqlite3.Connection, inserted: int) -> None:
+        with self._lock:
+            self._inserts += inserted
+            if self._inserts < self._check_every:
+                return
+            self._inserts = 0
+        (n,) = conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+        if n <= self.max_entries:
+            return
+        # trim to 90% so eviction runs once per batch of inserts, not on every insert
+        drop = n - int(self.max_entries * 0.9)
+        cur = conn.execute(
+            f"DELETE FROM {self.table} WHERE key IN "
+            f"(SELECT key FROM {self.table} ORDER BY last_access ASC LIMIT ?)", (drop,)
+        )
+        self._count("evictions", cur.rowcount)
+
+    def clear(self) -> None:
+        self._conn().execute(f"DELETE FROM {self.table}")
+
+    def __len__(self) -> int:
+        return self._conn().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+        }
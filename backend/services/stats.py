@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""Tiny thread-safe in-process histograms for the stats endpoints."""
+from __future__ import annotations
+import bisect
+import threading
+from typing import Dict, List, Sequence
+
+
+class Histogram:
+    """Fixed-bucket histogram (cumulative `le` buckets, Prometheus style)."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets: List[float] = sorted(float(b) for b in buckets)
+        self._counts = [0] * (len(self.buckets) + 1)  # last slot = +Inf
+        self._sum = 0.0
+        self._n = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[i] += 1
+            self._sum += value
+            self._n += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            counts, total, n = list(self._counts), self._sum, self._n
+        cumulative, running = {}, 0
+        for le, c in zip([*map(str, self.buckets), "+Inf"], counts):
+            running += c
+            cumulative[le] = running
+        return {"count": n, "sum": round(total, 6), "mean": round(total / n, 6) if n else None,
+                "buckets": cumulative}
+
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Native inference for the saved XGBoost booster.
+
+The booster is exported once into flat NumPy node arrays (one row per tree, padded
+to the largest tree) and evaluated by walking every tree of every row at once, one
+depth level per step. Input is the dense matrix produced by `FeatureEncoder`
+(NaN = missing), so the per-call cost is a handful of NumPy gathers instead of
+sklearn/xgboost fixed overhead.
+"""
+from __future__ import annotations
+import json
+import math
+from typing import Any, Dict, List
+
+import numpy as np
+
+
+def _parse_base_score(raw: Any) -> float:
+    # xgboost >= 2 stores it as "[5E-1]", older versions as "5E-1"
+    return float(str(raw).strip("[]").split(",")[0])
+
+
+class TreeEnsemble:
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, left: np.ndarray,
+                 right: np.ndarray, default_left: np.ndarray, value: np.ndarray,
+                 base_margin: float, max_depth: int, n_features: int):
+        self.feature = feature            # (n_trees, n_nodes) int32, split feature (0 on leaves)
+        self.threshold = threshold        # (n_trees, n_nodes) float32, go left if x < threshold
+        self.left = left                  # (n_trees, n_nodes) int32, leaves point to themselves
+        self.right = right
+        self.default_left = default_left  # (n_trees, n_nodes) bool, branch taken when x is missing
+        self.value = value                # (n_trees, n_nodes) float32, leaf value (0 on splits)
+        self.base_margin = np.float32(base_margin)
+        self.max_depth = max_depth
+        self.n_features = n_features
+        self.n_trees = feature.shape[0]
+        self._trees = np.arange(self.n_trees)
+
+    @classmethod
+    def from_booster(cls, booster: Any) -> "TreeEnsemble":
+        """Export a fitted `xgboost.Booster` (gbtree, binary:logistic, numeric splits)."""
+        model = json.loads(booster.save_raw("json"))
+        learner = model["learner"]
+        objective = learner["objective"]["name"]
+        if objective != "binary:logistic":
+            raise ValueError(f"Unsupported objective for native engine: {objective}")
+        booster_model = learner["gradient_booster"]
+        if booster_model.get("name") != "gbtree":
+            raise ValueError(f"Unsupported booster for native engine: {booster_model.get('name')}")
+        trees: List[Dict[str, Any]] = booster_model["model"]["trees"]
+        if any(any(t.get("split_type") or []) for t in trees):
+            raise ValueError("Categorical splits are not supported by the native engine")
+
+        n_trees = len(trees)
+        n_nodes = max(len(t["left_children"]) for t in trees)
+        feature = np.zeros((n_trees, n_nodes), dtype=np.int32)
+        threshold = np.zeros((n_trees, n_nodes), dtype=np.float32)
+        left = np.tile(np.arange(n_nodes, dtype=np.int32), (n_trees, 1))
+        right = left.copy()
+        default_left = np.zeros((n_trees, n_nodes), dtype=bool)
+        value = np.zeros((n_trees, n_nodes), dtype=np.float32)
+        max_depth = 0
+        for i, t in enumerate(trees):
+            lc = np.asarray(t["left_children"], dtype=np.int32)
+            rc = np.asarray(t["right_children"], dtype=np.int32)
+            cond = np.asarray(t["split_conditions"], dtype=np.float32)
+            is_leaf = lc == -1
+            k = len(lc)
+            feature[i, :k] = np.where(is_leaf, 0, np.asarray(t["split_indices"], dtype=np.int32))
+            threshold[i, :k] = np.where(is_leaf, 0.0, cond)
+            left[i, :k] = np.where(is_leaf, np.arange(k), lc)
+            right[i, :k] = np.where(is_leaf, np.arange(k), rc)
+            default_left[i, :k] = np.asarray(t["default_left"], dtype=bool) & ~is_leaf
+            value[i, :k] = np.where(is_leaf, cond, 0.0)  # leaf value lives in split_conditions
+            max_depth = max(max_depth, _tree_depth(lc, rc))
+
+        base_score = _parse_base_score(learner["learner_model_param"]["base_score"])
+        base_margin = math.log(base_score / (1.0 - base_score))
+        n_features = int(learner["learner_model_param"]["num_feature"])
+        return cls(feature, threshold, left, right, default_left, value, base_margin, max_depth, n_features)
+
+    def split_points(self, feature: int) -> np.ndarray:
+        """Sorted distinct thresholds the ensemble uses on `feature` (PD is constant between them)."""
+        is_split = self.left != np.arange(self.left.shape[1])
+        return np.unique(self.threshold[is_split & (self.feature == feature)])
+
+    def leaf_indices(self, X: np.ndarray) -> np.ndarray:
+        """(n_rows, n_trees) index of the leaf each row lands in, per tree."""
+        X = np.asarray(X, dtype=np.float32)
+        node = np.zeros((X.shape[0], self.n_trees), dtype=np.int32)
+        rows = np.arange(X.shape[0])[:, None]
+        for _ in range(self.max_depth):
+            f = self.feature[self._trees, node]
+            x = X[rows, f]
+            go_left = np.where(np.isnan(x), self.default_left[self._trees, node], x < self.threshold[self._trees, node])
+            node = np.where(go_left, self.left[self._trees, node], self.right[self._trees, node])
+        return node
+
+    def predict_margin(self, X: np.ndarray) -> np.ndarray:
+        leaves = self.value[self._trees, self.leaf_indices(X)]
+        # xgboost accumulates tree outputs sequentially in float32, starting from the base margin
+        acc = np.concatenate([np.full((leaves.shape[0], 1), self.base_margin, dtype=np.float32), leaves], axis=1)
+        return np.cumsum(acc, axis=1, dtype=np.float32)[:, -1]
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """sklearn-style (n_rows, 2) class probabilities."""
+        margin = self.predict_margin(X)
+        # exp in float64 then round: matches the correctly rounded expf xgboost uses
+        e = np.exp(-margin.astype(np.float64)).astype(np.float32)
+        p1 = np.float32(1.0) / (np.float32(1.0) + e)
+        return np.column_stack([np.float32(1.0) - p1, p1])
+
+
+def _tree_depth(left: np.ndarray, right: np.ndarray) -> int:
+    depth, frontier = 0, [0]
+    while True:
+        nxt = [c for n in frontier for c in (left[n], right[n]) if c != -1]
+        if not nxt:
+            return depth
+        depth += 1
+        frontier = nxt
@@ -0,0 +1 @@
+"""In-process benchmarks (see `python -m bench.run --help`)."""
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""Seeded application payloads for the benchmarks: same inputs on every run."""
+from __future__ import annotations
+import random
+from typing import Dict, List
+
+SUB_GRADES = [f"{g}{n}" for g in "ABCDEFG" for n in range(1, 6)]
+PURPOSES = ["debt_consolidation", "credit_card", "home_improvement", "car", "medical", "small_business", "other"]
+
+REVIEW_PAYLOAD = {
+    "first_name": "Alex", "last_name": "Carver",
+    "loan_amnt": 150000, "int_rate": "20.8%",
+    "fico_range_low": 690, "fico_range_high": 694,
+    "annual_inc": 55000, "dti": 12.0, "revol_util": "55%",
+    "emp_length": "3 years", "term": "60 months",
+    "grade": "E", "sub_grade": "E3",
+    "home_ownership": "RENT", "verification_status": "Source Verified",
+    "purpose": "debt_consolidation",
+}
+
+
+def make_payloads(n: int, seed: int = 42) -> List[Dict]:
+    """`n` distinct applications spread over grades, terms and purposes (messy strings included)."""
+    rng = random.Random(seed)
+    out = []
+    for i in range(n):
+        sub = rng.choice(SUB_GRADES)
+        fico = rng.randrange(640, 820, 4)
+        out.append({
+            "first_name": f"Bench{i}", "last_name": "Applicant",
+            "loan_amnt": rng.randrange(1000, 40001, 25),
+            "int_rate": f"{rng.uniform(5, 28):.2f}%" if i % 2 else round(rng.uniform(5, 28), 2),
+            "fico_range_low": fico, "fico_range_high": fico + 4,
+            "annual_inc": rng.randrange(15000, 250000, 500),
+            "dti": round(rng.uniform(0, 45), 1),
+            "revol_util": f"{rng.uniform(0, 110):.1f}%",
+            "emp_length": rng.choice(["< 1 year", "1 year", "3 years", "5 years", "10+ years"]),
+            "term": rng.choice(["36 months", "60 months"]),
+            "grade": sub[0], "sub_grade": sub,
+            "home_ownership": rng.choice(["RENT", "OWN", "MORTGAGE"]),
+            "verification_status": rng.choice(["Verified", "Not Verified", "Source Verified"]),
+            "purpose": rng.choice(PURPOSES),
+        })
+    return out
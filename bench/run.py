@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+Reproducible latency/throughput benchmarks, run in-process.
+
+    python -m bench.run --out bench/baseline.json
+    python -m bench.run --compare bench/baseline.json      # exit code 1 on regression
+
+The API is driven through FastAPI's TestClient against a throwaway SQLite DB, so
+there is no server, network or port involved. The LLM is the local stand-in
+backend (LLM_BACKEND=local): deterministic text, lognormal latency
+(--llm-latency-ms median, --llm-latency-sigma) and an optional error rate,
+so the advice path is measured offline with a realistic tail. The score and LLM caches are off unless --caches is given.
+It measures:
+  fn.normalize_payload, fn.score_payload, fn.recommend_improvements   (sequential calls)
+  api.score@cN, api.advice@cN, api.review@cN                          (N concurrent clients)
+Each result has n, throughput_per_s, mean/p50/p95/p99/max in ms. Comparison
+flags p50/p95 latencies above, or throughput below, the baseline by more than
+--tolerance.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from bench.payloads import REVIEW_PAYLOAD, make_payloads
+
+COMPARED = (("p50_ms", 1), ("p95_ms", 1), ("throughput_per_s", -1))  # +1: higher is worse
+MIN_DELTA_MS = 0.05  # sub-50µs moves are timer noise, never a regression
+
+
+def prepare_env(caches: bool = False) -> str:
+    """Point the backend at a scratch directory; must run before `backend` is imported."""
+    tmp = tempfile.mkdtemp(prefix="credit-bench-")
+    os.environ["DB_URL"] = f"sqlite:///{tmp}/bench.db"
+    os.environ["LLM_CACHE_PATH"] = f"{tmp}/llm_cache.db"
+    os.environ["SCORE_CACHE_PATH"] = f"{tmp}/score_cache.db"
+    os.environ["JOBS_DIR"] = f"{tmp}/jobs"
+    os.environ["SCORE_CACHE_ENABLED"] = "1" if caches else "0"
+    os.environ["LLM_CACHE_ENABLED"] = "1" if caches else "0"
+    os.environ["MODEL_WATCH_INTERVAL_S"] = "0"
+    os.environ["POLICY_WATCH_INTERVAL_S"] = "0"
+    os.environ["POLICY_AUTO_CALIBRATE"] = "0"  # a benchmark must not rewrite the policy file
+    os.environ["LLM_BACKEND"] = "local"
+    return tmp
+
+
+def use_local_llm(latency_ms: float, sigma: float = 0.3, error_rate: float = 0.0, seed: int = 0) -> None:
+    """Serve the LLM paths from the local stand-in with these parameters (same draws on every run)."""
+    from backend.services import llm
+    llm._LLM = llm.LocalLLMBackend(latency_ms, sigma, error_rate=error_rate, seed=seed)
+
+
+# -------------------------------
+# Measurement
+# -------------------------------
+def summarize(latencies_s: Sequence[float], wall_s: float) -> Dict[str, Any]:
+    ms = np.asarray(latencies_s, dtype=float) * 1000.0
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        "n": int(ms.size),
+        "throughput_per_s": round(ms.size / wall_s, 2) if wall_s > 0 else None,
+        "mean_ms": round(float(ms.mean()), 3),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(ms.max()), 3),
+    }
+
+
+def measure(fn: Callable[[Any], Any], args: Sequence[Any], concurrency: int = 1, warmup: int = 3) -> Dict[str, Any]:
+    """Run fn(arg) for every arg with `concurrency` threads; latency per call, throughput over the wall time."""
+    for a in args[:warmup]:
+        fn(a)
+
+    def timed(a) -> float:
+        t0 = time.perf_counter()
+        fn(a)
+        return time.perf_counter() - t0
+
+    start = time.perf_counter()
+    if concurrency <= 1:
+        latencies = [timed(a) for a in args]
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            latencies = list(pool.map(timed, args))
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def _ok(resp) -> None:
+    if resp.status_code != 200:
+        raise RuntimeError(f"{resp.request.method} {resp.request.url.path} -> {resp.status_code}: {resp.text[:200]}")
+
+
+def run_benchmarks(client=None, iterations: int = 200, tips_iterations: int = 30,
+                   concurrency: Sequence[int] = (1, 4, 16), llm_latency_ms: float = 20.0,
+                   llm_latency_sigma: float = 0.3, llm_error_rate: float = 0.0,
+                   log: Callable[[str], None] = lambda msg: None) -> Dict[str, Dict[str, Any]]:
+    from backend.services.improvement_tips import recommend_improvements
+    from backend.services.policy_core import normalize_payload, score_payload
+
+    use_local_llm(llm_latency_ms, llm_latency_sigma, llm_error_rate)
+    payloads = make_payloads(iterations)
+    results: Dict[str, Dict[str, Any]] = {}
+
+    def record(name: str, summary: Dict[str, Any]) -> None:
+        results[name] = summary
+        log(f"{name:<28} {summary['throughput_per_s']:>10} /s  p50 {summary['p50_ms']:>9} ms  "
+            f"p95 {summary['p95_ms']:>9} ms  p99 {summary['p99_ms']:>9} ms")
+
+    record("fn.normalize_payload", measure(normalize_payload, payloads))
+    record("fn.score_payload", measure(score_payload, payloads))
+    record("fn.recommend_improvements", measure(recommend_improvements, payloads[:tips_iterations]))
+
+    own = client is None
+    if own:
+        from fastapi.testclient import TestClient
+        from backend.main import app
+        client = TestClient(app)
+        client.__enter__()
+    try:
+        def open_cases(n: int) -> List[int]:
+            ids = []
+            for _ in range(n):
+                r = client.post("/v1/score", json=REVIEW_PAYLOAD)
+                _ok(r)
+                ids.append(r.json()["id"])
+            return ids
+
+        for c in concurrency:
+            record(f"api.score@c{c}", measure(lambda p: _ok(client.post("/v1/score", json=p)), payloads, c))
+            record(f"api.advice@c{c}", measure(
+                lambda i: _ok(client.post(f"/v1/applications/{i}/advice", params={"force": "true"})),
+                open_cases(iterations), c))
+            record(f"api.review@c{c}", measure(
+                lambda i: _ok(client.post(f"/v1/applications/{i}/review", json={"action": "APPROVE"})),
+                open_cases(iterations), c, warmup=0))  # a case can only be reviewed once
+    finally:
+        if own:
+            client.__exit__(None, None, None)
+    return results
+
+
+# -------------------------------
+# Results & comparison
+# -------------------------------
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              timeout=10).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def metadata(args: argparse.Namespace) -> Dict[str, Any]:
+    from backend.config import settings
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "iterations": args.iterations,
+        "tips_iterations": args.tips_iterations,
+        "concurrency": args.concurrency,
+        "llm_latency_ms": args.llm_latency_ms,
+        "llm_latency_sigma": args.llm_latency_sigma,
+        "llm_error_rate": args.llm_error_rate,
+        "caches": args.caches,
+        "scoring_backend": settings.SCORING_BACKEND,
+        "score_microbatch": settings.SCORE_MICROBATCH,
+        "db_group_commit": settings.DB_GROUP_COMMIT,
+    }
+
+
+def compare(baseline: Dict[str, Dict], current: Dict[str, Dict], tolerance: float = 0.25) -> List[Dict[str, Any]]:
+    """One row per compared metric of every benchmark present in both runs; `regression` flags the bad ones."""
+    rows = []
+    for name in sorted(set(baseline) & set(current)):
+        for metric, direction in COMPARED:
+            base, cur = baseline[name].get(metric), current[name].get(metric)
+            if not base or cur is None:
+                continue
+            change = (cur - base) / base
+            worse = change * direction > tolerance
+            if metric.endswith("_ms") and abs(cur - base) < MIN_DELTA_MS:
+                worse = False
+            rows.append({"name": name, "metric": metric, "baseline": base, "current": cur,
+                         "change": round(change, 4), "regression": worse})
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="In-process latency/throughput benchmarks.")
+    ap.add_argument("--out", default=None, help="write results JSON here")
+    ap.add_argument("--compare", default=None, help="baseline results JSON to compare against")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown (default 0.25)")
+    ap.add_argument("--iterations", type=int, default=200, help="calls per benchmark (default 200)")
+    ap.add_argument("--tips-iterations", type=int, default=30, help="recommend_improvements calls (default 30)")
+    ap.add_argument("--concurrency", default="1,4,16", help="API client threads, comma-separated (default 1,4,16)")
+    ap.add_argument("--llm-latency-ms", type=float, default=20.0, help="median local-LLM latency (default 20)")
+    ap.add_argument("--llm-latency-sigma", type=float, default=0.3, help="lognormal latency shape (default 0.3)")
+    ap.add_argument("--llm-error-rate", type=float, default=0.0, help="share of failing LLM calls (default 0)")
+    ap.add_argument("--caches", action="store_true", help="keep the score and LLM caches on")
+    args = ap.parse_args(argv)
+    args.concurrency = [int(c) for c in args.concurrency.split(",") if c.strip()]
+
+    prepare_env(caches=args.caches)
+    results = run_benchmarks(iterations=args.iterations, tips_iterations=args.tips_iterations,
+                             concurrency=args.concurrency, llm_latency_ms=args.llm_latency_ms,
+                             llm_latency_sigma=args.llm_latency_sigma, llm_error_rate=args.llm_error_rate,
+                             log=lambda msg: print(msg, file=sys.stderr))
+    doc = {"meta": metadata(args), "results": results}
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(doc, f, indent=2)
+        print(f"wrote {args.out}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        rows = compare(baseline, results, args.tolerance)
+        for r in rows:
+            flag = "REGRESSION" if r["regression"] else ""
+            print(f"{r['name']:<28} {r['metric']:<17} {r['baseline']:>10} -> {r['current']:>10}  "
+                  f"{r['change']:+.1%}  {flag}")
+        regressions = [r for r in rows if r["regression"]]
+        print(f"{len(regressions)} regression(s) over {len(rows)} comparisons (tolerance {args.tolerance:.0%})")
+        return 1 if regressions else 0
+    if not args.out:
+        print(json.dumps(doc, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from conftest import REVIEW_PAYLOAD
+
+
+def test_single_flight_coalesces_concurrent_callers():
+    from backend.services.single_flight import SingleFlight
+    flight, calls = SingleFlight(), []
+    started = threading.Event()
+
+    def slow():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return "advice"
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        first = pool.submit(flight.do, 1, slow)
+        started.wait(2)
+        rest = [pool.submit(flight.do, 1, slow) for _ in range(7)]
+        results = [first.result()] + [f.result() for f in rest]
+    assert len(calls) == 1
+    assert results[0] == ("advice", False)
+    assert all(r == ("advice", True) for r in results[1:])
+
+
+def test_advice_is_generated_once_then_served_from_db(client, monkeypatch):
+    from backend.api.endpoints import advice
+    calls = []
+
+    def fake_llm(payload, prob_default, thresholds, refresh=False):
+        calls.append(1)
+        time.sleep(0.1)
+        return f"advice #{len(calls)}", True
+
+    monkeypatch.setattr(advice, "_get_llm_advice", fake_llm)
+    app_id = client.post("/v1/score", json=REVIEW_PAYLOAD).json()["id"]
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        bodies = list(pool.map(lambda _: client.post(f"/v1/applications/{app_id}/advice").json(), range(4)))
+    assert len(calls) == 1
+    assert {b["advice"] for b in bodies} == {"advice #1"}
+
+    again = client.post(f"/v1/applications/{app_id}/advice").json()
+    assert again == {"id": app_id, "advice": "advice #1", "source": "stored"}
+    forced = client.post(f"/v1/applications/{app_id}/advice?force=true").json()
+    assert forced["advice"] == "advice #2" and forced["source"] == "generated"
+
+
+def test_failed_advice_is_not_stored(client, monkeypatch):
+    from backend.services import llm
+
+    class FlakyLLM(llm.LocalLLMBackend):
+        def complete(self, instructions, prompt, model, temperature=0.2):
+            if self.calls == 0:
+                self.calls += 1
+                raise llm.LLMError("transient")
+            return super().complete(instructions, prompt, model, temperature)
+
+    monkeypatch.setattr(llm, "_LLM", FlakyLLM(latency_ms=0))
+    payload = {**REVIEW_PAYLOAD, "annual_inc": REVIEW_PAYLOAD["annual_inc"] + 1}  # not in the advice cache
+    app_id = client.post("/v1/score", json=payload).json()["id"]
+    first = client.post(f"/v1/applications/{app_id}/advice").json()
+    assert first["source"] == "fallback" and first["advice"].startswith("LLM advice error")
+    second = client.post(f"/v1/applications/{app_id}/advice").json()
+    assert second["source"] == "generated" and "Recommendation:" in second["advice"]
+    assert client.post(f"/v1/applications/{app_id}/advice").json() == {**second, "source": "stored"}
+
+
+def test_forced_advice_bypasses_the_llm_cache(client, monkeypatch):
+    from backend.services import llm
+    backend = llm.LocalLLMBackend(latency_ms=0)
+    monkeypatch.setattr(llm, "_LLM", backend)
+    payload = {**REVIEW_PAYLOAD, "annual_inc": REVIEW_PAYLOAD["annual_inc"] + 2}  # not in the advice cache
+    first_id, second_id = (client.post("/v1/score", json=payload).json()["id"] for _ in range(2))
+    assert client.post(f"/v1/applications/{first_id}/advice").json()["source"] == "generated"
+    assert client.post(f"/v1/applications/{second_id}/advice").json()["source"] == "generated"
+    assert backend.calls == 1  # the second application was served from the LLM cache
+    for expected_calls in (2, 3):
+        forced = client.post(f"/v1/applications/{first_id}/advice?force=true").json()
+        assert forced["source"] == "generated" and backend.calls == expected_calls
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+from conftest import APPROVE_PAYLOAD, REJECT_PAYLOAD, REVIEW_PAYLOAD
+
+
+def test_scored_applications_store_typed_features(client):
+    from backend.db import crud
+    from backend.db.session import SessionLocal
+    app_id = client.post("/v1/score", json=REJECT_PAYLOAD).json()["id"]
+    db = SessionLocal()
+    try:
+        f = crud.get_application(db, app_id).features
+        assert (f.int_rate, f.dti, f.revol_util, f.emp_length_num, f.term_num) == (26.5, 39.0, 97.0, 0.5, 60.0)
+        assert (f.grade, f.sub_grade, f.purpose) == ("G", "G4", "small_business")
+    finally:
+        db.close()
+
+
+def test_breakdown_aggregates_in_sql(client):
+    first = client.post("/v1/score", json=REVIEW_PAYLOAD).json()
+    for p in (APPROVE_PAYLOAD, APPROVE_PAYLOAD, REJECT_PAYLOAD):
+        client.post("/v1/score", json=p)
+    body = client.get("/v1/analytics/breakdown",
+                      params={"by": "purpose", "created_from": first["created_at"]}).json()
+    seg = {s["value"]: s for s in body["segments"]}
+    assert body["by"] == "purpose" and set(seg) == {"credit_card", "debt_consolidation", "small_business"}
+    assert seg["credit_card"]["count"] == 2 and seg["credit_card"]["approval_rate"] == 1.0
+    assert seg["debt_consolidation"]["review"] == 1 and seg["debt_consolidation"]["approval_rate"] is None
+    assert seg["small_business"]["reject"] == 1 and seg["small_business"]["min_pd"] >= 0.7
+    assert client.get("/v1/analytics/breakdown", params={"by": "annual_inc"}).status_code == 422
+
+
+def test_backfill_fills_applications_stored_without_features(client):
+    from sqlalchemy import delete
+    from backend.db import crud
+    from backend.db.models import ApplicationFeatures
+    from backend.db.session import SessionLocal
+    app_id = client.post("/v1/score", json=APPROVE_PAYLOAD).json()["id"]
+    db = SessionLocal()
+    try:
+        db.execute(delete(ApplicationFeatures).where(ApplicationFeatures.application_id == app_id))
+        db.commit()
+        assert crud.backfill_application_features(db) >= 1
+        assert db.get(ApplicationFeatures, app_id).grade == "A"
+        assert crud.backfill_application_features(db) == 0
+    finally:
+        db.close()
+
+
+def _today(client, path):
+    import datetime as dt
+    day = dt.datetime.utcnow().date().isoformat()
+    items = client.get(path, params={"date_from": day, "date_to": day}).json()["items"]
+    return {i["key"]: i for i in items}
+
+
+def test_rollups_follow_scores_and_reviews(client):
+    before = _today(client, "/v1/analytics/by/grade").get("E", {"count": 0, "review": 0, "final_approve": 0})
+    app_id = client.post("/v1/score", json=REVIEW_PAYLOAD).json()["id"]
+    mid = _today(client, "/v1/analytics/by/grade")["E"]
+    assert (mid["count"], mid["review"]) == (before["count"] + 1, before["review"] + 1)
+    assert mid["final_approve"] == before["final_approve"]
+
+    client.post(f"/v1/applications/{app_id}/review", json={"action": "APPROVE"})
+    after = _today(client, "/v1/analytics/by/grade")["E"]
+    assert after["count"] == mid["count"] and after["final_approve"] == mid["final_approve"] + 1
+    assert after["approval_rate"] is not None and after["min_pd"] <= after["p50_pd"] <= after["max_pd"]
+
+
+def test_rollups_match_a_full_recompute(client):
+    from backend.db import rollups
+    from backend.db.session import SessionLocal
+    for p in (APPROVE_PAYLOAD, REVIEW_PAYLOAD, REJECT_PAYLOAD):
+        client.post("/v1/score", json=p)
+    daily, by_purpose = _today(client, "/v1/analytics/daily"), _today(client, "/v1/analytics/by/purpose")
+    db = SessionLocal()
+    try:
+        assert rollups.rebuild(db) >= 3
+    finally:
+        db.close()
+    assert _today(client, "/v1/analytics/daily") == daily
+    assert _today(client, "/v1/analytics/by/purpose") == by_purpose
+    day = next(iter(daily.values()))
+    assert day["count"] == day["approve"] + day["review"] + day["reject"]
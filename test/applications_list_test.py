@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+from conftest import APPROVE_PAYLOAD, REJECT_PAYLOAD, REVIEW_PAYLOAD
+
+
+def _page_all(client, **params):
+    items, cursor = [], None
+    while True:
+        q = dict(params, limit=2, **({"cursor": cursor} if cursor else {}))
+        page = client.get("/v1/applications", params=q)
+        assert page.status_code == 200, page.text
+        body = page.json()
+        assert len(body["items"]) <= 2
+        items += body["items"]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return items
+
+
+def test_review_queue_filters_and_keyset_pages(client):
+    created = [client.post("/v1/score", json=p).json()
+               for p in (REVIEW_PAYLOAD, APPROVE_PAYLOAD, REVIEW_PAYLOAD, REJECT_PAYLOAD, REVIEW_PAYLOAD)]
+    ids = [c["id"] for c in created]
+    since = created[0]["created_at"]  # the DB is shared with other tests: only look at these rows
+
+    queue = _page_all(client, status="OPEN", system_decision="REVIEW", created_from=since)
+    assert [a["id"] for a in queue] == [ids[0], ids[2], ids[4]]  # oldest first, no gaps or repeats
+    assert all(a["status"] == "OPEN" and a["system_decision"] == "REVIEW" for a in queue)
+
+    newest_first = _page_all(client, created_from=since, order="desc")
+    assert [a["id"] for a in newest_first] == ids[::-1]
+
+    high = _page_all(client, created_from=since, pd_min=0.7)
+    assert high and all(a["prob_default"] >= 0.7 for a in high)
+    assert _page_all(client, created_from=since, final_decision="REJECT")[0]["id"] == ids[3]
+
+
+def test_invalid_cursor_is_rejected(client):
+    assert client.get("/v1/applications", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_missing_indexes_are_created_on_existing_databases():
+    from sqlalchemy import inspect, text
+    from backend.db.session import _add_missing_indexes, engine, init_db
+    init_db()
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX IF EXISTS ix_applications_queue"))
+    _add_missing_indexes()
+    assert "ix_applications_queue" in {ix["name"] for ix in inspect(engine).get_indexes("applications")}
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+from bench.run import compare, run_benchmarks
+
+
+def test_compare_flags_only_meaningful_slowdowns():
+    base = {"api.score@c1": {"p50_ms": 10.0, "p95_ms": 20.0, "throughput_per_s": 100.0},
+            "fn.normalize_payload": {"p50_ms": 0.01, "p95_ms": 0.02, "throughput_per_s": 1000.0}}
+    cur = {"api.score@c1": {"p50_ms": 11.0, "p95_ms": 30.0, "throughput_per_s": 70.0},
+           "fn.normalize_payload": {"p50_ms": 0.03, "p95_ms": 0.04, "throughput_per_s": 990.0},
+           "api.new@c1": {"p50_ms": 1.0}}
+    flagged = {(r["name"], r["metric"]) for r in compare(base, cur, tolerance=0.25) if r["regression"]}
+    # +10% p50 is within tolerance; 0.02 ms moves are timer noise; new benchmarks have no baseline
+    assert flagged == {("api.score@c1", "p95_ms"), ("api.score@c1", "throughput_per_s")}
+
+
+def test_run_benchmarks_in_process_with_local_llm(client, monkeypatch):
+    from backend.services import llm
+    monkeypatch.setattr(llm, "_LLM", llm._LLM)  # restored after the benchmark swaps in the stand-in
+    results = run_benchmarks(client, iterations=4, tips_iterations=2, concurrency=(1, 2), llm_latency_ms=0)
+    assert set(results) == {"fn.normalize_payload", "fn.score_payload", "fn.recommend_improvements",
+                            *(f"api.{e}@c{c}" for e in ("score", "advice", "review") for c in (1, 2))}
+    assert all(r["n"] > 0 and r["p50_ms"] <= r["p95_ms"] <= r["p99_ms"] for r in results.values())
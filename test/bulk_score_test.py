@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+import pandas as pd
+
+from conftest import payload_grid
+
+
+def _write_input(tmp_path):
+    payloads = payload_grid()
+    frame = pd.DataFrame([dict(p, id=i) for i, p in enumerate(payloads)])
+    path = tmp_path / "apps.csv"
+    frame.to_csv(path, index=False)
+    return payloads, path
+
+
+def test_bulk_score_matches_api_scoring(tmp_path):
+    from backend.bulk_score import bulk_score
+    from backend.services.policy_core import score_payloads
+    payloads, src = _write_input(tmp_path)
+    expected = score_payloads(payloads)
+    for workers in (0, 2):
+        out = tmp_path / f"scored_{workers}.csv"
+        summary = bulk_score(str(src), str(out), chunksize=10, workers=workers, keep=["id"], progress=False)
+        assert summary["rows"] == len(payloads)
+        scored = pd.read_csv(out)
+        assert scored["id"].tolist() == list(range(len(payloads)))  # input order kept
+        assert scored["prob_default"].tolist() == [r["prob_default"] for r in expected]
+        assert scored["decision"].tolist() == [r["decision"] for r in expected]
+        assert set(scored["policy_source"]) == {expected[0]["policy_source"]}
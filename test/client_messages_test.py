@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+import time
+import pytest
+from conftest import REJECT_PAYLOAD, REVIEW_PAYLOAD
+
+
+class FakeLLM:
+    """Local stand-in for the LLM message generator: fails `fail_first` times, then answers."""
+
+    def __init__(self, fail_first=0):
+        self.fail_first = fail_first
+        self.calls = 0
+
+    def __call__(self, payload):
+        self.calls += 1
+        if self.calls <= self.fail_first:
+            raise RuntimeError("LLM timeout")
+        return f"Dear {payload.get('first_name') or 'there'}, please consider a smaller amount."
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from backend.db.session import Base
+    from backend.db import models  # noqa: F401
+    engine = create_engine(f"sqlite:///{tmp_path}/msgs.db", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+
+def _pending_app(session_factory):
+    from backend.db import crud
+    db = session_factory()
+    try:
+        rec = crud.create_application(db, payload=REJECT_PAYLOAD, first_name="Chris", prob_default=0.9,
+                                      system_decision="REJECT", final_decision="REJECT", status="CLOSED",
+                                      client_message_status="PENDING")
+        return rec.id
+    finally:
+        db.close()
+
+
+def _load(session_factory, app_id):
+    from backend.db import crud
+    db = session_factory()
+    try:
+        return crud.get_application(db, app_id)
+    finally:
+        db.close()
+
+
+def test_worker_retries_then_writes_message(session_factory):
+    from backend.services.client_messages import ClientMessageWorker
+    llm = FakeLLM(fail_first=2)
+    worker = ClientMessageWorker(generate=llm, session_factory=session_factory, retries=3, backoff_s=0.001)
+    app_id = _pending_app(session_factory)
+    assert worker.enqueue(app_id).result(5) == "READY"
+    rec = _load(session_factory, app_id)
+    assert rec.client_message_status == "READY"
+    assert rec.client_message.startswith("Dear Chris")
+    assert llm.calls == 3
+
+
+def test_worker_marks_failed_after_retries(session_factory):
+    from backend.services.client_messages import ClientMessageWorker
+    llm = FakeLLM(fail_first=10)
+    worker = ClientMessageWorker(generate=llm, session_factory=session_factory, retries=1, backoff_s=0.001)
+    app_id = _pending_app(session_factory)
+    assert worker.enqueue(app_id).result(5) == "FAILED"
+    assert _load(session_factory, app_id).client_message is None
+    assert llm.calls == 2
+
+
+def test_worker_holds_no_session_while_generating(session_factory):
+    from backend.services.client_messages import ClientMessageWorker
+    open_sessions = []
+
+    def tracking_factory():
+        db = session_factory()
+        open_sessions.append(db)
+        close = db.close
+        db.close = lambda: (open_sessions.remove(db), close())
+        return db
+
+    def generate(payload):
+        assert not open_sessions
+        return "Dear Chris, thank you."
+
+    worker = ClientMessageWorker(generate=generate, session_factory=tracking_factory, backoff_s=0.001)
+    app_id = _pending_app(session_factory)
+    assert worker.enqueue(app_id).result(5) == "READY"
+    assert not open_sessions
+
+
+def test_reject_returns_pending_then_message_is_pollable(client, monkeypatch):
+    from backend.services import client_messages
+    worker = client_messages.ClientMessageWorker(generate=FakeLLM(), backoff_s=0.001)
+    monkeypatch.setattr(client_messages, "_WORKER", worker)
+
+    r = client.post("/v1/score", json=REJECT_PAYLOAD)
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["system_decision"] == "REJECT"
+    assert body["client_message_status"] == "PENDING"
+
+    deadline = time.time() + 5
+    while True:
+        polled = client.get(f"/v1/applications/{body['id']}/client-message").json()
+        if polled["status"] != "PENDING" or time.time() > deadline:
+            break
+        time.sleep(0.02)
+    assert polled["status"] == "READY"
+    assert polled["client_message"].startswith("Dear Chris")
+
+    # officer REJECT goes through the same background path
+    review = client.post("/v1/score", json=REVIEW_PAYLOAD).json()
+    r = client.post(f"/v1/applications/{review['id']}/review", json={"action": "REJECT"})
+    assert r.json()["client_message_status"] == "PENDING"
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Artifacts are resolved relative to the repo root, and the DB URL is read at import
+# time, so both have to be settled before any backend module is imported.
+ROOT = Path(__file__).resolve().parents[1]
+os.chdir(ROOT)
+TMP_DIR = tempfile.mkdtemp()
+os.environ.setdefault("DB_URL", f"sqlite:///{TMP_DIR}/test_credit_app.db")
+os.environ.setdefault("LLM_CACHE_PATH", f"{TMP_DIR}/test_llm_cache.db")
+os.environ.setdefault("SCORE_CACHE_PATH", f"{TMP_DIR}/test_score_cache.db")
+os.environ.setdefault("JOBS_DIR", f"{TMP_DIR}/jobs")
+
+
+APPROVE_PAYLOAD = {
+    "first_name": "Jamie", "last_name": "Banks",
+    "loan_amnt": 8000, "int_rate": "7.5%",
+    "fico_range_low": 780, "fico_range_high": 784,
+    "annual_inc": 120000, "dti": "6%", "revol_util": "5%",
+    "emp_length": "10+ years", "term": "36 months",
+    "grade": "A", "sub_grade": "A1",
+    "home_ownership": "MORTGAGE", "verification_status": "Not Verified",
+    "purpose": "credit_card",
+}
+REVIEW_PAYLOAD = {
+    "first_name": "Alex", "last_name": "Carver",
+    "loan_amnt": 150000, "int_rate": "20.8%",
+    "fico_range_low": 690, "fico_range_high": 694,
+    "annual_inc": 55000, "dti": 12.0, "revol_util": "55%",
+    "emp_length": "3 years", "term": "60 months",
+    "grade": "E", "sub_grade": "E3",
+    "home_ownership": "RENT", "verification_status": "Source Verified",
+    "purpose": "debt_consolidation",
+}
+REJECT_PAYLOAD = {
+    "first_name": "Chris", "last_name": "Nolan",
+    "loan_amnt": 35000, "int_rate": "26.5%",
+    "fico_range_low": 660, "fico_range_high": 664,
+    "annual_inc": 30000, "dti": "39%", "revol_util": "97%",
+    "emp_length": "< 1 year", "term": "60 months",
+    "grade": "G", "sub_grade": "G4",
+    "home_ownership": "RENT", "verification_status": "Verified",
+    "purpose": "small_business",
+}
+
+
+def payload_grid():
+    """A spread of payloads (incl. messy strings / missing values) for parity checks."""
+    out = [dict(APPROVE_PAYLOAD), dict(REVIEW_PAYLOAD), dict(REJECT_PAYLOAD)]
+    grades = ["A1", "B3", "C5", "D2", "E4", "F1", "G5"]
+    purposes = ["car", "credit_card", "debt_consolidation", "medical", "small_business", "wedding"]
+    for i in range(40):
+        sub = grades[i % len(grades)]
+        out.append({
+            "loan_amnt": 1000 + 1375 * i,
+            "int_rate": f"{5 + (i * 0.73) % 22:.2f}%" if i % 3 else 5 + (i * 0.73) % 22,
+            "fico_range_low": 640 + (i * 7) % 150,
+            "fico_range_high": 644 + (i * 7) % 150,
+            "annual_inc": 18000 + 4100 * i,
+            "dti": f"{(i * 1.9) % 45:.1f}%" if i % 2 else (i * 1.9) % 45,
+            "revol_util": f"{(i * 2.7) % 110:.1f}%" if i % 5 else None,
+            "emp_length": ["< 1 year", "1 year", "5 years", "10+ years", "n/a"][i % 5],
+            "term": ["36 months", " 60 months"][i % 2],
+            "grade": sub[0], "sub_grade": sub,
+            "home_ownership": ["RENT", "OWN", "MORTGAGE", "OTHER"][i % 4],
+            "verification_status": ["Verified", "Not Verified", "Source Verified"][i % 3],
+            "purpose": purposes[i % len(purposes)],
+        })
+    return out
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+    from backend.main import app
+    with TestClient(app) as c:
+        yield c
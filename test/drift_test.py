@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pandas as pd
+
+from conftest import REJECT_PAYLOAD, payload_grid
+
+
+def _reference(tmp_path):
+    from backend.drift_reference import main
+    from backend.services.policy_core import FEATURE_SET
+    src, out = tmp_path / "train.csv", tmp_path / "reference.json"
+    pd.DataFrame(payload_grid() * 5).to_csv(src, index=False)
+    assert main([str(src), str(out), "--bins", "4"]) == 0
+    ref = json.loads(out.read_text())
+    assert list(ref["features"]) == FEATURE_SET and ref["rows"] == 215
+    assert all(abs(sum(f["shares"]) - 1) < 1e-4 for f in ref["features"].values())
+    return ref
+
+
+def test_psi_separates_stable_from_shifted_traffic(tmp_path):
+    from backend.services.drift import DriftMonitor
+    now = [0.0]
+    monitor = DriftMonitor(_reference(tmp_path), window_s=60, windows=2, min_rows=10, clock=lambda: now[0])
+    monitor.observe(payload_grid())
+    stable = monitor.snapshot()["windows"][0]["features"]
+    assert stable["annual_inc"]["band"] == "stable" and stable["grade"]["band"] == "stable"
+
+    now[0] = 61.0  # next window: only high-income, grade G applicants
+    monitor.observe([dict(REJECT_PAYLOAD, annual_inc=5e6)] * 50)
+    snap = monitor.snapshot(detail=True)
+    assert [w["n"] for w in snap["windows"]] == [50, 43]
+    assert {"annual_inc", "grade", "sub_grade"} <= set(snap["alerts"])
+    assert snap["cumulative"]["n"] == 93 and snap["bins"]["grade"][-1]["bin"] == "missing"
+
+
+def test_drift_endpoint_without_and_with_reference(client, tmp_path, monkeypatch):
+    from backend.services import drift
+    assert client.get("/v1/stats/drift").json()["reference"] is None  # no profile shipped with the model
+
+    monkeypatch.setattr(drift, "_MONITOR", drift.DriftMonitor(_reference(tmp_path), min_rows=1))
+    client.post("/v1/score", json=REJECT_PAYLOAD)
+    body = client.get("/v1/stats/drift").json()
+    assert body["enabled"] and body["reference"]["rows"] == 215
+    assert body["windows"][0]["n"] == 1 and body["windows"][0]["features"]["grade"]["psi"] > 0
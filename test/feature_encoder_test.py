@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+from conftest import payload_grid
+
+
+def test_encoder_compiled_from_saved_pipeline():
+    from backend.services import policy_core
+    assert policy_core.ENCODER is not None
+    assert policy_core.ENCODER.n_features == policy_core.CLASSIFIER.get_booster().num_features()
+
+
+def test_fast_path_is_bit_identical_to_dataframe_route():
+    from backend.services import policy_core
+    payloads = payload_grid()
+    fast = policy_core.predict_pds(payloads)
+    ref = policy_core.predict_pds_frame(payloads)
+    assert np.array_equal(fast, ref)
+    # single-row calls go through the same encoder
+    for p, expected in zip(payloads, ref):
+        assert policy_core.predict_pds([p])[0] == expected
+
+
+def test_unknown_and_missing_values_match_dataframe_route():
+    from backend.services import policy_core
+    odd = [
+        {"loan_amnt": "12000", "int_rate": None, "grade": "Z", "sub_grade": None, "term": "60 months"},
+        {"loan_amnt": 0, "dti": "0%", "revol_util": "0", "purpose": "not_a_purpose"},
+        {},
+    ]
+    assert np.array_equal(policy_core.predict_pds(odd), policy_core.predict_pds_frame(odd))
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import APPROVE_PAYLOAD
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from backend.db.session import Base
+    from backend.db import models  # noqa: F401
+    engine = create_engine(f"sqlite:///{tmp_path}/writes.db", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+
+def _row(i, **over):
+    return dict(dict(payload=APPROVE_PAYLOAD, first_name=f"A{i}", prob_default=0.1,
+                     system_decision="APPROVE", final_decision="APPROVE", status="CLOSED"), **over)
+
+
+def test_concurrent_inserts_share_commits_and_get_their_own_ids(session_factory):
+    from backend.db.models import Application
+    from backend.services.group_commit import insert_many
+    from backend.services.micro_batcher import MicroBatcher
+    gate = threading.Event()
+
+    def held(rows):
+        gate.wait(5)  # hold the first commit so the other requests queue up behind it
+        return insert_many(rows, session_factory)
+
+    writer = MicroBatcher(held, max_wait_ms=5, max_batch=64, name="test-group-commit")
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        futures = [pool.submit(lambda i=i: writer.submit(_row(i)).result(10)) for i in range(50)]
+        threading.Timer(0.2, gate.set).start()
+        recs = [f.result(10) for f in futures]
+
+    assert [r.first_name for r in recs] == [f"A{i}" for i in range(50)]
+    assert len({r.id for r in recs}) == 50
+    stats = writer.stats()
+    assert stats["batch_size"]["count"] < 50  # fewer commits than requests
+    assert stats["flush_ms"]["count"] == stats["batch_size"]["count"]
+    db = session_factory()
+    try:
+        assert {r.id: r.first_name for r in db.query(Application)} == {r.id: r.first_name for r in recs}
+    finally:
+        db.close()
+
+
+def test_bad_row_fails_only_its_own_request(session_factory):
+    from backend.services.group_commit import insert_many
+    out = insert_many([_row(1), _row(2, prob_default=None), _row(3)], session_factory)
+    assert [type(o).__name__ for o in out] == ["Application", "IntegrityError", "Application"]
+    assert out[0].id and out[2].id
+
+
+def test_sqlite_engine_runs_in_wal_mode():
+    from sqlalchemy import text
+    from backend.db.session import engine
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar().lower() == "wal"
+
+
+def test_score_endpoint_returns_persisted_id(client):
+    r = client.post("/v1/score", json=APPROVE_PAYLOAD)
+    assert r.status_code == 200
+    assert client.get(f"/v1/applications/{r.json()['id']}").json()["prob_default"] == r.json()["prob_default"]
+    assert client.get("/v1/stats/db-writes").json()["enabled"] is True
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+import threading
+
+from conftest import payload_grid, REJECT_PAYLOAD
+
+
+def _count_model_calls(monkeypatch):
+    """Model calls made on this thread (background workers score through the same function)."""
+    from backend.services import score_cache
+    calls = []
+    original = score_cache.predict_pds
+    caller = threading.get_ident()
+
+    def counting(payloads, *args):
+        if threading.get_ident() == caller:
+            calls.append(len(payloads))
+        return original(payloads, *args)
+
+    monkeypatch.setattr(score_cache, "predict_pds", counting)
+    return calls
+
+
+def test_recommendation_model_calls_are_bounded(monkeypatch):
+    from backend.config import settings
+    from backend.services import improvement_tips
+    calls = _count_model_calls(monkeypatch)
+    for p in payload_grid()[:10]:
+        calls.clear()
+        improvement_tips.recommend_improvements(dict(p, loan_amnt=p["loan_amnt"] + 1))  # cold cache
+        # candidates, one batch of split-threshold counterfactuals, one batch per plan depth level
+        assert 1 <= len(calls) <= 2 + settings.PLAN_MAX_DEPTH
+
+
+def test_minimal_change_crosses_and_nothing_cheaper_does():
+    from backend.services import counterfactuals, improvement_tips
+    from backend.services.score_cache import cached_pds
+    thr = improvement_tips._thr_review()
+    checked = 0
+    for p in payload_grid():
+        for change in counterfactuals.find_minimal_changes(p, thr):
+            assert change["new_pd"] < thr
+            cheaper = [c for c in counterfactuals.breakpoint_candidates(p)
+                       if c["feature"] == change["feature"] and c["cost"] < change["cost"]]
+            assert all(pd >= thr for pd in cached_pds([c["payload"] for c in cheaper]))
+            checked += 1
+    assert checked > 0
+
+
+def test_counterfactual_search_respects_eval_budget():
+    from backend.services import counterfactuals
+    seen = []
+
+    def pds(payloads):
+        seen.append(len(payloads))
+        return [1.0] * len(payloads)  # never crosses -> search runs until the budget is spent
+
+    counterfactuals.find_minimal_changes(REJECT_PAYLOAD, 0.5, max_evals=20, pds_fn=pds)
+    assert sum(seen[1:]) <= 20
+
+
+def test_plan_is_no_costlier_than_the_minimal_single_change():
+    from backend.services import improvement_tips
+    for p in payload_grid():
+        tips = improvement_tips.recommend_improvements(p)
+        assert tips["greedy_plan"] == tips["plan"]
+        if tips["crosses_threshold"]:
+            assert tips["plan"][-1]["new_pd"] < tips["details"]["thr_review"]
+        if tips["minimal_changes"]:
+            assert tips["crosses_threshold"]
+            assert tips["plan_cost"] <= tips["minimal_changes"][0]["cost"] + 1e-9
+
+
+def test_beam_search_respects_eval_budget_and_uses_each_feature_once():
+    from backend.services import plan_search
+    seen = []
+
+    def pds(payloads):
+        seen.append(len(payloads))
+        return [0.9] * len(payloads)  # never crosses -> every level is expanded
+
+    actions = plan_search.plan_actions(REJECT_PAYLOAD)
+    plan = plan_search.beam_search_plan(REJECT_PAYLOAD, 0.5, actions, current_pd=0.95,
+                                        max_evals=30, pds_fn=pds)
+    assert sum(seen) == plan["evals"] <= 30
+    assert not plan["crosses"]
+    features = [a["feature"] for s in plan["steps"] for a in actions if a["action"] == s["action"]]
+    assert len(features) == len(set(features))
+
+
+def test_batched_pds_match_single_scoring():
+    from backend.services import improvement_tips
+    from backend.services.policy_core import score_payload
+    payloads = payload_grid()
+    assert improvement_tips._get_pds(payloads) == [score_payload(p)["prob_default"] for p in payloads]
+
+
+def test_cache_hits_skip_the_model(monkeypatch):
+    from backend.services import improvement_tips
+    improvement_tips.recommend_improvements(REJECT_PAYLOAD)
+    calls = _count_model_calls(monkeypatch)
+    improvement_tips.recommend_improvements(REJECT_PAYLOAD)
+    assert calls == []
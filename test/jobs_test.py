@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+import io
+import time
+
+import pandas as pd
+
+from conftest import payload_grid
+
+
+def _wait_done(client, job_id, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = client.get(f"/v1/jobs/{job_id}").json()
+        if job["status"] in ("DONE", "FAILED"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} did not finish: {job}")
+
+
+def test_count_rows_matches_the_csv_reader(tmp_path):
+    from backend.services.scoring_jobs import count_rows
+    path = tmp_path / "apps.csv"
+    path.write_text('loan_amnt,emp_title\n1000,"line one\nline two"\n2000,plain\n3000,"a\n\nb"')
+    assert count_rows(str(path)) == 3
+    (tmp_path / "empty.csv").write_text("")
+    assert count_rows(str(tmp_path / "empty.csv")) == 0
+
+
+def test_job_scores_upload_and_pages_results(client):
+    from backend.services.policy_core import score_payloads
+    payloads = payload_grid()
+    csv = pd.DataFrame(payloads).to_csv(index=False).encode("utf-8")
+    r = client.post("/v1/jobs", files={"file": ("apps.csv", io.BytesIO(csv), "text/csv")})
+    assert r.status_code == 202
+    assert r.json()["status"] in ("QUEUED", "RUNNING", "DONE")
+
+    job = _wait_done(client, r.json()["id"])
+    assert job["status"] == "DONE", job
+    assert job["total_rows"] == job["processed_rows"] == len(payloads)
+
+    items, cursor = [], -1
+    while cursor is not None:
+        page = client.get(f"/v1/jobs/{job['id']}/results", params={"cursor": cursor, "limit": 10}).json()
+        assert len(page["items"]) <= 10
+        items += page["items"]
+        cursor = page["next_cursor"]
+    expected = score_payloads(payloads)
+    assert [i["row_index"] for i in items] == list(range(len(payloads)))
+    assert [i["prob_default"] for i in items] == [e["prob_default"] for e in expected]
+    assert [i["decision"] for i in items] == [e["decision"] for e in expected]
+
+
+def test_job_rejects_unsupported_files_and_unknown_ids(client):
+    r = client.post("/v1/jobs", files={"file": ("apps.xlsx", io.BytesIO(b"x"), "application/octet-stream")})
+    assert r.status_code == 415
+    assert client.get("/v1/jobs/nope").status_code == 404
+    assert client.get("/v1/jobs/nope/results").status_code == 404
+
+
+def test_unreadable_upload_fails_the_job(client, monkeypatch):
+    import sys
+    monkeypatch.setitem(sys.modules, "pyarrow", None)  # Parquet upload without pyarrow installed
+    monkeypatch.setitem(sys.modules, "pyarrow.parquet", None)
+    r = client.post("/v1/jobs", files={"file": ("apps.parquet", io.BytesIO(b"PAR1"), "application/octet-stream")})
+    job = _wait_done(client, r.json()["id"])
+    assert job["status"] == "FAILED" and "pyarrow" in job["error"]
+
+    r = client.post("/v1/jobs", files={"file": ("bad.csv", io.BytesIO(b'a,b\n"1,2\n3'), "text/csv")})
+    job = _wait_done(client, r.json()["id"])
+    assert job["status"] == "FAILED" and job["error"]
+
+
+def test_interrupted_job_resumes_after_last_committed_chunk(tmp_path):
+    from backend.db import crud
+    from backend.db.session import SessionLocal, init_db
+    from backend.services.scoring_jobs import JobRunner
+    payloads = payload_grid()
+    init_db()
+    runner = JobRunner(chunk_rows=7, jobs_dir=str(tmp_path))
+    db = SessionLocal()
+    try:
+        path = tmp_path / "resume.csv"
+        path.write_bytes(pd.DataFrame(payloads).to_csv(index=False).encode("utf-8"))
+        # a RUNNING job whose first two chunks were committed before a restart
+        job = crud.create_job(db, id="resume", filename="resume.csv", path=str(path), status="RUNNING")
+        first = [{"row_index": i, "prob_default": 0.0, "decision": "APPROVE", "policy_source": "x"} for i in range(14)]
+        crud.add_job_results(db, job, first)
+        assert runner.enqueue("resume").result() == "DONE"
+        rows = crud.get_job_results(db, "resume", after=-1, limit=1000)
+        assert [r.row_index for r in rows] == list(range(len(payloads)))
+        assert all(r.policy_source == "x" for r in rows[:14])
+        assert all(r.policy_source != "x" for r in rows[14:])
+        assert not path.exists()  # the upload is deleted once the job is terminal
+    finally:
+        runner.shutdown()
+        db.close()
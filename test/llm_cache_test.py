@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+import time
+
+
+def test_lru_and_ttl_eviction(tmp_path):
+    from backend.services.sqlite_cache import SQLiteCache
+    cache = SQLiteCache(str(tmp_path / "c.db"), max_entries=10, touch_interval_s=0)
+    for i in range(10):
+        cache.set(f"k{i}", i)
+    assert cache.get("k0") == 0  # k0 becomes most recently used
+    cache.set("k10", 10)         # over capacity -> trims the least recently used
+    assert cache.get("k0") == 0
+    assert cache.get("k1") is None
+    assert len(cache) <= 10
+    assert cache.stats()["evictions"] > 0
+
+    short = SQLiteCache(str(tmp_path / "c.db"), table="short", ttl_seconds=0.05)
+    short.set("a", "x")
+    assert short.get("a") == "x"
+    time.sleep(0.1)
+    assert short.get("a") is None
+
+
+def test_hits_do_not_write_and_size_checks_are_batched(tmp_path):
+    from backend.services.sqlite_cache import SQLiteCache
+    cache = SQLiteCache(str(tmp_path / "c.db"), max_entries=100)
+    statements = []
+    cache._conn().set_trace_callback(statements.append)
+    for i in range(25):
+        cache.set(f"k{i}", i)
+    assert sum("COUNT(*)" in s for s in statements) == 2  # once per 10 inserts
+    statements.clear()
+    assert cache.get("k0") == 0 and cache.get_many(["k1", "k2"]) == {"k1": 1, "k2": 2}
+    assert not [s for s in statements if s.lstrip().upper().startswith(("UPDATE", "INSERT", "DELETE"))]
+
+
+def test_client_message_cached_across_applicants(monkeypatch):
+    from backend.services import improvement_tips, llm
+    calls = []
+
+    class FakeLLM(llm.LLMBackend):
+        def complete(self, instructions, prompt, model, temperature=0.2):
+            calls.append(prompt)
+            return f"Dear {improvement_tips.NAME_PLACEHOLDER}, thanks. - Switch to a 36-month term"
+
+    monkeypatch.setattr(llm, "_LLM", FakeLLM())
+    tips = {"greedy_plan": [{"action": "Switch to a 36-month term (cache test)"}]}
+    a = improvement_tips.format_client_message_llm({"first_name": "Ana", "last_name": "Ng"}, tips)
+    b = improvement_tips.format_client_message_llm({"first_name": "Bo"}, tips)
+    assert a.startswith("Dear Ana Ng,")
+    assert b.startswith("Dear Bo,")
+    assert len(calls) == 1
+    assert "Ana" not in calls[0]
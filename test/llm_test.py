@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+
+def test_local_backend_is_deterministic_and_seeded():
+    from backend.services.llm import LLMError, LocalLLMBackend
+    prompt = "Applicant name: X\n\nUse these concrete actions:\n- Shorten the term\n- Lower the amount\n\nWrite:\n- Thanks"
+    slept = []
+    llm = LocalLLMBackend(latency_ms=100, sigma=0.5, error_rate=0.2, seed=7, sleep=slept.append)
+    out, errors = [], 0
+    for _ in range(500):
+        try:
+            out.append(llm.complete("sys", prompt, model="m"))
+        except LLMError:
+            errors += 1
+    assert len(set(out)) == 1
+    assert out[0].startswith("Dear X,")
+    assert "- Shorten the term\n- Lower the amount\n" in out[0] and "- Thanks" not in out[0]
+    assert 0.14 < errors / 500 < 0.26 and llm.errors == errors and llm.calls == 500
+    slept.sort()
+    assert 0.085 < slept[250] < 0.115  # median latency ~ latency_ms
+
+    again = LocalLLMBackend(latency_ms=100, sigma=0.5, error_rate=0.2, seed=7, sleep=lambda s: None)
+    draws = [again._draw() for _ in range(5)]
+    replay = LocalLLMBackend(latency_ms=100, sigma=0.5, error_rate=0.2, seed=7, sleep=lambda s: None)
+    assert [replay._draw() for _ in range(5)] == draws
+    assert llm.model_id("gpt-x") == "local:gpt-x"
+
+
+def test_backend_without_complete_cannot_be_instantiated():
+    from backend.services.llm import LLMBackend
+
+    class Incomplete(LLMBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_advice_and_client_message_offline(client, monkeypatch):
+    from conftest import REVIEW_PAYLOAD
+    from backend.services import improvement_tips, llm
+    monkeypatch.setattr(llm, "_LLM", llm.LocalLLMBackend(latency_ms=0))
+    tips = {"greedy_plan": [{"action": "Pay down revolving balances (offline test)"}]}
+    msg = improvement_tips.format_client_message_llm({"first_name": "Ana"}, tips)
+    assert msg.startswith("Dear Ana,") and "- Pay down revolving balances (offline test)" in msg
+
+    app_id = client.post("/v1/score", json=REVIEW_PAYLOAD).json()["id"]
+    r = client.post(f"/v1/applications/{app_id}/advice")
+    assert r.status_code == 200, r.text
+    assert "Recommendation:" in r.text
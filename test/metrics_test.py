@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+import re
+
+from conftest import REVIEW_PAYLOAD
+
+
+def _samples(text):
+    return {line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1]) for line in text.splitlines()
+            if line and not line.startswith("#")}
+
+
+def test_metrics_exposes_stage_timers_requests_and_caches(client):
+    from backend.services.improvement_tips import recommend_improvements
+    app_id = client.post("/v1/score", json=REVIEW_PAYLOAD).json()["id"]
+    client.post(f"/v1/applications/{app_id}/review", json={"action": "APPROVE"})
+    recommend_improvements(REVIEW_PAYLOAD)
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200 and resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    samples = _samples(resp.text)
+    for name in ("normalize_payload", "predict_proba", "recommend_improvements", "db_commit"):
+        assert samples[f'credit_stage_duration_seconds_count{{stage="{name}"}}'] >= 1
+        assert f'credit_stage_duration_seconds_bucket{{stage="{name}",le="+Inf"}}' in samples
+    assert samples['credit_http_requests_total{method="POST",route="/v1/score",status="2xx"}'] >= 1
+    assert samples['credit_http_requests_total{method="POST",route="/v1/applications/{app_id}/review",status="2xx"}'] >= 1
+    assert samples["credit_http_requests_in_flight"] == 1  # the scrape itself
+    assert 'credit_cache_hit_ratio{cache="score"}' in samples and 'credit_cache_entries{cache="split_points"}' in samples
+    assert any(k.startswith("credit_model_info{") for k in samples)
+    assert re.search(r"^# TYPE credit_stage_duration_seconds histogram$", resp.text, re.M)
+
+    family, seen = None, set()  # each family is one contiguous group after its TYPE line
+    for line in resp.text.splitlines():
+        if line.startswith("# TYPE "):
+            family = line.split()[2]
+            assert family not in seen
+            seen.add(family)
+        elif line and not line.startswith("#"):
+            name = re.match(r"[a-z_]+", line).group(0)
+            assert name == family or name in (family + "_bucket", family + "_sum", family + "_count"), line
+
+
+def test_stage_is_a_noop_when_metrics_are_disabled(monkeypatch):
+    from backend.config import settings
+    from backend.services import metrics
+    monkeypatch.setattr(settings, "METRICS_ENABLED", False)
+    with metrics.stage("disabled_stage"):
+        pass
+    assert "disabled_stage" not in metrics.METRICS.stages
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from conftest import payload_grid
+
+
+def test_concurrent_requests_share_model_calls_and_keep_results():
+    from backend.services.micro_batcher import MicroBatcher
+    from backend.services.policy_core import score_payload, score_payloads
+
+    calls = []
+    gate = threading.Event()
+
+    def score_many(payloads):
+        gate.wait(5)  # hold the first batch so the rest of the callers queue up
+        calls.append(len(payloads))
+        return score_payloads(payloads)
+
+    batcher = MicroBatcher(score_many, max_wait_ms=5, max_batch=16)
+    payloads = payload_grid()
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        futures = [pool.submit(batcher.score, p) for p in payloads]
+        threading.Timer(0.2, gate.set).start()
+        results = [f.result(10) for f in futures]
+
+    assert results == [score_payload(p) for p in payloads]
+    assert sum(calls) == len(payloads)
+    assert len(calls) < len(payloads)
+    assert max(calls) <= 16
+    stats = batcher.stats()
+    assert stats["batch_size"]["count"] == len(calls)
+    assert stats["queue_wait_ms"]["count"] == len(payloads)
+
+
+def test_batch_failure_propagates_to_callers():
+    import pytest
+    from backend.services.micro_batcher import MicroBatcher
+
+    def boom(payloads):
+        raise RuntimeError("model down")
+
+    batcher = MicroBatcher(boom)
+    with pytest.raises(RuntimeError, match="model down"):
+        batcher.score({})
+    # worker survives the failure
+    with pytest.raises(RuntimeError):
+        batcher.score({})
+
+
+def test_short_result_list_fails_every_caller():
+    import pytest
+    from backend.services.micro_batcher import MicroBatcher
+    gate = threading.Event()
+
+    def short(payloads):
+        gate.wait(5)
+        return payloads[:-1]
+
+    batcher = MicroBatcher(short, max_wait_ms=50, max_batch=8)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(batcher.score, {"i": i}) for i in range(4)]
+        threading.Timer(0.2, gate.set).start()
+        for f in futures:
+            with pytest.raises(RuntimeError, match="results for"):
+                f.result(5)
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import threading
+import time
+
+import joblib
+
+from conftest import payload_grid
+
+PATTERN = "best_model_recall_focus_xgb_OptionA_recallAtK*.joblib"
+SRC = "models/saved_models"
+
+
+def _registry(tmp_path):
+    from backend.services import policy_core
+    from backend.services.model_registry import ModelRegistry
+    shutil.copy(f"{SRC}/best_model_recall_focus_xgb_OptionA_recallAtK.joblib", tmp_path)
+    shutil.copy(f"{SRC}/best_model_metadata.json", tmp_path)
+    return ModelRegistry(tmp_path, PATTERN, warm=policy_core._warm)
+
+
+def _newest(path):
+    t = time.time() + 10
+    os.utime(path, (t, t))
+
+
+def _publish_smaller_model(tmp_path, name="best_model_recall_focus_xgb_OptionA_recallAtK_v2.joblib"):
+    model = joblib.load(f"{SRC}/best_model_recall_focus_xgb_OptionA_recallAtK.joblib")
+    clf = model.steps[-1][1]
+    clf._Booster = clf.get_booster()[0:100]  # a "retrained" model: first 100 trees only
+    path = tmp_path / name
+    joblib.dump(model, str(path) + ".tmp")
+    os.replace(str(path) + ".tmp", path)  # publish atomically
+    _newest(path)
+    return path
+
+
+def test_reload_swaps_to_newest_artifact(tmp_path):
+    from backend.services import policy_core
+    reg = _registry(tmp_path)
+    old = reg.current()
+    assert old.version == policy_core.MODEL_FINGERPRINT
+    assert reg.check() is False  # nothing changed
+
+    _publish_smaller_model(tmp_path)
+    assert reg.check() is True
+    new = reg.current()
+    assert new.version != old.version and reg.stats()["reloads"] == 1
+    payloads = payload_grid()
+    # the old snapshot still scores with the old model, the new one with the new model
+    assert list(policy_core.predict_pds(payloads, old)) == list(policy_core.predict_pds(payloads))
+    assert list(policy_core.predict_pds(payloads, new)) != list(policy_core.predict_pds(payloads, old))
+
+
+def test_broken_artifact_keeps_serving_previous_model(tmp_path):
+    reg = _registry(tmp_path)
+    old = reg.current()
+    path = tmp_path / "best_model_recall_focus_xgb_OptionA_recallAtK_v3.joblib"
+    path.write_bytes(b"half-copied")
+    _newest(path)
+    assert reg.check() is False
+    assert reg.current() is old
+    assert reg.stats()["last_error"]
+
+
+def test_in_flight_scoring_survives_a_swap(tmp_path):
+    from backend.services import policy_core
+    reg = _registry(tmp_path)
+    payloads = payload_grid()
+    errors, stop = [], threading.Event()
+
+    def score():
+        while not stop.is_set():
+            try:
+                assert len(policy_core.predict_pds(payloads, reg.current())) == len(payloads)
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+    threads = [threading.Thread(target=score) for _ in range(4)]
+    for t in threads:
+        t.start()
+    _publish_smaller_model(tmp_path)
+    assert reg.check() is True
+    stop.set()
+    for t in threads:
+        t.join()
+    assert errors == []
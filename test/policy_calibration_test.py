@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+import json
+
+import numpy as np
+
+from conftest import REVIEW_PAYLOAD
+
+
+def test_p2_tracks_tail_quantiles():
+    from backend.services.policy_calibration import P2Quantile
+    x = np.random.default_rng(7).beta(2, 5, 20_000)
+    for p in (0.85, 0.95):
+        est = P2Quantile(p)
+        for v in x:
+            est.add(float(v))
+        assert abs(est.value() - np.quantile(x, p)) < 0.01
+
+
+def _calibrator(tmp_path, **kw):
+    from backend.services.policy_calibration import ThresholdCalibrator
+    from backend.services.policy_store import PolicyStore
+    path = tmp_path / "policy.json"
+    path.write_text(json.dumps({"reject_top": 0.05, "review_top": 0.15, "version": "v1",
+                                "thresholds": {"thr_reject": 0.7334, "thr_review": 0.6329}}))
+    now = [1000.0]
+    cal = ThresholdCalibrator(PolicyStore(path, lambda: ("m1", {})), window_rows=1000, clock=lambda: now[0], **kw)
+    return cal, path, now
+
+
+def test_auto_recalibration_is_step_limited_and_cooled_down(tmp_path):
+    cal, path, now = _calibrator(tmp_path, max_step=0.05, cooldown_s=600, auto_apply=True)
+    assert cal.proposal()["blocked"].startswith("waiting")
+    rng = np.random.default_rng(1)
+    cal.observe(rng.uniform(0.6, 1.0, 1000))  # live q95 ~ 0.98, q85 ~ 0.94: far above the served cuts
+
+    served = cal.store.current()
+    assert (served["thr_reject"], served["thr_review"]) == (0.7834, 0.6829)  # one max_step each
+    assert served["version"] != "v1" and served["reject_top"] == 0.05
+    doc = json.loads(path.read_text())
+    assert doc["recalibrated"]["from_version"] == "v1" and doc["review_top"] == 0.15
+
+    now[0] += 60
+    cal.observe(rng.uniform(0.6, 1.0, 1000))
+    assert cal.store.current()["thr_reject"] == 0.7834  # cooldown holds the second step
+    assert cal.apply()["blocked"].startswith("cooldown")
+    assert cal.apply(ignore_cooldown=True)["applied"] and cal.store.current()["thr_reject"] == 0.8334
+
+
+def test_proposal_without_auto_apply_leaves_the_policy_alone(tmp_path):
+    cal, _, _ = _calibrator(tmp_path)
+    cal.observe(np.random.default_rng(2).uniform(0.0, 0.76, 1000))  # q95 ~ 0.722, q85 ~ 0.646
+    prop = cal.proposal()
+    assert prop["blocked"] is None and prop["clamped"] == []
+    assert abs(prop["proposed"]["thr_reject"] - 0.722) < 0.02 and abs(prop["proposed"]["thr_review"] - 0.646) < 0.02
+    assert cal.store.current()["version"] == "v1"
+
+
+def test_calibration_endpoint_reports_live_cut_points(client):
+    client.post("/v1/score", json=REVIEW_PAYLOAD)
+    body = client.get("/v1/admin/policy/calibration").json()
+    assert body["enabled"] and body["fractions"] == {"reject_top": 0.05, "review_top": 0.15}
+    assert body["quantiles"]["lifetime"]["n"] >= 1 and set(body["quantiles"]["lifetime"]["quantiles"]) == {"0.85", "0.95"}
+    assert client.post("/v1/admin/policy/calibration/apply").status_code == 409  # no full window yet
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+import itertools
+import json
+import os
+import time
+
+import pytest
+
+from conftest import APPROVE_PAYLOAD, REVIEW_PAYLOAD
+
+
+_WRITES = itertools.count(1)
+
+
+def _write(path, thr_reject, thr_review, **extra):
+    path.write_text(json.dumps({"thresholds": {"thr_reject": thr_reject, "thr_review": thr_review}, **extra}))
+    t = time.time() + next(_WRITES)  # distinct mtime per write, even within one clock tick
+    os.utime(path, (t, t))
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    from backend.services import policy_core
+    from backend.services.policy_store import PolicyStore
+    path = tmp_path / "policy.json"
+    _write(path, 0.9, 0.8)
+    s = PolicyStore(path, lambda: ("m1", {}))
+    monkeypatch.setattr(policy_core, "POLICY_STORE", s)
+    return s
+
+
+def test_reload_swaps_thresholds_for_scoring_and_tips(store):
+    from backend.services import improvement_tips
+    from backend.services.policy_core import score_payload
+    first = score_payload(REVIEW_PAYLOAD)
+    assert first["thresholds"] == {"thr_reject": 0.9, "thr_review": 0.8}
+    assert first["policy_version"] == store.current()["version"]
+    assert improvement_tips._thr_review() == 0.8
+    assert store.reload() is False  # unchanged file
+
+    _write(store.path, 0.5, 0.1, version="2024-07-risk-committee")
+    assert store.reload() is True
+    second = score_payload(REVIEW_PAYLOAD)
+    assert second["policy_version"] == "2024-07-risk-committee"
+    assert second["decision"] == "REJECT" and second["prob_default"] == first["prob_default"]
+    assert improvement_tips._thr_review() == 0.1
+    assert [h["version"] for h in store.stats()["history"]][:2] == ["2024-07-risk-committee", first["policy_version"]]
+
+
+def test_invalid_policy_is_rejected_and_previous_keeps_serving(store):
+    from backend.services.policy_store import PolicyError
+    before = store.current()
+    _write(store.path, 0.2, 0.6)  # reject cut below review cut
+    with pytest.raises(PolicyError):
+        store.reload()
+    assert store.current() is before
+    assert store.check() is False and store.stats()["last_error"]
+
+
+def test_changed_thresholds_under_same_version_are_rejected(store):
+    from backend.services.policy_store import PolicyError
+    _write(store.path, 0.9, 0.8, version="v1")
+    assert store.reload() is True
+    before = store.current()
+    _write(store.path, 0.5, 0.1, version="v1")
+    with pytest.raises(PolicyError, match="v1"):
+        store.reload()
+    assert store.current() is before and store.stats()["last_error"]
+    _write(store.path, 0.5, 0.1, version="v2")
+    assert store.reload() is True
+    assert store.current()["thr_review"] == 0.1 and store.stats()["last_error"] is None
+
+
+def test_versions_are_content_addressed(tmp_path):
+    from backend.services.policy_store import load_policy
+    a, b = tmp_path / "a" / "policy.json", tmp_path / "b" / "policy.json"
+    a.parent.mkdir()
+    b.parent.mkdir()
+    _write(a, 0.9, 0.8)
+    _write(b, 0.9, 0.8)
+    assert load_policy(a, {})["version"] == load_policy(b, {})["version"]
+    _write(b, 0.9, 0.7)
+    assert load_policy(a, {})["version"] != load_policy(b, {})["version"]
+
+
+def test_stored_application_records_policy_version(client):
+    from backend.services.policy_core import current_policy
+    r = client.post("/v1/score", json=APPROVE_PAYLOAD)
+    assert r.status_code == 200
+    app = client.get(f"/v1/applications/{r.json()['id']}").json()
+    assert app["policy_version"] == current_policy()["version"]
+    assert app["model_version"]
+    reload = client.post("/v1/admin/policy/reload")
+    assert reload.status_code == 200 and reload.json()["changed"] is False
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+from concurrent.futures import ThreadPoolExecutor
+
+from conftest import REVIEW_PAYLOAD
+
+
+def _open_review_case(client):
+    rec = client.post("/v1/score", json=REVIEW_PAYLOAD).json()
+    assert rec["system_decision"] == "REVIEW" and rec["status"] == "OPEN"
+    return rec
+
+
+def test_compare_and_set_lets_exactly_one_officer_win(client):
+    from backend.db import crud
+    from backend.db.session import SessionLocal
+    app_id = _open_review_case(client)["id"]
+    a, b = SessionLocal(), SessionLocal()
+    try:
+        rec_a, rec_b = crud.get_application(a, app_id), crud.get_application(b, app_id)  # both see OPEN v1
+        won = crud.finalize_review(a, rec_a, "APPROVE", "officer A")
+        lost = crud.finalize_review(b, rec_b, "REJECT", "officer B")
+        assert won is not None and won.version == 2 and won.final_decision == "APPROVE"
+        assert lost is None
+    finally:
+        a.close()
+        b.close()
+    stored = client.get(f"/v1/applications/{app_id}").json()
+    assert stored["final_decision"] == "APPROVE" and stored["version"] == 2
+
+
+def test_concurrent_review_requests_never_lose_an_update(client):
+    app_id = _open_review_case(client)["id"]
+
+    def review(i):
+        return client.post(f"/v1/applications/{app_id}/review",
+                           json={"action": "APPROVE" if i % 2 else "REJECT", "notes": f"officer {i}", "version": 1})
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        responses = list(pool.map(review, range(8)))
+    codes = sorted(r.status_code for r in responses)
+    assert codes.count(200) == 1 and set(codes) <= {200, 400, 409}
+    winner = next(r.json() for r in responses if r.status_code == 200)
+    stored = client.get(f"/v1/applications/{app_id}").json()
+    assert stored["final_decision"] == winner["final_decision"] and stored["version"] == 2
+
+
+def test_stale_version_is_rejected(client):
+    rec = _open_review_case(client)
+    r = client.post(f"/v1/applications/{rec['id']}/review", json={"action": "APPROVE", "version": rec["version"] + 1})
+    assert r.status_code == 409
+    r = client.post(f"/v1/applications/{rec['id']}/review", json={"action": "APPROVE", "version": rec["version"]})
+    assert r.status_code == 200 and r.json()["version"] == rec["version"] + 1
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+from conftest import APPROVE_PAYLOAD, REVIEW_PAYLOAD
+
+
+def test_key_is_the_normalized_feature_vector():
+    from backend.services.policy_core import feature_keys
+    a = dict(APPROVE_PAYLOAD)
+    b = dict(APPROVE_PAYLOAD, int_rate=7.5, first_name="Someone", last_name="Else")
+    c = dict(APPROVE_PAYLOAD, int_rate="7.6%")
+    ka, kb, kc = feature_keys([a, b, c])
+    assert ka == kb
+    assert ka != kc
+
+
+def test_shared_store_hits_across_instances_and_invalidates_on_model_change(tmp_path, monkeypatch):
+    from backend.services import score_cache
+    from backend.services.policy_core import MODEL_FINGERPRINT, score_payload
+    path = str(tmp_path / "scores.db")
+    calls = []
+    original = score_cache.predict_pds
+    monkeypatch.setattr(score_cache, "predict_pds", lambda ps, *a: calls.append(len(ps)) or original(ps, *a))
+
+    first = score_cache.ScoreCache(path, MODEL_FINGERPRINT)
+    pds = first.get_pds([APPROVE_PAYLOAD, REVIEW_PAYLOAD, dict(APPROVE_PAYLOAD, first_name="X")])
+    assert pds == [score_payload(p)["prob_default"] for p in (APPROVE_PAYLOAD, REVIEW_PAYLOAD, APPROVE_PAYLOAD)]
+    assert calls == [2]  # duplicate feature vector scored once
+
+    other_worker = score_cache.ScoreCache(path, MODEL_FINGERPRINT)  # same file, e.g. another process
+    assert other_worker.get_pds([REVIEW_PAYLOAD]) == pds[1:2]
+    assert calls == [2]
+    assert other_worker.stats()["hits"] == 1
+
+    retrained = score_cache.ScoreCache(path, "new-model")
+    assert len(retrained.store) == 0
+    retrained.get_pds([REVIEW_PAYLOAD])
+    assert calls == [2, 1]
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+from conftest import payload_grid, APPROVE_PAYLOAD, REVIEW_PAYLOAD, REJECT_PAYLOAD
+
+
+def test_score_payloads_matches_single_row_path():
+    from backend.services.policy_core import score_payload, score_payloads
+    payloads = payload_grid()
+    batch = score_payloads(payloads)
+    assert batch == [score_payload(p) for p in payloads]
+
+
+def test_batch_endpoint_returns_rows_in_order(client):
+    body = [APPROVE_PAYLOAD, REVIEW_PAYLOAD, REJECT_PAYLOAD]
+    r = client.post("/v1/score/batch", json=body)
+    assert r.status_code == 200, r.text
+    rows = r.json()
+    assert [x["system_decision"] for x in rows] == ["APPROVE", "REVIEW", "REJECT"]
+    assert [x["last_name"] for x in rows] == ["Banks", "Carver", "Nolan"]
+    assert len({x["id"] for x in rows}) == 3
+
+    single = client.get(f"/v1/applications/{rows[1]['id']}").json()
+    assert single["prob_default"] == rows[1]["prob_default"]
+    assert single["status"] == "OPEN"
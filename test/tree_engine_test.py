@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+from conftest import payload_grid
+
+
+def _engine():
+    from backend.services import policy_core
+    from backend.services.tree_engine import TreeEnsemble
+    return TreeEnsemble.from_booster(policy_core.CLASSIFIER.get_booster())
+
+
+def test_engine_exports_all_trees():
+    from backend.services import policy_core
+    eng = _engine()
+    assert eng.n_trees == 600
+    assert eng.max_depth == 3
+    assert eng.n_features == policy_core.ENCODER.n_features
+
+
+def test_engine_matches_original_pipeline():
+    from backend.services import policy_core
+    payloads = payload_grid()
+    x = policy_core.ENCODER.encode_rows([policy_core._payload_row(p) for p in payloads])
+    native = _engine().predict_proba(x)[:, 1].astype(float)
+    ref = policy_core.predict_pds_frame(payloads)
+    assert np.array_equal(native, ref)
+    assert policy_core.three_band_decisions(native, policy_core.POLICY) == \
+        policy_core.three_band_decisions(ref, policy_core.POLICY)
+
+
+def test_native_backend_behind_score_payload(monkeypatch):
+    from backend.services import policy_core
+    from backend.services.model_registry import ModelBundle
+    payloads = payload_grid()
+    expected = [policy_core.score_payload(p) for p in payloads]
+    served = policy_core.current_model()
+    native = ModelBundle(served.path, served.meta_path, scoring_backend="native")
+    calls = []
+    predict = native.engine.predict_proba
+    monkeypatch.setattr(native.engine, "predict_proba", lambda x: calls.append(len(x)) or predict(x))
+    monkeypatch.setattr(policy_core.REGISTRY, "_bundle", native)
+    assert [policy_core.score_payload(p) for p in payloads] == expected
+    assert len(calls) == len(payloads)
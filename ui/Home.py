@@ -246,6 +246,30 @@ if submitted:
         # Auto-advice if this landed in REVIEW
         ensure_advice_loaded(st.session_state["last_result"])
 
+# ---------------------------
+# Review queue (sidebar): open REVIEW cases, oldest first
+# ---------------------------
+st.sidebar.header("Review queue")
+queue, queue_err = get("/applications?status=OPEN&system_decision=REVIEW&limit=20")
+if queue_err:
+    st.sidebar.caption(queue_err)
+elif not queue["items"]:
+    st.sidebar.caption("No open REVIEW cases")
+else:
+    labels = {
+        f"#{a['id']} · PD {a['prob_default']:.3f} · {(a.get('first_name') or '')} {(a.get('last_name') or '')}".strip(): a["id"]
+        for a in queue["items"]
+    }
+    pick = st.sidebar.selectbox("Open REVIEW cases", list(labels))
+    if st.sidebar.button("Open case"):
+        data, err = get(f"/applications/{labels[pick]}")
+        if err:
+            st.sidebar.error(err)
+        else:
+            st.session_state["last_result"] = data
+            st.session_state["lookup_id"] = data["id"]
+            ensure_advice_loaded(data)
+
 # ---------------------------
 # Lookup panel (updates Latest Result)
 # ---------------------------
@@ -350,7 +374,7 @@ if res and view["system_decision"] == "REVIEW" and view.get("status") == "OPEN":
     c1, c2 = st.columns(2)
     with c1:
         if st.button("Approve"):
-            upd, err = post(f"/applications/{view['id']}/review", {"action": "APPROVE", "notes": notes_input})
+            upd, err = post(f"/applications/{view['id']}/review", {"action": "APPROVE", "notes": notes_input, "version": view.get("version")})
             if err:
                 st.error(err)
             else:
@@ -358,7 +382,7 @@ if res and view["system_decision"] == "REVIEW" and view.get("status") == "OPEN":
                 st.session_state["last_result"] = upd
     with c2:
         if st.button("Reject"):
-            upd, err = post(f"/applications/{view['id']}/review", {"action": "REJECT", "notes": notes_input})
+            upd, err = post(f"/applications/{view['id']}/review", {"action": "REJECT", "notes": notes_input, "version": view.get("version")})
             if err:
                 st.error(err)
             else:
@@ -378,6 +402,19 @@ is_rejected = (
     (res and view.get("final_decision") == "REJECT") or
     (res and view.get("system_decision") == "REJECT" and view.get("status") == "CLOSED")
 )
+if is_rejected and view.get("client_message_status") == "PENDING" and not view.get("client_message"):
+    st.divider()
+    st.subheader("Client Guidance")
+    st.info("The client message is being prepared…")
+    if st.button("Refresh client message"):
+        msg, err = get(f"/applications/{view['id']}/client-message")
+        if err:
+            st.error(err)
+        else:
+            view["client_message"] = msg.get("client_message")
+            view["client_message_status"] = msg.get("status")
+            st.rerun()
+
 if is_rejected and view.get("client_message"):
     st.divider()
     st.subheader("Client Guidance")